@@ -13,7 +13,7 @@ trap term TERM INT
 python -m src.bind daemon &
 daemon_pid=$!
 
-gunicorn --workers 2 --bind 0.0.0.0:5050 --timeout 30 src.rss_server:app &
+gunicorn --workers 2 --threads 4 --bind 0.0.0.0:5050 --timeout 30 src.rss_server:app &
 gunicorn_pid=$!
 
 # Wait for whichever process exits first and capture its status.
@@ -37,7 +37,7 @@ export interface DbStats {
 
 export interface ScrapeRun {
   run_at:    string;
-  result:    'success' | 'failure' | 'empty';
+  result:    'success' | 'failure' | 'empty' | 'timeout' | 'cancelled';
   new_items: number;
   duration:  number;
 }
@@ -86,8 +86,18 @@ export default function DashboardPage() {
 
   useEffect(() => {
     void load();
-    const id = setInterval(() => void load(), 10_000);
-    return () => clearInterval(id);
+    // Reload when the server pushes a change; the slow poll only covers the
+    // case where the event stream is unavailable.
+    const refresh = () => void load();
+    const events = new EventSource('/api/events');
+    for (const type of ['magnets', 'scrape_run', 'daemon']) {
+      events.addEventListener(type, refresh);
+    }
+    const id = setInterval(refresh, 60_000);
+    return () => {
+      events.close();
+      clearInterval(id);
+    };
   }, [load]);
 
   const handleEnable = async () => {
@@ -159,7 +159,7 @@ Environment="PYTHONPATH=$INSTALL_DIR"
 Environment="FLASK_ENV=production"
 Environment="BIND_DB_PATH=$INSTALL_DIR/data/bind.db"
 Environment="PORT=$RSS_PORT"
-ExecStart=$INSTALL_DIR/venv/bin/gunicorn --workers 2 --bind 0.0.0.0:$RSS_PORT --timeout 30 "src.rss_server:app"
+ExecStart=$INSTALL_DIR/venv/bin/gunicorn --workers 2 --threads 4 --bind 0.0.0.0:$RSS_PORT --timeout 30 "src.rss_server:app"
 Restart=always
 RestartSec=10
 StandardOutput=journal
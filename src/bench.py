@@ -0,0 +1,278 @@
+"""
+BIND benchmark harness.
+
+Generates deterministic synthetic archives and reports latency percentiles
+for the hot paths of the RSS server and the scraper:
+
+    python -m src.bench                          # 10k and 100k magnets
+    python -m src.bench --sizes 10k,100k,1M --json bench.json
+
+Archives are cached in --db-dir (default: a "bind-bench" dir under the system
+temp dir) and reused when their row count matches, so only the first run at a
+size pays for generation. Results are printed as a table and, with --json,
+written as a JSON document meant to be diffed between releases.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import click
+
+from src.core.magnet import generate_magnet
+from src.core.stage_timer import percentile
+from src.core.storage import MagnetStore
+
+SIZES: dict[str, int] = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+DEFAULT_SEED = 1729
+# Fixed anchor so archives (and their date distribution) are reproducible.
+ANCHOR_DATE = date(2026, 1, 1)
+ARCHIVE_DAYS = 5 * 365
+
+_AUTHORS = [
+    "Brandon Sanderson", "Ursula K. Le Guin", "Terry Pratchett", "N. K. Jemisin",
+    "Agatha Christie", "Stephen King", "Octavia E. Butler", "Neil Gaiman",
+    "Robin Hobb", "Iain M. Banks", "Patrick Rothfuss", "Lois McMaster Bujold",
+]  # fmt: skip
+_WORDS = [
+    "Shadow", "Empire", "Winter", "Storm", "Crown", "Glass", "River", "Night",
+    "Iron", "Silent", "Story", "Garden", "Dragon", "Ashes", "Star", "House",
+    "Machine", "Memory", "Broken", "Wind", "Kingdom", "Ocean", "Fire", "Stone",
+]  # fmt: skip
+_TAGS = ["[MP3 64kbps]", "[M4B]", "[Unabridged]", "[MP3 128kbps]", "(Dramatized)", ""]
+
+TRACKERS = [f"udp://tracker{i}.example.org:1337/announce" for i in range(8)]
+
+DETAIL_HTML = (
+    "<html><body><div class='postContent'><table>"
+    + "".join(f"<tr><td>Field {i}:</td><td>value {i}</td></tr>" for i in range(40))
+    + "<tr><td>Info Hash:</td><td>{hash}</td></tr>"
+    "</table><p>" + "Lorem ipsum dolor sit amet. " * 200 + "</p></div></body></html>"
+)
+
+
+def parse_sizes(raw: str) -> list[tuple[str, int]]:
+    """'10k,100k' -> [('10k', 10000), ('100k', 100000)]; plain integers allowed."""
+    out = []
+    for token in (t.strip() for t in raw.split(",") if t.strip()):
+        if token in SIZES:
+            out.append((token, SIZES[token]))
+        elif token.isdigit():
+            out.append((token, int(token)))
+        else:
+            raise click.BadParameter(f"unknown size {token!r} (use {', '.join(SIZES)} or N)")
+    return out
+
+
+def synthetic_rows(n: int, seed: int = DEFAULT_SEED) -> Iterator[tuple[str, str, str, None]]:
+    """Deterministic (info_hash, title, collected_date, source) rows."""
+    rng = random.Random(seed)
+    for i in range(n):
+        info_hash = hashlib.sha1(f"{seed}:{i}".encode()).hexdigest()
+        title = (
+            f"{rng.choice(_AUTHORS)} - The {rng.choice(_WORDS)} {rng.choice(_WORDS)}"
+            f" Book {rng.randint(1, 12)} {rng.choice(_TAGS)}"
+        ).strip()
+        day = ANCHOR_DATE - timedelta(days=int(ARCHIVE_DAYS * (1 - i / max(n, 1))))
+        yield info_hash, title, day.isoformat(), None
+
+
+def _row_count(db_path: str) -> int:
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            return int(conn.execute("SELECT COUNT(*) FROM magnets").fetchone()[0])
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return -1
+
+
+def build_archive(db_dir: str, label: str, n: int, seed: int = DEFAULT_SEED) -> str:
+    """Create (or reuse) a synthetic archive of n magnets; returns its path."""
+    os.makedirs(db_dir, exist_ok=True)
+    path = os.path.join(db_dir, f"bench-{label}-{seed}.db")
+    if os.path.exists(path) and _row_count(path) == n:
+        return path
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    store = MagnetStore(path)
+    rows = synthetic_rows(n, seed)
+    chunk: list[tuple[str, str, str, None]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= 10_000:
+            store.insert_many(chunk)
+            chunk = []
+    if chunk:
+        store.insert_many(chunk)
+    store.close()
+    return path
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 2) -> dict[str, float]:
+    """Run fn warmup + repeat times; latency summary in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "n": repeat,
+        "mean_ms": round(sum(samples) / repeat, 4),
+        "p50_ms": round(percentile(samples, 50), 4),
+        "p95_ms": round(percentile(samples, 95), 4),
+        "p99_ms": round(percentile(samples, 99), 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+
+def archive_operations(store: MagnetStore) -> dict[str, Callable[[], Any]]:
+    """Operations whose cost depends on archive size (rss_server.store must be `store`)."""
+    from src import rss_server
+
+    client = rss_server.app.test_client()
+    rows = store.recent(limit=100)
+
+    def feed() -> None:
+        resp = client.get("/feed.xml")
+        assert resp.status_code == 200, resp.status_code
+
+    def uncached(query: str | None, page: int = 1) -> Callable[[], Any]:
+        # The result cache would turn every repeat into a hit; measure the queries.
+        def op() -> Any:
+            store.clear_caches()
+            return store.search(query, page=page)
+
+        return op
+
+    return {
+        "search_fts_common": uncached("Dragon"),
+        "search_fts_rare": uncached("Bujold - The Glass River"),
+        "search_fts_miss": uncached("zzqx-no-such-title"),
+        "search_short_like": uncached("Ir"),
+        "search_browse_page1": uncached(None),
+        "search_browse_page200": uncached(None, page=200),
+        "search_cached": lambda: store.search("Dragon"),
+        "stats": store.stats,
+        "daily_counts": store.daily_counts,
+        "recent_100": lambda: store.recent(limit=100),
+        "has_hash_miss": lambda: store.has_hash("f" * 40),
+        "feed_xml": feed,
+        "enrich_100": lambda: rss_server._enrich(rows, TRACKERS),
+    }
+
+
+def micro_operations() -> dict[str, Callable[[], Any]]:
+    """Operations independent of archive size."""
+    from src.core.scraper import BindScraper
+
+    html = DETAIL_HTML.replace("{hash}", "ab" * 20)
+
+    class _PageHit:
+        """Page cache stand-in: every URL is a hit, so no network or jitter sleep."""
+
+        def get(self, url: str) -> str:
+            return html
+
+        def put(self, url: str, page: str) -> None:
+            pass
+
+    scraper = BindScraper(egress_manager=object(), page_cache=_PageHit())  # type: ignore[arg-type]
+    return {
+        "generate_magnet": lambda: generate_magnet("ab" * 20, "Some Title [MP3]", TRACKERS),
+        "extract_info_hash": lambda: scraper.extract_info_hash("https://example.org/b/1/"),
+    }
+
+
+def run(
+    sizes: list[tuple[str, int]],
+    repeat: int,
+    db_dir: str,
+    seed: int = DEFAULT_SEED,
+    echo: Callable[[str], None] = print,
+) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    for name, fn in micro_operations().items():
+        results.append({"size": None, "op": name, **measure(fn, repeat * 10)})
+    for label, n in sizes:
+        t0 = time.perf_counter()
+        path = build_archive(db_dir, label, n, seed)
+        echo(f"archive {label}: {n} magnets ready in {time.perf_counter() - t0:.1f}s ({path})")
+        from src import rss_server
+
+        store = MagnetStore(path)
+        previous, rss_server.store = rss_server.store, store
+        try:
+            for name, fn in archive_operations(store).items():
+                results.append({"size": label, "op": name, **measure(fn, repeat)})
+        finally:
+            rss_server.store = previous
+            store.close()
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def format_table(report: dict[str, Any]) -> str:
+    lines = [f"{'size':>6}  {'operation':<24} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"]
+    for r in report["results"]:
+        lines.append(
+            f"{r['size'] or '-':>6}  {r['op']:<24} "
+            f"{r['p50_ms']:>10.3f} {r['p95_ms']:>10.3f} {r['p99_ms']:>10.3f}"
+        )
+    return "\n".join(lines)
+
+
+@click.command()
+@click.option("--sizes", default="10k,100k", show_default=True, help="Archive sizes to test")
+@click.option("--repeat", default=50, show_default=True, help="Timed runs per operation")
+@click.option(
+    "--db-dir",
+    default=os.path.join(tempfile.gettempdir(), "bind-bench"),
+    show_default=True,
+    help="Where synthetic archives are cached",
+)
+@click.option("--seed", default=DEFAULT_SEED, show_default=True, help="Archive generator seed")
+@click.option("--json", "json_path", default=None, help="Write the JSON report to this path")
+def main(sizes: str, repeat: int, db_dir: str, seed: int, json_path: str | None) -> None:
+    """Benchmark storage, search, feed rendering and parsing."""
+    report = run(parse_sizes(sizes), repeat, db_dir, seed, echo=click.echo)
+    click.echo(format_table(report))
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        click.echo(f"JSON report written to {json_path}")
+
+
+if __name__ == "__main__":
+    # rss_server resolves its DB and secret at import; point it at a scratch dir
+    # so benchmarking never touches a real install.
+    _scratch = tempfile.mkdtemp(prefix="bind-bench-server-")
+    os.environ.setdefault("BIND_DB_PATH", os.path.join(_scratch, "server.db"))
+    os.environ.setdefault("FLASK_SECRET_KEY", "bench")
+    os.environ.setdefault("BIND_IP_FILTER", "false")
+    sys.exit(main())
@@ -15,10 +15,22 @@ import click
 import schedule
 
 from src.config_manager import LiveConfig
+from src.core.cancellation import CancelToken, JobCancelled
+from src.core.control import ControlServer, JobControl, control_socket_path
+from src.core.export import FORMATS as EXPORT_FORMATS
+from src.core.export import export_chunks, gzip_chunks
+from src.core.importer import CHUNK_SIZE as IMPORT_CHUNK_SIZE
+from src.core.importer import FORMATS as IMPORT_FORMATS
+from src.core.importer import ImportResult, import_file
 from src.core.magnet import generate_magnet
+from src.core.page_cache import PageCache
+from src.core.profiler import clamp_duration, start_profile
 from src.core.scraper import BindScraper
+from src.core.stage_timer import StageRecorder, recording, timed
 from src.core.storage import MagnetStore
+from src.core.telemetry import DAEMON_TEXTFILE, REGISTRY, write_textfile
 from src.core.tracker_manager import TrackerManager
+from src.core.watcher import CONTROL_FILES, ControlWatcher
 from src.security import get_logs_dir
 
 logging.basicConfig(
@@ -36,6 +48,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger("BIND")
 
+# DetailResult.failure values that put a page into the negative cache.
+NEGATIVE_CACHE_REASONS = ("fetch_failed", "parse_failed")
+
+_MAGNETS_INSERTED = REGISTRY.counter(
+    "bind_magnets_inserted_total", "Magnets newly inserted by scrape jobs"
+)
+_SCRAPE_RUNS = REGISTRY.counter("bind_scrape_runs_total", "Scrape runs, by result")
+_SCRAPE_RUN_SECONDS = REGISTRY.histogram(
+    "bind_scrape_run_duration_seconds",
+    "Wall time of scrape runs",
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0),
+)
+_CIRCUIT_OPEN = REGISTRY.gauge("bind_circuit_breaker_open", "1 while the circuit breaker is open")
+_CIRCUIT_FAILURES = REGISTRY.gauge(
+    "bind_circuit_breaker_failures", "Consecutive failures counted by the circuit breaker"
+)
+_PROXIES_HEALTHY = REGISTRY.gauge("bind_proxy_pool_healthy", "Proxies currently in rotation")
+_PROXIES_CONFIGURED = REGISTRY.gauge("bind_proxy_pool_size", "Proxies configured")
+_METRICS_WRITTEN = REGISTRY.gauge(
+    "bind_daemon_metrics_timestamp_seconds", "Unix time the daemon last exported its metrics"
+)
+
+
+def _collect_daemon_gauges(scraper: BindScraper) -> None:
+    """Refresh gauges that mirror live daemon objects (metrics collector)."""
+    breaker = scraper.circuit_breaker
+    _CIRCUIT_OPEN.set(1 if breaker.is_open else 0)
+    _CIRCUIT_FAILURES.set(breaker.failures)
+    pool = scraper.egress.proxy_pool
+    _PROXIES_HEALTHY.set(len(pool))
+    _PROXIES_CONFIGURED.set(pool.size)
+    _METRICS_WRITTEN.set(time.time())
+
 
 def check_disk_space(path: str, required_mb: int = 100) -> bool:
     try:
@@ -58,14 +103,48 @@ def run_job(
     store: MagnetStore,
     tracker_manager: TrackerManager,
     _saved_counter: list[int] | None = None,
+    cancel: CancelToken | None = None,
+    stages: StageRecorder | None = None,
+    control: JobControl | None = None,
+) -> int:
+    """Fetch the RSS feed and work through the scrape queue; returns magnets saved.
+
+    A cancelled `cancel` token stops the job at the next item boundary or
+    sleep; unfinished items stay queued for the next run. Per-stage timings
+    from every layer of the pipeline are collected into `stages`; live
+    progress (item counts, current URL) is reported to `control`.
+    """
+    with recording(stages):
+        return _run_job(data_dir, scraper, store, tracker_manager, _saved_counter, cancel, control)
+
+
+def _run_job(
+    data_dir: str,
+    scraper: BindScraper,
+    store: MagnetStore,
+    tracker_manager: TrackerManager,
+    _saved_counter: list[int] | None,
+    cancel: CancelToken | None,
+    control: JobControl | None = None,
 ) -> int:
     if not check_disk_space(data_dir, required_mb=100):
         logger.error("Insufficient disk space, skipping scrape job")
         return 0
 
     logger.info("Checking for new uploads...")
-    books = scraper.get_recent_books()
-    logger.info(f"Found {len(books)} recent books.")
+    try:
+        with timed("rss_fetch"):
+            books = scraper.get_recent_books(cancel=cancel)
+    except JobCancelled:
+        logger.warning("Job cancelled while fetching the RSS feed.")
+        return 0
+    # Persist the work list first: if this run times out or the daemon restarts,
+    # the next run resumes the unfinished items instead of starting over.
+    store.enqueue_books(books)
+    queue = store.queued_items()
+    logger.info(f"Found {len(books)} recent books; {len(queue)} queued for processing.")
+    if control is not None:
+        control.update(items_total=len(queue))
 
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     current_trackers = tracker_manager.get_trackers()
@@ -73,38 +152,92 @@ def run_job(
     successful_saves = 0
     failed_saves = 0
     skipped_dupes = 0
+    deferred = 0
 
-    for book in books:
-        info_hash = scraper.extract_info_hash(book["link"])
-
-        if not info_hash:
-            logger.warning(f"Could not extract hash for: {book['title']}")
-            failed_saves += 1
-            continue
-
-        if store.has_hash(info_hash):
-            logger.debug(f"Skipping duplicate: {book['title']}")
-            skipped_dupes += 1
-            continue
-
-        try:
-            saved = store.add_magnet(info_hash, book["title"], today)
-            if saved:
-                # Log the magnet URI for operator reference
-                magnet = generate_magnet(info_hash, book["title"], current_trackers)
-                logger.info(f"✓ Saved ({successful_saves + 1}): {book['title'][:50]}...")
-                logger.debug(f"  {magnet}")
-                successful_saves += 1
-                if _saved_counter is not None:
-                    _saved_counter[0] = successful_saves
+    try:
+        for done, item in enumerate(queue):
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            link, title = item["link"], item["title"]
+            if control is not None:
+                control.advance(done, link)
+
+            if item["state"] == "fetched" and item["info_hash"]:
+                # Fetched by an earlier, interrupted run — only the save is left.
+                info_hash = item["info_hash"]
+                metadata = item["metadata"]
             else:
-                # Race condition: another process inserted between has_hash and add_magnet
-                logger.debug(f"Skipping duplicate (race): {book['title']}")
+                if store.in_failure_backoff(link):
+                    # Stays pending: a later run fetches it once the backoff expires.
+                    logger.debug(f"Skipping (failed recently, backing off): {title}")
+                    deferred += 1
+                    continue
+
+                with timed("detail_page"):
+                    result = scraper.extract_details(link, cancel=cancel)
+                info_hash = result.info_hash
+                metadata = result.metadata
+
+                if result.failure == "circuit_open":
+                    # An open circuit says nothing about the page itself: leave it
+                    # pending, without a backoff, for the next run.
+                    logger.debug(f"Skipping (circuit open): {title}")
+                    deferred += 1
+                    continue
+
+                if not info_hash:
+                    logger.warning(f"Could not extract hash for: {title}")
+                    failed_saves += 1
+                    store.mark_queue_item(link, "failed")
+                    if result.failure in NEGATIVE_CACHE_REASONS:
+                        entry = store.record_fetch_failure(link, result.failure)
+                        logger.info(
+                            f"  {result.failure} (attempt {entry['attempts']}) — "
+                            f"next retry after {entry['next_retry_at']}"
+                        )
+                    continue
+
+                store.clear_fetch_failure(link)
+                store.mark_queue_item(link, "fetched", info_hash, metadata)
+
+            with timed("dedupe_check"):
+                is_dupe = store.has_hash(info_hash)
+            if is_dupe:
+                logger.debug(f"Skipping duplicate: {title}")
                 skipped_dupes += 1
-        except Exception as e:
-            logger.error(f"Failed to save '{book['title']}': {e}")
-            failed_saves += 1
+                store.mark_queue_item(link, "saved")
+                continue
 
+            try:
+                with timed("db_write"):
+                    saved = store.add_magnet(info_hash, title, today, metadata=metadata)
+                if saved:
+                    _MAGNETS_INSERTED.inc()
+                    # Log the magnet URI for operator reference
+                    magnet = generate_magnet(info_hash, title, current_trackers)
+                    logger.info(f"✓ Saved ({successful_saves + 1}): {title[:50]}...")
+                    logger.debug(f"  {magnet}")
+                    successful_saves += 1
+                    if _saved_counter is not None:
+                        _saved_counter[0] = successful_saves
+                    if control is not None:
+                        control.update(saved=successful_saves)
+                else:
+                    # Race condition: another process inserted between has_hash and add_magnet
+                    logger.debug(f"Skipping duplicate (race): {title}")
+                    skipped_dupes += 1
+                store.mark_queue_item(link, "saved")
+            except Exception as e:
+                # Left in state 'fetched': the next run retries the save without refetching.
+                logger.error(f"Failed to save '{title}': {e}")
+                failed_saves += 1
+        if control is not None:
+            control.update(items_done=len(queue), current_url=None)
+    except JobCancelled:
+        logger.warning("Job cancelled — unfinished items stay queued for the next run.")
+
+    if deferred > 0:
+        logger.info(f"{deferred} page(s) deferred (backing off or circuit open); they stay queued.")
     if successful_saves > 0 or failed_saves > 0:
         logger.info(
             f"Job finished: {successful_saves} saved, {skipped_dupes} duplicates, {failed_saves} failed."
@@ -128,11 +261,17 @@ class DaemonContext:
     # True iff the scrape job is currently on the scheduler. Reconciled against
     # the live SCRAPING_ENABLED value every tick by sync_scraping_schedule().
     scraping_enabled: bool = False
+    # Manual runs requested over the control socket (None: socket disabled).
+    control: JobControl | None = None
 
     @property
     def trigger_file(self) -> str:
         return os.path.join(self.data_dir, ".trigger")
 
+    @property
+    def profile_file(self) -> str:
+        return os.path.join(self.data_dir, ".profile")
+
 
 def cleanup_stale_signal_files(data_dir: str) -> None:
     """Delete control files left over from a previous daemon run (startup only).
@@ -144,8 +283,9 @@ def cleanup_stale_signal_files(data_dir: str) -> None:
       RSS server still writes it for one release for old daemons (COMPAT).
     - ``.trigger``: one left by a dead daemon caused a startup-run + trigger-run
       double scrape and 409-blocked manual scrapes forever (ARCH-3).
+    - ``.profile``: a profiling request aimed at the previous process.
     """
-    for name in (".enable-scraping", ".trigger"):
+    for name in (".enable-scraping", ".trigger", ".profile"):
         path = os.path.join(data_dir, name)
         try:
             os.remove(path)
@@ -189,6 +329,7 @@ def loop_tick(ctx: DaemonContext) -> None:
     ctx.maybe_beat()
     if run_now:
         ctx.run_job()
+    check_profile_request(ctx)
     if os.path.exists(ctx.trigger_file):
         try:
             os.remove(ctx.trigger_file)
@@ -196,6 +337,48 @@ def loop_tick(ctx: DaemonContext) -> None:
             pass
         logger.info("Manual trigger detected — running job immediately")
         ctx.run_job()
+    if ctx.control is not None and ctx.control.pending:
+        logger.info("Manual trigger received on the control socket — running job immediately")
+        ctx.run_job()
+
+
+def check_profile_request(ctx: DaemonContext) -> None:
+    """Start a sampling profile if a ``.profile`` control file is present.
+
+    Checked before the trigger so `.profile` + `.trigger` written together
+    profile the triggered run. Output goes to the logs dir.
+    """
+    try:
+        with open(ctx.profile_file, encoding="utf-8") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return
+    except OSError as e:
+        logger.warning(f"Could not read profile request: {e}")
+        raw = ""
+    try:
+        os.remove(ctx.profile_file)
+    except OSError:
+        pass
+    if not start_daemon_profile(clamp_duration(raw or None)):
+        logger.warning("Profile requested but one is already running — ignored.")
+
+
+def start_daemon_profile(seconds: int) -> bool:
+    """Profile this daemon for `seconds` into the logs dir; False if one is running.
+
+    Also called from the control socket's thread (the ``profile`` command),
+    which answers even while a job blocks the main loop.
+    """
+    return start_profile(seconds, get_logs_dir(), "daemon")
+
+
+def next_wait_s(max_wait_s: float) -> float:
+    """Seconds the main loop may sleep: until the next scheduled job, capped at max_wait_s."""
+    idle = schedule.idle_seconds()
+    if idle is None:
+        return max_wait_s
+    return max(0.0, min(max_wait_s, idle))
 
 
 @click.group()
@@ -250,20 +433,36 @@ def daemon(interval: int | None, db_path: str) -> None:
         logger.critical(f"FATAL: {e}")
         sys.exit(1)
 
-    scraper = BindScraper()
+    scraper = BindScraper(page_cache=PageCache(os.path.join(data_dir, "cache", "pages")))
     tracker_manager = TrackerManager(data_dir)
 
+    REGISTRY.const_labels["process"] = "daemon"
+    REGISTRY.add_collector(lambda: _collect_daemon_gauges(scraper))
+
     shutdown_requested = {"flag": False}
+    # Sleeps until a control file or config.env changes instead of polling them.
+    config_path = os.path.abspath(live_config.config_path)
+    watcher = ControlWatcher(
+        [data_dir, os.path.dirname(config_path)],
+        names=(*CONTROL_FILES, os.path.basename(config_path)),
+    )
 
     def signal_handler(signum: int, frame: Any) -> None:
         signal_name = signal.Signals(signum).name
         logger.info(f"Received {signal_name}, will shutdown after current job completes...")
         shutdown_requested["flag"] = True
+        watcher.wake()
 
     logger.info("Registering signal handlers for graceful shutdown...")
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
 
+    control = JobControl()
+    control_server = ControlServer(
+        control_socket_path(data_dir), control, wake=watcher.wake, profile=start_daemon_profile
+    )
+    control_server.start()
+
     _job_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
     _last_future: dict[str, Any] = {"future": None}
 
@@ -274,6 +473,7 @@ def daemon(interval: int | None, db_path: str) -> None:
                 "⏰ Previous job is still running. "
                 "Skipping this scheduled run to prevent queue buildup."
             )
+            control.discard_pending("previous job still running")
             return
         # Read per job run so a Settings-page change applies without restart.
         job_timeout = live_config.get_int("BIND_JOB_TIMEOUT")
@@ -281,8 +481,19 @@ def daemon(interval: int | None, db_path: str) -> None:
         run_result = "failure"
         items_new = 0
         _saved_counter: list[int] = [0]
+        cancel = CancelToken()
+        stages = StageRecorder(on_stage=control.on_stage)
+        control.begin(cancel)
         future = _job_executor.submit(
-            run_job, data_dir, scraper, store, tracker_manager, _saved_counter
+            run_job,
+            data_dir,
+            scraper,
+            store,
+            tracker_manager,
+            _saved_counter,
+            cancel=cancel,
+            stages=stages,
+            control=control,
         )
         _last_future["future"] = future
         try:
@@ -290,17 +501,34 @@ def daemon(interval: int | None, db_path: str) -> None:
             items_new = new_count or 0
             run_result = "success" if items_new > 0 else "empty"
         except concurrent.futures.TimeoutError:
+            # Ask the worker to stop: it exits at its next item boundary or
+            # sleep, leaving unfinished items queued, so the slot frees up for
+            # the next run instead of blocking it until the job ends on its own.
+            cancel.cancel()
             items_new = _saved_counter[0]
             run_result = "timeout"
             logger.warning(
                 f"⏰ Job exceeded {job_timeout}s timeout — "
-                f"{items_new} item(s) saved before cutoff. "
-                "The next scheduled run will be skipped if this job has not completed."
+                f"{items_new} item(s) saved before cutoff. Cancellation requested; "
+                "the next scheduled run will be skipped if this job has not stopped."
             )
         except Exception as e:
             logger.error(f"Job raised unexpected exception: {e}")
         finally:
-            store.record_scrape_run(run_result, items_new, time.monotonic() - t0)
+            duration = time.monotonic() - t0
+            # Cancelled from the control socket: the job returned early, which
+            # is neither an empty run nor a success.
+            if cancel.cancelled and run_result != "timeout":
+                run_result = "cancelled"
+                items_new = _saved_counter[0]
+            control.finish(run_result)
+            _SCRAPE_RUNS.inc(result=run_result)
+            _SCRAPE_RUN_SECONDS.observe(duration)
+            run_id = store.record_scrape_run(run_result, items_new, duration)
+            try:
+                store.record_run_stages(run_id, stages.summary())
+            except Exception as e:  # timings are diagnostic, never fatal
+                logger.debug(f"Could not record stage timings: {e}")
 
     probe_result = scraper.probe_target()
     if probe_result in ("unreachable", "wrong_content"):
@@ -330,6 +558,10 @@ def daemon(interval: int | None, db_path: str) -> None:
                 store.beat(state, interval)
             except Exception as e:  # heartbeat is best-effort, never fatal
                 logger.debug(f"Heartbeat write failed: {e}")
+            try:
+                write_textfile(REGISTRY, os.path.join(data_dir, DAEMON_TEXTFILE))
+            except Exception as e:  # metrics export is best-effort, never fatal
+                logger.debug(f"Metrics textfile write failed: {e}")
             _last_beat["at"] = now
             _last_beat["state"] = state
 
@@ -339,6 +571,7 @@ def daemon(interval: int | None, db_path: str) -> None:
         live_config=live_config,
         run_job=run_job_with_timeout,
         maybe_beat=_maybe_beat,
+        control=control,
     )
 
     # Kill any stale .enable-scraping / .trigger before the first scheduled run
@@ -358,11 +591,122 @@ def daemon(interval: int | None, db_path: str) -> None:
     logger.info("Daemon running. Press Ctrl+C to stop.")
     while not shutdown_requested["flag"]:  # pragma: no cover — shell only; body is loop_tick()
         loop_tick(ctx)  # pragma: no cover
-        time.sleep(1)  # pragma: no cover
+        # Wake on a control-file/config event, the next scheduled run, or the
+        # heartbeat cadence — whichever comes first.
+        watcher.wait(next_wait_s(HEARTBEAT_INTERVAL_S))  # pragma: no cover
+    control_server.close()
+    watcher.close()
 
     logger.info("Shutdown complete. Daemon stopped cleanly.")
     sys.exit(0)
 
 
+@cli.command()
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(list(EXPORT_FORMATS)),
+    default="ndjson",
+    show_default=True,
+    help="ndjson, csv, or one magnet URI per line",
+)
+@click.option("--output", "-o", default="-", help="Output file (default: stdout)")
+@click.option("--gzip", "compress", is_flag=True, help="gzip-compress the output")
+@click.option(
+    "--db-path",
+    envvar="BIND_DB_PATH",
+    default="data/bind.db",
+    help="Path to SQLite database",
+)
+def export(fmt: str, output: str, compress: bool, db_path: str) -> None:
+    """Export the whole archive with magnet URIs (constant memory)."""
+    if output == "-":
+        # Keep stdout clean for the export itself.
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+                handler.setStream(sys.stderr)
+    try:
+        store = MagnetStore(db_path)
+    except RuntimeError as e:
+        logger.critical(f"FATAL: {e}")
+        sys.exit(1)
+    trackers = TrackerManager(os.path.dirname(os.path.abspath(db_path))).get_trackers()
+    chunks = export_chunks(store, fmt, trackers)
+    if compress:
+        chunks = gzip_chunks(chunks)
+    try:
+        with click.open_file(output, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+    finally:
+        store.close()
+
+
+@cli.command("import")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["auto", *IMPORT_FORMATS]),
+    default="auto",
+    show_default=True,
+    help="Input format; auto picks by extension (.ndjson/.jsonl, .csv, else magnet lines)",
+)
+@click.option(
+    "--date",
+    "default_date",
+    default=None,
+    help="collected_date (YYYY-MM-DD) for records without one (default: from the "
+    "magnets_YYYY-MM-DD.txt file name, else today)",
+)
+@click.option("--chunk-size", default=IMPORT_CHUNK_SIZE, show_default=True, type=click.IntRange(1))
+@click.option("--restart", is_flag=True, help="Ignore the checkpoint of an interrupted import")
+@click.option(
+    "--db-path",
+    envvar="BIND_DB_PATH",
+    default="data/bind.db",
+    help="Path to SQLite database",
+)
+def import_(
+    paths: tuple[str, ...],
+    fmt: str,
+    default_date: str | None,
+    chunk_size: int,
+    restart: bool,
+    db_path: str,
+) -> None:
+    """Bulk-load magnet dumps (magnet lines, NDJSON or CSV; optionally .gz)."""
+    try:
+        store = MagnetStore(db_path)
+    except RuntimeError as e:
+        logger.critical(f"FATAL: {e}")
+        sys.exit(1)
+
+    def report(r: ImportResult) -> None:
+        click.echo(
+            f"  {r.resumed_from + r.records:,} records, {r.inserted:,} new "
+            f"({r.rows_per_s:,.0f} rows/s)",
+            err=True,
+        )
+
+    total = ImportResult(source="", fmt=fmt)
+    try:
+        with store.bulk_load():
+            for path in paths:
+                click.echo(f"Importing {path}", err=True)
+                r = import_file(store, path, fmt, default_date, chunk_size, restart, report)
+                total.records += r.records
+                total.inserted += r.inserted
+                total.invalid += r.invalid
+                total.seconds += r.seconds
+            click.echo("Rebuilding the search index…", err=True)
+    finally:
+        store.close()
+    click.echo(
+        f"Done: {total.inserted:,} new of {total.records:,} records "
+        f"({total.invalid:,} invalid) in {total.seconds:.1f}s, {total.rows_per_s:,.0f} rows/s"
+    )
+
+
 if __name__ == "__main__":
     cli()
@@ -34,6 +34,7 @@ class ConfigManager:
         "BIND_AUTH_ENABLED": "true",
         "SCRAPING_ENABLED": "true",
         "BIND_COOKIE_SECURE": "false",
+        "BIND_SLOW_REQUEST_MS": "1000",
     }
 
     # Validation rules: (min, max) for integers, 'url' for URLs, 'proxy' for proxy URLs
@@ -50,6 +51,7 @@ class ConfigManager:
         "BIND_AUTH_ENABLED": "boolean",
         "SCRAPING_ENABLED": "boolean",
         "BIND_COOKIE_SECURE": "boolean",
+        "BIND_SLOW_REQUEST_MS": (1, 600000),
     }
 
     def __init__(self, config_path: str | None = None):
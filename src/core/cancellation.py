@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import threading
+
+
+class JobCancelled(Exception):
+    """Raised inside a scrape job once its CancelToken has been cancelled."""
+
+
+class CancelToken:
+    """
+    Cooperative cancellation flag shared between the daemon and a running job.
+
+    The daemon calls cancel() when a job exceeds BIND_JOB_TIMEOUT; the job
+    checks the token between items and sleeps through it, so backoff and
+    politeness sleeps end immediately instead of running to completion.
+    An HTTP request already in flight is bounded by its own timeout.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise JobCancelled()
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep up to `seconds`; raise JobCancelled as soon as the token is cancelled."""
+        if self._event.wait(max(0.0, seconds)):
+            raise JobCancelled()
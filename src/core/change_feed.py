@@ -0,0 +1,205 @@
+"""
+Change feed behind the dashboard's Server-Sent Events stream (/api/events).
+
+One background thread per web-server process checks ``PRAGMA data_version``
+on its own connection once per POLL_INTERVAL_S — a single cheap pragma,
+however many dashboards are open. When another connection (the daemon) has
+committed, it reads what changed by id and publishes typed events:
+
+    magnets     new magnets (id, info_hash, title, collected_date), oldest first
+    scrape_run  a finished run (id, run_at, result, items_new, duration_s)
+    daemon      the heartbeat state changed (idle / scraping / disabled)
+
+Every event carries a ``cursor`` — "<magnet id>:<run id>" — that means the
+same thing in every gunicorn worker, so a client reconnecting to a different
+worker resumes from its Last-Event-ID with a catch-up read instead of relying
+on a worker-local sequence number.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from src.core.event_ring import EventRing
+from src.core.storage import MagnetStore
+
+logger = logging.getLogger("change_feed")
+
+POLL_INTERVAL_S = 1.0
+# New magnets listed per event; clients reload their view on any event anyway.
+MAX_ITEMS = 50
+
+Cursor = tuple[int, int]
+
+
+def format_cursor(cursor: Cursor) -> str:
+    return f"{cursor[0]}:{cursor[1]}"
+
+
+def parse_cursor(raw: str | None) -> Cursor | None:
+    """'<magnet id>:<run id>' -> tuple; None for a missing or malformed value."""
+    if not raw:
+        return None
+    magnet_id, sep, run_id = raw.partition(":")
+    if not sep or not magnet_id.isdigit() or not run_id.isdigit():
+        return None
+    return int(magnet_id), int(run_id)
+
+
+def _unseen(event: dict[str, Any], cursor: Cursor) -> dict[str, Any] | None:
+    """`event` minus anything a client at `cursor` already has; None if nothing is left."""
+    if event["type"] == "magnets":
+        items = [i for i in event["items"] if i["id"] > cursor[0]]
+        return {**event, "items": items} if items else None
+    if event["type"] == "scrape_run":
+        return event if event["run"]["id"] > cursor[1] else None
+    return event
+
+
+class ChangeFeed:
+    def __init__(self, db_path: str, poll_s: float = POLL_INTERVAL_S) -> None:
+        self.db_path = db_path
+        self.poll_s = poll_s
+        self.ring = EventRing()
+        # Guards the feed's private store and the state below.
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._store: MagnetStore | None = None
+        self._cursor: Cursor = (0, 0)
+        self._version = -1
+        self._state: str | None = None
+
+    @property
+    def cursor(self) -> Cursor:
+        with self._lock:
+            return self._cursor
+
+    def ensure_started(self) -> None:
+        """Open the feed's connection and poll thread on first use in this process.
+
+        Lazy because gunicorn imports the app before forking its workers; a
+        thread started at import would not survive into them.
+        """
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.ring = EventRing()
+            # Reads only: the app's own store has already created and upgraded
+            # the schema, so skip all of that on this second connection.
+            self._store = MagnetStore(self.db_path, read_only=True)
+            self._cursor = self._store.latest_ids()
+            self._version = self._store.data_version()
+            beat = self._store.last_heartbeat()
+            self._state = beat["state"] if beat else None
+        threading.Thread(target=self._run, name="bind-change-feed", daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.poll_s)
+            try:
+                self.poll()
+            except Exception as e:  # e.g. database busy; the next tick retries
+                logger.debug(f"Change feed poll failed: {e}")
+
+    def poll(self) -> bool:
+        """Publish events for whatever was committed since the last poll."""
+        with self._lock:
+            store = self._store
+            if store is None:
+                return False
+            version = store.data_version()
+            if version == self._version:
+                return False
+            self._version = version
+            magnet_id, run_id = self._cursor
+            latest_magnet, latest_run = store.latest_ids()
+            if latest_magnet > magnet_id:
+                items = store.magnets_after(magnet_id, MAX_ITEMS)
+                magnet_id = latest_magnet
+                self.ring.emit(
+                    "magnets",
+                    items=items,
+                    more=bool(items) and items[-1]["id"] < latest_magnet,
+                    cursor=format_cursor((magnet_id, run_id)),
+                )
+            if latest_run > run_id:
+                for run in store.scrape_runs_after(run_id):
+                    run_id = run["id"]
+                    self.ring.emit("scrape_run", run=run, cursor=format_cursor((magnet_id, run_id)))
+                run_id = latest_run
+            self._cursor = (magnet_id, run_id)
+            beat = store.last_heartbeat()
+            state = beat["state"] if beat else None
+            if state != self._state:
+                self._state = state
+                self.ring.emit(
+                    "daemon",
+                    state=state,
+                    beat_at=beat["beat_at"] if beat else None,
+                    cursor=format_cursor(self._cursor),
+                )
+            return True
+
+    def catch_up(self, resume: Cursor) -> list[dict[str, Any]]:
+        """Events a client at `resume` missed, read from the database."""
+        with self._lock:
+            store = self._store
+            if store is None:
+                return []
+            items = store.magnets_after(resume[0], MAX_ITEMS)
+            runs = store.scrape_runs_after(resume[1])
+        events: list[dict[str, Any]] = []
+        magnet_id, run_id = resume
+        if items:
+            magnet_id = items[-1]["id"]
+            events.append(
+                {
+                    "type": "magnets",
+                    "items": items,
+                    "more": len(items) == MAX_ITEMS,
+                    "cursor": format_cursor((magnet_id, run_id)),
+                }
+            )
+        for run in runs:
+            run_id = run["id"]
+            events.append(
+                {"type": "scrape_run", "run": run, "cursor": format_cursor((magnet_id, run_id))}
+            )
+        return events
+
+    def follow(
+        self, resume: Cursor | None, duration_s: float, keepalive_s: float
+    ) -> Iterator[dict[str, Any] | None]:
+        """Events for one stream connection, for `duration_s` seconds.
+
+        Starts with a ``ready`` event carrying the current cursor, then any
+        catch-up since `resume`, then live events. Yields None when
+        `keepalive_s` passes without an event.
+        """
+        self.ensure_started()
+        ring = self.ring
+        seq = ring.last
+        sent = resume or self.cursor
+        yield {"type": "ready", "cursor": format_cursor(sent)}
+        backlog = self.catch_up(resume) if resume else []
+        deadline = time.monotonic() + duration_s
+        while True:
+            for event in backlog:
+                fresh = _unseen(event, sent)
+                if fresh is None:
+                    continue
+                cursor = parse_cursor(fresh.get("cursor")) or sent
+                sent = (max(sent[0], cursor[0]), max(sent[1], cursor[1]))
+                yield fresh
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            backlog, seq = ring.since(seq, wait=min(remaining, keepalive_s))
+            if not backlog:
+                yield None
@@ -0,0 +1,312 @@
+"""
+Local control API between the RSS server and the daemon.
+
+The daemon listens on a Unix-domain socket (``<data dir>/control.sock``, or
+``BIND_CONTROL_SOCKET``). A client writes one JSON object per line and reads
+one JSON object per line back; a connection may carry any number of requests:
+
+    {"cmd": "trigger"}                         -> {"ok": true, "job_id": "..."}
+    {"cmd": "cancel"}                          -> {"ok": true, "job_id": "..."}
+    {"cmd": "progress"}                        -> {"ok": true, "job": {...} | null}
+    {"cmd": "events", "since": 12, "wait": 10} -> {"ok": true, "events": [...], "last": 17}
+    {"cmd": "profile", "seconds": 30}          -> {"ok": true, "seconds": 30}
+
+``events`` long-polls: it answers as soon as there are events newer than
+``since`` or after ``wait`` seconds (capped at MAX_EVENT_WAIT_S), so a client
+can follow a run by re-sending it with the returned ``last``. Events live in
+a bounded in-memory ring; a ``since`` from a previous daemon gets the whole ring.
+``profile`` starts the sampling profiler from the socket thread, so it also
+works while a job is blocking the main loop.
+
+The socket is the fast path only: when it is missing (older daemon, daemon
+down, separate hosts) the RSS server falls back to the ``.trigger`` and
+``.profile`` files.
+Access control is the filesystem — the socket is created mode 0660 inside
+the data dir.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from src.core.cancellation import CancelToken
+from src.core.event_ring import EventRing
+from src.core.profiler import clamp_duration
+
+logger = logging.getLogger("control")
+
+CONTROL_SOCKET_NAME = "control.sock"
+EVENT_BUFFER = 500
+MAX_EVENT_WAIT_S = 25.0
+CLIENT_TIMEOUT_S = 2.0
+
+
+def control_socket_path(data_dir: str) -> str:
+    return os.environ.get("BIND_CONTROL_SOCKET") or os.path.join(data_dir, CONTROL_SOCKET_NAME)
+
+
+@dataclass
+class JobProgress:
+    """Live state of one scrape run, as reported by the ``progress`` command."""
+
+    job_id: str
+    trigger: str
+    started_at: float
+    state: str = "running"
+    items_total: int = 0
+    items_done: int = 0
+    saved: int = 0
+    current_url: str | None = None
+    stage: str | None = None
+    egress_layer: str | None = None
+    finished_at: float | None = None
+
+
+class JobControl:
+    """
+    Job state shared by the daemon main loop, the job thread and the socket.
+
+    The main loop asks `pending` whether a manual run was requested and
+    brackets every run with begin()/finish(); the job thread reports through
+    update(), advance() and on_stage(); socket handlers call request_run(),
+    cancel(), snapshot() and events_since().
+    """
+
+    def __init__(self, max_events: int = EVENT_BUFFER) -> None:
+        self._cond = threading.Condition()
+        self._ring = EventRing(max_events)
+        self._pending: str | None = None
+        self._job: JobProgress | None = None
+        self._cancel: CancelToken | None = None
+
+    def _emit(self, kind: str, **data: Any) -> None:
+        self._ring.emit(kind, **data)
+
+    @property
+    def pending(self) -> bool:
+        with self._cond:
+            return self._pending is not None
+
+    def _running(self) -> bool:
+        return self._job is not None and self._job.finished_at is None
+
+    def request_run(self) -> tuple[str, bool]:
+        """Queue a manual run; (job_id, True), or (busy job's id, False) if one is queued/running."""
+        with self._cond:
+            if self._pending is not None:
+                return self._pending, False
+            if self._running():
+                assert self._job is not None
+                return self._job.job_id, False
+            self._pending = uuid.uuid4().hex[:12]
+            self._emit("queued", job_id=self._pending)
+            return self._pending, True
+
+    def discard_pending(self, reason: str) -> None:
+        """Drop a queued manual run the daemon cannot start."""
+        with self._cond:
+            if self._pending is not None:
+                self._emit("skipped", job_id=self._pending, reason=reason)
+                self._pending = None
+
+    def begin(self, cancel: CancelToken) -> JobProgress:
+        """Start tracking a run; a queued manual request is consumed by it."""
+        with self._cond:
+            job_id, trigger = self._pending, "manual"
+            if job_id is None:
+                job_id, trigger = uuid.uuid4().hex[:12], "scheduled"
+            self._pending = None
+            self._job = JobProgress(job_id=job_id, trigger=trigger, started_at=time.time())
+            self._cancel = cancel
+            self._emit("started", job_id=job_id, trigger=trigger)
+            return self._job
+
+    def update(self, **fields: Any) -> None:
+        with self._cond:
+            if self._running():
+                for name, value in fields.items():
+                    setattr(self._job, name, value)
+
+    def advance(self, items_done: int, current_url: str) -> None:
+        """Item boundary: `items_done` finished, `current_url` is next."""
+        with self._cond:
+            job = self._job
+            if job is None or job.finished_at is not None:
+                return
+            job.items_done, job.current_url = items_done, current_url
+            job.stage = job.egress_layer = None
+            self._emit(
+                "progress",
+                job_id=job.job_id,
+                items_done=items_done,
+                items_total=job.items_total,
+                saved=job.saved,
+                current_url=current_url,
+            )
+
+    def on_stage(self, stage: str) -> None:
+        """StageRecorder listener: remember the innermost stage being entered."""
+        with self._cond:
+            if self._running():
+                assert self._job is not None
+                self._job.stage = stage
+                if stage.startswith("egress."):
+                    self._job.egress_layer = stage.split(".", 1)[1]
+
+    def finish(self, result: str) -> None:
+        with self._cond:
+            job = self._job
+            if job is None or job.finished_at is not None:
+                return
+            job.state, job.finished_at = result, time.time()
+            job.current_url = job.stage = job.egress_layer = None
+            self._cancel = None
+            self._emit("finished", job_id=job.job_id, result=result, saved=job.saved)
+
+    def cancel(self) -> str | None:
+        """Cancel the running job; returns its id, or None if nothing is running."""
+        with self._cond:
+            if not self._running() or self._cancel is None:
+                return None
+            assert self._job is not None
+            self._cancel.cancel()
+            self._job.state = "cancelling"
+            self._emit("cancel_requested", job_id=self._job.job_id)
+            return self._job.job_id
+
+    def snapshot(self) -> dict[str, Any] | None:
+        """The current (or most recent) job, with elapsed seconds."""
+        with self._cond:
+            if self._job is None:
+                return None
+            out = asdict(self._job)
+        end = out["finished_at"] or time.time()
+        out["elapsed_s"] = round(end - out["started_at"], 1)
+        out["pending"] = self.pending
+        return out
+
+    def events_since(self, since: int, wait: float = 0.0) -> tuple[list[dict[str, Any]], int]:
+        """Events with seq > `since`, waiting up to `wait` seconds for one to arrive."""
+        return self._ring.since(since, min(MAX_EVENT_WAIT_S, wait))
+
+
+class ControlServer:
+    """Threaded Unix-socket server answering line-delimited JSON commands."""
+
+    def __init__(
+        self,
+        path: str,
+        control: JobControl,
+        wake: Callable[[], None],
+        profile: Callable[[int], bool] | None = None,
+    ) -> None:
+        self.path = path
+        self.control = control
+        self._wake = wake
+        # Starts a profile of the given length; False if one is already running.
+        self._profile = profile
+        self._server: socketserver.ThreadingUnixStreamServer | None = None
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        cmd = request.get("cmd")
+        if cmd == "trigger":
+            job_id, queued = self.control.request_run()
+            if not queued:
+                return {"ok": False, "job_id": job_id, "error": "busy"}
+            self._wake()
+            return {"ok": True, "job_id": job_id}
+        if cmd == "cancel":
+            cancelled = self.control.cancel()
+            if cancelled is None:
+                return {"ok": False, "error": "no job running"}
+            return {"ok": True, "job_id": cancelled}
+        if cmd == "progress":
+            return {"ok": True, "job": self.control.snapshot()}
+        if cmd == "events":
+            try:
+                since = int(request.get("since", 0))
+                wait = float(request.get("wait", 0))
+            except (TypeError, ValueError):
+                return {"ok": False, "error": "since/wait must be numbers"}
+            events, last = self.control.events_since(since, wait)
+            return {"ok": True, "events": events, "last": last}
+        if cmd == "profile":
+            if self._profile is None:
+                return {"ok": False, "error": "profiling not available"}
+            seconds = clamp_duration(request.get("seconds"))
+            if not self._profile(seconds):
+                return {"ok": False, "error": "busy"}
+            return {"ok": True, "seconds": seconds}
+        return {"ok": False, "error": f"unknown command: {cmd!r}"}
+
+    def start(self) -> bool:
+        """Bind the socket and serve in a background thread; False if that fails."""
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                        if not isinstance(request, dict):
+                            raise ValueError("request must be a JSON object")
+                        reply = server.handle(request)
+                    except ValueError as e:
+                        reply = {"ok": False, "error": f"bad request: {e}"}
+                    self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)  # stale socket from a previous daemon
+            self._server = socketserver.ThreadingUnixStreamServer(self.path, Handler)
+            os.chmod(self.path, 0o660)
+        except OSError as e:
+            logger.warning(f"Control socket unavailable ({e}); manual triggers use .trigger")
+            return False
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="bind-control", daemon=True
+        ).start()
+        logger.info(f"🎛️  Control socket listening at {self.path}")
+        return True
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def control_request(
+    path: str, request: dict[str, Any], timeout: float = CLIENT_TIMEOUT_S
+) -> dict[str, Any] | None:
+    """Send one command to the daemon; None if no daemon is listening at `path`."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError:
+        return None
+    try:
+        reply = json.loads(line)
+    except ValueError:
+        return None
+    return reply if isinstance(reply, dict) else None
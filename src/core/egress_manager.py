@@ -10,10 +10,18 @@ from urllib.parse import urlparse, urlunparse
 import cloudscraper
 
 from src.config_manager import LiveConfig
-from src.core.retry import RetryConfig, RetryEngine
+from src.core.cancellation import CancelToken
+from src.core.retry import Deadline, RetryConfig, RetryEngine
+from src.core.stage_timer import timed
+from src.core.telemetry import REGISTRY
 
 logger = logging.getLogger("EgressManager")
 
+_LAYER_RESULTS = REGISTRY.counter(
+    "bind_egress_layer_results_total",
+    "Egress layer outcomes per URL (success or exhausted), by layer",
+)
+
 
 def redact_proxy(url: str) -> str:
     """Strip user:pass@ from a proxy URL for safe logging."""
@@ -33,6 +41,9 @@ def redact_proxy(url: str) -> str:
 
 TIMEOUT = 30
 MAX_RETRIES = 3
+# Total seconds one URL may spend across all egress layers, attempts and
+# backoff sleeps before fetch() gives up and the run moves on.
+FETCH_BUDGET_S: float = float(os.environ.get("BIND_FETCH_BUDGET", "120"))
 # Seconds a failed proxy is kept out of rotation before being re-admitted.
 PROXY_COOLDOWN_S: float = float(os.environ.get("BIND_PROXY_COOLDOWN", "1800"))
 
@@ -84,6 +95,11 @@ class ProxyPool:
     def __len__(self) -> int:
         return sum(1 for p in self._pool if self._is_healthy(p))
 
+    @property
+    def size(self) -> int:
+        """Configured proxies, healthy or cooling down."""
+        return len(self._pool)
+
 
 class EgressManager:
     """
@@ -104,6 +120,10 @@ class EgressManager:
         if proxy_list:
             logger.info(f"EgressManager: {len(proxy_list)} proxy(ies) configured")
 
+    @property
+    def proxy_pool(self) -> ProxyPool:
+        return self._proxy_pool
+
     @classmethod
     def from_env(cls) -> EgressManager:
         """
@@ -118,7 +138,12 @@ class EgressManager:
         proxies = [p.strip() for p in raw.split(",") if p.strip()]
         return cls(proxy_list=proxies)
 
-    def fetch(self, url: str) -> str:
+    def fetch(
+        self,
+        url: str,
+        cancel: CancelToken | None = None,
+        deadline: Deadline | None = None,
+    ) -> str:
         """
         Attempt fetch via all available egress paths in order:
           1. curl_cffi direct
@@ -127,23 +152,50 @@ class EgressManager:
 
         Each path is retried up to MAX_RETRIES times with exponential backoff
         via RetryEngine before escalating to the next path.
-        Raises FetchExhausted if every path on every retry fails.
+        All of it runs against one Deadline (default: FETCH_BUDGET_S): request
+        timeouts are clamped to the remaining budget, and once it is spent the
+        remaining layers are skipped.
+        Raises FetchExhausted if every path on every retry fails or the budget
+        runs out, and JobCancelled once `cancel` is cancelled (checked between
+        attempts and during backoff sleeps).
         """
         config = RetryConfig(max_attempts=MAX_RETRIES)
+        budget = deadline or Deadline(FETCH_BUDGET_S)
         proxy = self._proxy_pool.get_next()
 
         layers: list[tuple[str, Any]] = [
-            ("curl_cffi", lambda: self._fetch_curl_cffi(url, proxy=None)),
+            (
+                "curl_cffi",
+                lambda: self._fetch_curl_cffi(url, proxy=None, timeout=budget.clamp(TIMEOUT)),
+            ),
         ]
         if proxy:
-            layers.append(("curl_cffi_proxy", lambda: self._fetch_curl_cffi(url, proxy=proxy)))
-        layers.append(("cloudscraper", lambda: self._fetch_cloudscraper(url, proxy=proxy)))
+            layers.append(
+                (
+                    "curl_cffi_proxy",
+                    lambda: self._fetch_curl_cffi(url, proxy=proxy, timeout=budget.clamp(TIMEOUT)),
+                )
+            )
+        layers.append(
+            (
+                "cloudscraper",
+                lambda: self._fetch_cloudscraper(url, proxy=proxy, timeout=budget.clamp(TIMEOUT)),
+            )
+        )
 
         for layer_name, attempt_fn in layers:
-            result = self._retry_engine.execute(attempt_fn, config, layer_name)
+            if budget.expired:
+                logger.warning(f"Fetch budget of {budget.budget_s:.0f}s exhausted for {url}")
+                break
+            with timed(f"egress.{layer_name}"):
+                result = self._retry_engine.execute(
+                    attempt_fn, config, layer_name, cancel=cancel, deadline=budget
+                )
             if result is not None:
+                _LAYER_RESULTS.inc(layer=layer_name, result="success")
                 logger.debug(f"✓ [{layer_name}] fetched {url}")
                 return cast(str, result)
+            _LAYER_RESULTS.inc(layer=layer_name, result="exhausted")
             logger.warning(f"[{layer_name}] all retries exhausted for {url}")
             # Only a curl_cffi_proxy failure reliably indicates a bad proxy.
             # cloudscraper failures are too noisy (JS-challenge mismatch, etc.)
@@ -153,15 +205,17 @@ class EgressManager:
 
         raise FetchExhausted(url)
 
-    def _fetch_curl_cffi(self, url: str, proxy: str | None) -> str:
-        response = self._cffi_session.get(url, proxy=proxy, timeout=TIMEOUT)
+    def _fetch_curl_cffi(self, url: str, proxy: str | None, timeout: float = TIMEOUT) -> str:
+        response = self._cffi_session.get(url, proxy=proxy, timeout=timeout)
         cast(Any, response).raise_for_status()
         if "Just a moment..." in response.text or "Attention Required" in response.text:
             raise ValueError("Cloudflare block detected")
         return str(response.text)
 
-    def _fetch_cloudscraper(self, url: str, proxy: str | None = None) -> str:
-        kwargs: dict[str, Any] = {"timeout": TIMEOUT}
+    def _fetch_cloudscraper(
+        self, url: str, proxy: str | None = None, timeout: float = TIMEOUT
+    ) -> str:
+        kwargs: dict[str, Any] = {"timeout": timeout}
         if proxy:
             kwargs["proxies"] = {"http": proxy, "https": proxy}
         response = self._cloudscraper.get(url, **kwargs)
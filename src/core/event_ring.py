@@ -0,0 +1,45 @@
+"""
+Bounded, sequence-numbered in-memory event buffer that readers can long-poll.
+
+Shared by the daemon control socket (job events) and the web server's change
+feed (new magnets, finished runs, daemon state). Sequence numbers are local
+to one process; a reader presenting a cursor newer than the ring (e.g. from
+before a restart) is treated as starting from zero.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any
+
+DEFAULT_MAXLEN = 500
+
+
+class EventRing:
+    def __init__(self, maxlen: int = DEFAULT_MAXLEN) -> None:
+        self._cond = threading.Condition()
+        self._events: deque[dict[str, Any]] = deque(maxlen=maxlen)
+        self._seq = 0
+
+    @property
+    def last(self) -> int:
+        with self._cond:
+            return self._seq
+
+    def emit(self, kind: str, **data: Any) -> dict[str, Any]:
+        with self._cond:
+            self._seq += 1
+            event = {"seq": self._seq, "ts": round(time.time(), 3), "type": kind, **data}
+            self._events.append(event)
+            self._cond.notify_all()
+            return event
+
+    def since(self, since: int, wait: float = 0.0) -> tuple[list[dict[str, Any]], int]:
+        """Events with seq > `since`, waiting up to `wait` seconds for one to arrive."""
+        with self._cond:
+            if since > self._seq:
+                since = 0
+            self._cond.wait_for(lambda: self._seq > since, timeout=max(0.0, wait))
+            return [e for e in self._events if e["seq"] > since], self._seq
@@ -0,0 +1,76 @@
+"""
+In-memory Bloom filter of stored info hashes, consulted by MagnetStore.has_hash().
+
+A miss means the hash is definitely not in the archive, so the common case on
+scrape, import and backfill paths — a new hash — is answered without a query.
+A hit only means "maybe": has_hash() confirms it with the unique index.
+
+Info hashes are SHA-1 digests and already uniformly distributed, so the k bit
+positions are derived from the hash itself by double hashing (two 64-bit
+halves of its first 128 bits) instead of running further hash functions.
+"""
+
+from __future__ import annotations
+
+import math
+
+from src.core.telemetry import REGISTRY
+
+FP_RATE = 0.01
+MIN_CAPACITY = 100_000
+
+_FILTER_BYTES = REGISTRY.gauge("bind_hash_filter_bytes", "Memory used by the info-hash filter")
+_FILTER_ITEMS = REGISTRY.gauge("bind_hash_filter_items", "Hashes added to the info-hash filter")
+_FILTER_FP_RATE = REGISTRY.gauge(
+    "bind_hash_filter_estimated_fp_rate", "Expected false-positive rate at the current fill"
+)
+FILTER_CHECKS = REGISTRY.counter(
+    "bind_hash_filter_checks_total",
+    "has_hash() lookups by filter outcome (new, present, false_positive)",
+)
+
+
+class HashFilter:
+    """Bloom filter sized for `capacity` lowercase hex hashes at `fp_rate`."""
+
+    def __init__(self, capacity: int, fp_rate: float = FP_RATE) -> None:
+        self.capacity = max(capacity, MIN_CAPACITY)
+        self.fp_rate = fp_rate
+        bits = math.ceil(-self.capacity * math.log(fp_rate) / math.log(2) ** 2)
+        self.num_bits = (bits + 7) // 8 * 8
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray(self.num_bits // 8)
+
+    def _positions(self, info_hash: str) -> list[int]:
+        h = int(info_hash[:32], 16)
+        h1, h2 = h >> 64, (h & 0xFFFFFFFFFFFFFFFF) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, info_hash: str) -> None:
+        for pos in self._positions(info_hash):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, info_hash: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(info_hash))
+
+    @property
+    def full(self) -> bool:
+        """More hashes than it was sized for; the false-positive rate is climbing."""
+        return self.count > self.capacity
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    def estimated_fp_rate(self) -> float:
+        return float(
+            (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+        )
+
+    def publish(self) -> None:
+        """Report size and fill to the metrics registry."""
+        _FILTER_BYTES.set(self.nbytes)
+        _FILTER_ITEMS.set(self.count)
+        _FILTER_FP_RATE.set(self.estimated_fp_rate())
@@ -0,0 +1,176 @@
+"""
+Bulk import of magnet dumps into the archive (`bind import`).
+
+Input is streamed record by record — plain or gzip-compressed — and written
+in chunks of CHUNK_SIZE rows, one transaction each. Supported formats:
+
+    magnets  one magnet URI per line (the legacy magnets_YYYY-MM-DD.txt files)
+    ndjson   one JSON object per line with ``info_hash`` or ``magnet``, and
+             optionally ``title`` and ``collected_date`` (the `bind export` shape)
+    csv      the same fields as columns, with a header row
+
+Every chunk also records how many input records have been consumed in the
+``import_jobs`` table, so an interrupted import of an unchanged file (same
+size and mtime) resumes where it stopped. Records that cannot be parsed are
+counted and skipped; hashes already in the archive are ignored.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import itertools
+import json
+import logging
+import os
+import re
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import IO, Any
+from urllib.parse import parse_qs, urlsplit
+
+from src.core.storage import MagnetStore
+
+logger = logging.getLogger("importer")
+
+FORMATS = ("magnets", "ndjson", "csv")
+CHUNK_SIZE = 50_000
+
+_RE_HASH = re.compile(r"^[0-9a-f]{40}$")
+_RE_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+Row = tuple[str, str, str, str, None]
+
+
+@dataclass
+class ImportResult:
+    """Outcome of importing one file (this run only, not earlier resumed runs)."""
+
+    source: str
+    fmt: str
+    resumed_from: int = 0
+    records: int = 0
+    inserted: int = 0
+    invalid: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+
+def detect_format(path: str) -> str:
+    name = path.lower().removesuffix(".gz")
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    return "magnets"
+
+
+def fingerprint(path: str) -> str:
+    """Identifies a file's contents well enough to decide whether to resume."""
+    st = os.stat(path)
+    return f"{st.st_size}:{int(st.st_mtime)}"
+
+
+def _open_text(path: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace", newline="")
+    return open(path, encoding="utf-8", errors="replace", newline="")
+
+
+def _row(fields: dict[str, Any], default_date: str) -> Row | None:
+    """Row from an NDJSON object / CSV record; None if it has no usable hash."""
+    info_hash = str(fields.get("info_hash") or "").strip().lower()
+    title = str(fields.get("title") or "").strip()
+    magnet = str(fields.get("magnet") or "")
+    if magnet.startswith("magnet:"):
+        params = parse_qs(urlsplit(magnet).query)
+        for xt in params.get("xt", []):
+            if xt.lower().startswith("urn:btih:"):
+                info_hash = info_hash or xt[9:].lower()
+        title = title or (params.get("dn") or [""])[0]
+    if not _RE_HASH.match(info_hash):
+        return None
+    date = str(fields.get("collected_date") or "")[:10]
+    if not _RE_ISO_DATE.match(date):
+        date = default_date
+    return (info_hash, title or info_hash, date, f"{date}T00:00:00.000Z", None)
+
+
+def iter_records(path: str, fmt: str, default_date: str) -> Iterator[Row | None]:
+    """One item per input record: a row, or None for a record that did not parse."""
+    # Imported lazily: the migrate module configures logging at import time.
+    from src.core.migrate import _RE_DATE, _parse_line
+
+    with _open_text(path) as f:
+        if fmt == "magnets":
+            m = _RE_DATE.search(os.path.basename(path).removesuffix(".gz"))
+            date = m.group(1) if m else default_date
+            for line in f:
+                if line.strip():
+                    yield _parse_line(line, date)
+        elif fmt == "ndjson":
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    yield None
+                    continue
+                yield _row(obj, default_date) if isinstance(obj, dict) else None
+        elif fmt == "csv":
+            for record in csv.DictReader(f):
+                yield _row(record, default_date)
+        else:
+            raise ValueError(f"unknown import format: {fmt!r}")
+
+
+def import_file(
+    store: MagnetStore,
+    path: str,
+    fmt: str = "auto",
+    default_date: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    restart: bool = False,
+    progress: Callable[[ImportResult], None] | None = None,
+) -> ImportResult:
+    """Import `path`, resuming an unfinished import of the same file unless `restart`.
+
+    Call inside ``store.bulk_load()`` for full speed; `progress` is called after
+    every chunk.
+    """
+    fmt = detect_format(path) if fmt == "auto" else fmt
+    default_date = default_date or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    source = os.path.abspath(path)
+    job = store.start_import(source, fingerprint(path), fmt, restart=restart)
+    result = ImportResult(source=source, fmt=fmt, resumed_from=job["position"])
+    if job["position"]:
+        logger.info(f"⏩ Resuming {path} after {job['position']:,} records")
+
+    t0 = time.monotonic()
+    position = job["position"]
+    records = itertools.islice(iter_records(path, fmt, default_date), position, None)
+    while True:
+        batch = list(itertools.islice(records, chunk_size))
+        if not batch:
+            break
+        rows = [r for r in batch if r is not None]
+        position += len(batch)
+        result.records += len(batch)
+        result.invalid += len(batch) - len(rows)
+        result.inserted += store.import_chunk(job["id"], rows, position)
+        result.seconds = time.monotonic() - t0
+        if progress is not None:
+            progress(result)
+    store.finish_import(job["id"])
+    result.seconds = time.monotonic() - t0
+    logger.info(
+        f"📥 Imported {path}: {result.inserted:,} new of {result.records:,} records "
+        f"({result.invalid:,} invalid) at {result.rows_per_s:,.0f} rows/s"
+    )
+    return result
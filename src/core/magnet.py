@@ -1,16 +1,21 @@
 from urllib.parse import quote_plus
 
 
+def tracker_suffix(trackers: list[str]) -> str:
+    """The '&tr=...' tail shared by every magnet built with `trackers`."""
+    return "".join(f"&tr={tr}" for tr in trackers)
+
+
 def generate_magnet(info_hash: str, title: str, trackers: list[str]) -> str:
     """
     Generates a robust magnet link with trackers.
     Title is URL-encoded to handle special characters (&, +, =, ?, #, spaces, etc.)
     """
+    return magnet_with_suffix(info_hash, title, tracker_suffix(trackers))
+
+
+def magnet_with_suffix(info_hash: str, title: str, suffix: str) -> str:
+    """generate_magnet() with a precomputed tracker_suffix(), for bulk output."""
     # URL-encode title to prevent broken links when title contains special characters
     # quote_plus() encodes spaces as '+' and special chars as '%XX'
-    title_encoded = quote_plus(title)
-
-    magnet = f"magnet:?xt=urn:btih:{info_hash}&dn={title_encoded}"
-    for tr in trackers:
-        magnet += f"&tr={tr}"
-    return magnet
+    return f"magnet:?xt=urn:btih:{info_hash}&dn={quote_plus(title)}{suffix}"
@@ -0,0 +1,106 @@
+"""
+Structured book metadata from a detail page, extracted from the same parse
+tree the info hash comes from (BindScraper.extract_details).
+
+The upstream layout is loose — labelled fragments such as "Written by:",
+"Read by:", "Format:" and "Bitrate:" in the post body, and a torrent table
+with "File Size:" — so every field is optional and extraction never fails
+the page: a field that cannot be found is None.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from bs4 import BeautifulSoup, Tag
+
+_MAX_FIELD = 200
+
+_LABELS = {
+    "author": ("Written by", "Author", "Authors"),
+    "narrator": ("Read by", "Narrated by", "Narrator", "Narrators"),
+    "format": ("Format",),
+    "bitrate": ("Bitrate",),
+    "category": ("Category",),
+}
+_FORMATS = {"MP3", "M4B", "M4A", "AAC", "FLAC", "OGG", "OPUS", "WMA", "WAV"}
+_SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+
+_RE_BITRATE = re.compile(r"(\d+(?:\.\d+)?)\s*k", re.IGNORECASE)
+_RE_SIZE = re.compile(r"(\d+(?:[.,]\d+)?)\s*([KMGT]?B)", re.IGNORECASE)
+
+
+@dataclass
+class BookMetadata:
+    author: str | None = None
+    narrator: str | None = None
+    format: str | None = None
+    bitrate_kbps: int | None = None
+    size_bytes: int | None = None
+    category: str | None = None
+
+    def as_row(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def __bool__(self) -> bool:
+        return any(v is not None for v in asdict(self).values())
+
+
+def _clean(value: str) -> str | None:
+    value = " ".join(value.split()).strip(" :,-/|")
+    return value[:_MAX_FIELD] or None
+
+
+def _labelled(text: str, labels: tuple[str, ...]) -> str | None:
+    """Value after 'Label:' in the post text, up to the next line break or label."""
+    for label in labels:
+        m = re.search(rf"(?:^|[\n|/])\s*{label}\s*:\s*([^\n|]+)", text, re.IGNORECASE)
+        if m:
+            # "Format: M4B / Bitrate: 64 Kbps" share a line on many pages.
+            value = re.split(r"\s/\s|\s{2,}|\b\w[\w ]{0,20}:\s", m.group(1))[0]
+            return _clean(value)
+    return None
+
+
+def _table_value(soup: BeautifulSoup, label: str) -> str | None:
+    cell = soup.find(["td", "th"], string=re.compile(rf"^\s*{label}\s*:?\s*$", re.IGNORECASE))
+    if isinstance(cell, Tag):
+        sibling = cell.find_next_sibling("td")
+        if sibling is not None:
+            return _clean(sibling.get_text(" "))
+    return None
+
+
+def parse_size(value: str | None) -> int | None:
+    """'1.02 GBs' -> bytes (binary units, as the upstream reports them)."""
+    m = _RE_SIZE.search(value or "")
+    if not m:
+        return None
+    return int(float(m.group(1).replace(",", ".")) * _SIZE_UNITS[m.group(2).upper()])
+
+
+def extract_metadata(soup: BeautifulSoup) -> BookMetadata:
+    meta = BookMetadata()
+    for css, field in (("span.author", "author"), ("span.narrator", "narrator")):
+        tag = soup.select_one(css)
+        if tag is not None:
+            setattr(meta, field, _clean(tag.get_text(" ")))
+
+    text = soup.get_text("\n")
+    meta.author = meta.author or _labelled(text, _LABELS["author"])
+    meta.narrator = meta.narrator or _labelled(text, _LABELS["narrator"])
+    meta.category = _labelled(text, _LABELS["category"])
+
+    fmt = _labelled(text, _LABELS["format"])
+    if fmt:
+        token = fmt.split()[0].upper()
+        meta.format = token if token in _FORMATS else None
+
+    m = _RE_BITRATE.search(_labelled(text, _LABELS["bitrate"]) or "")
+    if m:
+        meta.bitrate_kbps = round(float(m.group(1)))
+
+    meta.size_bytes = parse_size(_table_value(soup, "File Size") or _labelled(text, ("File Size",)))
+    return meta
@@ -2,7 +2,7 @@
 One-shot migration from flat magnets_YYYY-MM-DD.txt files to SQLite.
 
 Usage:
-    python -m src.core.migrate --magnets-dir data/magnets --db-path data/bind.db
+    python -m src.core.migrate --magnets-dir data/magnets --db-path data/bind.db [--workers N]
 """
 
 import argparse
@@ -10,6 +10,10 @@ import glob
 import logging
 import os
 import re
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 from urllib.parse import unquote_plus
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
@@ -19,8 +23,23 @@ _RE_BTIH = re.compile(r"xt=urn:btih:([0-9a-fA-F]{40})", re.IGNORECASE)
 _RE_DN = re.compile(r"[?&]dn=([^&]+)")
 _RE_DATE = re.compile(r"magnets_(\d{4}-\d{2}-\d{2})\.txt$")
 
+# Fewer files than this per process is not worth a worker's startup cost.
+FILES_PER_WORKER = 16
+# Files in flight per worker: parsed rows waiting for the inserter stay bounded.
+PENDING_PER_WORKER = 4
+INSERT_BATCH = 50_000
+_INSERT_SQL = (
+    "INSERT OR IGNORE INTO magnets (info_hash, title, collected_date, collected_at, source)"
+    " VALUES (?, ?, ?, ?, ?)"
+)
 
-def _parse_line(line: str, date_str: str) -> tuple[str, str, str, str, None] | None:
+
+_Row = tuple[str, str, str, str, None]
+# (path, rows, error) — see _parse_file().
+_ParsedFile = tuple[str, list[_Row], str | None]
+
+
+def _parse_line(line: str, date_str: str) -> _Row | None:
     line = line.strip()
     if not line.startswith("magnet:"):
         return None
@@ -34,52 +53,103 @@ def _parse_line(line: str, date_str: str) -> tuple[str, str, str, str, None] | N
     return (info_hash, title, date_str, collected_at, None)
 
 
-def migrate(magnets_dir: str, db_path: str) -> None:
-    from src.core.storage import _SCHEMA_DDL, _open
+def _parse_file(path: str) -> _ParsedFile:
+    """Parse one daily file: (path, rows, error). Runs in a worker process."""
+    m = _RE_DATE.search(os.path.basename(path))
+    assert m is not None  # migrate() only dispatches dated files
+    date_str = m.group(1)
+    rows: list[_Row] = []
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                row = _parse_line(line, date_str)
+                if row:
+                    rows.append(row)
+    except OSError as e:
+        return path, [], str(e)
+    return path, rows, None
+
+
+def _parsed_files(files: list[str], workers: int) -> Iterator[_ParsedFile]:
+    """_parse_file() over `files` in order, fanned out over `workers` processes.
+
+    At most PENDING_PER_WORKER files per worker are submitted ahead of the
+    consumer, so a slow inserter does not let parsed files pile up in memory.
+    """
+    if workers <= 1:
+        yield from map(_parse_file, files)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        todo = iter(files)
+        window: deque[Future[_ParsedFile]] = deque(
+            pool.submit(_parse_file, path) for path in islice(todo, workers * PENDING_PER_WORKER)
+        )
+        while window:
+            result = window.popleft().result()
+            path = next(todo, None)
+            if path is not None:
+                window.append(pool.submit(_parse_file, path))
+            yield result
+
+
+def migrate(magnets_dir: str, db_path: str, workers: int | None = None) -> None:
+    """Import every magnets_YYYY-MM-DD.txt under `magnets_dir` in one transaction.
+
+    Files are parsed by a pool of `workers` processes (default: one per CPU,
+    at most one per FILES_PER_WORKER files) while this process inserts the
+    rows in batches of INSERT_BATCH.
+    """
+    from src.core.storage import _SCHEMA_DDL, _blob_hashes, _open
 
     os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
 
     conn = _open(db_path)
     for stmt in _SCHEMA_DDL:
         conn.execute(stmt)
+    blob = _blob_hashes(conn)
 
     files = sorted(glob.glob(os.path.join(magnets_dir, "magnets_*.txt")))
     if not files:
         logger.info("No magnet files found — nothing to migrate.")
         return
-
-    rows: list[tuple[str, str, str, str, None]] = []
-    for path in files:
-        m = _RE_DATE.search(os.path.basename(path))
-        if not m:
-            continue
-        date_str = m.group(1)
-        try:
-            with open(path, encoding="utf-8", errors="replace") as f:
-                for line in f:
-                    row = _parse_line(line, date_str)
-                    if row:
-                        rows.append(row)
-        except OSError as e:
-            logger.warning(f"Skipping {path}: {e}")
-
-    parsed = len(rows)
-    distinct = len({r[0] for r in rows})
-    logger.info(f"Parsed {parsed} lines, {distinct} distinct hashes from {len(files)} files")
-
+    files = [p for p in files if _RE_DATE.search(os.path.basename(p))]
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, -(-len(files) // FILES_PER_WORKER))
+    workers = max(1, min(workers, len(files)))
+    report_every = max(1, len(files) // 20)
+    logger.info(f"Parsing {len(files)} files with {workers} worker(s)")
+
+    parsed = 0
+    existing = conn.execute("SELECT COUNT(*) FROM magnets").fetchone()[0]
+    # INSERT OR IGNORE adds one row per hash not stored yet; rowcount leaves out
+    # the rows its triggers write.
+    distinct = 0
+    batch: list[tuple[str | bytes, str, str, str, None]] = []
     conn.execute("BEGIN")
     try:
-        conn.executemany(
-            "INSERT OR IGNORE INTO magnets"
-            " (info_hash, title, collected_date, collected_at, source)"
-            " VALUES (?, ?, ?, ?, ?)",
-            rows,
-        )
+        for done, (path, rows, error) in enumerate(_parsed_files(files, workers), 1):
+            if error is not None:
+                logger.warning(f"Skipping {path}: {error}")
+            parsed += len(rows)
+            if blob:
+                batch.extend((bytes.fromhex(h), t, d, a, s) for h, t, d, a, s in rows)
+            else:
+                batch.extend(rows)
+            if len(batch) >= INSERT_BATCH:
+                distinct += conn.executemany(_INSERT_SQL, batch).rowcount
+                batch.clear()
+            if done % report_every == 0 or done == len(files):
+                logger.info(f"Parsed {done}/{len(files)} files, {parsed} lines")
+        if batch:
+            distinct += conn.executemany(_INSERT_SQL, batch).rowcount
         conn.execute("COMMIT")
     except Exception:
         conn.execute("ROLLBACK")
         raise
 
+    logger.info(f"Parsed {parsed} lines, {distinct} new distinct hashes from {len(files)} files")
+
     # Safety rebuild in case triggers misfired during bulk insert
     conn.execute("INSERT INTO magnets_fts(magnets_fts) VALUES ('rebuild')")
     conn.execute("ANALYZE")
@@ -87,9 +157,11 @@ def migrate(magnets_dir: str, db_path: str) -> None:
     inserted = conn.execute("SELECT COUNT(*) FROM magnets").fetchone()[0]
     conn.close()
 
-    logger.info(f"Inserted {inserted} rows (expected {distinct})")
-    if inserted != distinct:
-        raise RuntimeError(f"Row count mismatch: inserted={inserted} distinct_hashes={distinct}")
+    logger.info(f"Table holds {inserted} rows (expected {existing} + {distinct})")
+    if inserted != existing + distinct:
+        raise RuntimeError(
+            f"Row count mismatch: rows={inserted} existing={existing} distinct_hashes={distinct}"
+        )
     logger.info("Migration complete. Flat files are untouched — archive or delete manually.")
 
 
@@ -97,5 +169,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Migrate BIND flat files to SQLite")
     parser.add_argument("--magnets-dir", default="data/magnets")
     parser.add_argument("--db-path", default="data/bind.db")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Parser processes (default: one per CPU)"
+    )
     args = parser.parse_args()
-    migrate(args.magnets_dir, args.db_path)
+    migrate(args.magnets_dir, args.db_path, args.workers)
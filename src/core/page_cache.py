@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from typing import Any
+
+logger = logging.getLogger("PageCache")
+
+# Upper bound on the total on-disk size of the cache (default: 64 MB) and how
+# long a cached page is served before it is fetched again (default: 7 days).
+PAGE_CACHE_MAX_BYTES: int = int(os.environ.get("BIND_PAGE_CACHE_MAX_MB", "64")) * 1024 * 1024
+PAGE_CACHE_TTL_S: float = float(os.environ.get("BIND_PAGE_CACHE_TTL", "604800"))
+# Eviction trims the cache to this fraction of max_bytes, so the directory
+# walk it needs runs once per ~10% of the limit written, not on every put.
+EVICT_LOW_WATER = 0.9
+
+
+class PageCache:
+    """
+    Size-bounded, TTL-limited on-disk cache of fetched detail-page HTML.
+
+    Each entry lives at ``<cache_dir>/<aa>/<sha256(url)>`` as a zlib-compressed
+    JSON document holding the URL, the store time and the HTML. Recency for
+    LRU eviction is the file mtime, bumped on every hit; once the total size
+    exceeds ``max_bytes`` the least recently used entries are removed until it
+    is back under EVICT_LOW_WATER of the limit.
+    Survives restarts and job timeouts, so re-runs cost no network I/O for
+    pages already seen.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = PAGE_CACHE_MAX_BYTES,
+        ttl_s: float = PAGE_CACHE_TTL_S,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, _, size in self._entries())
+        logger.info(
+            f"Page cache at {cache_dir}: {self._total_bytes / 1024:.0f} KiB "
+            f"(limit {max_bytes / (1024 * 1024):.0f} MiB, TTL {ttl_s:.0f}s)"
+        )
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest)
+
+    def _entries(self) -> list[tuple[str, float, int]]:
+        """Return (path, mtime, size) for every entry on disk."""
+        entries: list[tuple[str, float, int]] = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, st.st_mtime, st.st_size))
+        return entries
+
+    def get(self, url: str) -> str | None:
+        """Return the cached HTML for url, or None on a miss or expired entry."""
+        path = self._path(url)
+        with self._lock:
+            try:
+                with open(path, "rb") as f:
+                    entry: dict[str, Any] = json.loads(zlib.decompress(f.read()))
+            except FileNotFoundError:
+                return None
+            except (OSError, zlib.error, ValueError) as e:
+                logger.warning(f"Discarding unreadable cache entry for {url}: {e}")
+                self._remove(path)
+                return None
+
+            if entry.get("url") != url:
+                return None
+            if time.time() - float(entry.get("stored_at", 0)) > self.ttl_s:
+                self._remove(path)
+                return None
+            try:
+                os.utime(path)  # LRU: mark as recently used
+            except OSError:
+                pass
+            return str(entry["html"])
+
+    def put(self, url: str, html: str) -> None:
+        """Store html for url atomically, then evict if over the size limit."""
+        path = self._path(url)
+        payload = zlib.compress(
+            json.dumps({"url": url, "stored_at": time.time(), "html": html}).encode("utf-8")
+        )
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                try:
+                    previous = os.path.getsize(path)
+                except OSError:
+                    previous = 0
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(payload)
+                    os.replace(tmp_path, path)
+                except Exception:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+            except OSError as e:
+                # The cache is an optimisation — a full disk must never fail a scrape.
+                logger.warning(f"Could not write cache entry for {url}: {e}")
+                return
+            self._total_bytes += len(payload) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _remove(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            self._total_bytes -= size
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in
+        EVICT_LOW_WATER of max_bytes."""
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        self._total_bytes = sum(size for _, _, size in entries)
+        target = self.max_bytes * EVICT_LOW_WATER
+        evicted = 0
+        for path, _, _ in entries:
+            if self._total_bytes <= target:
+                break
+            self._remove(path)
+            evicted += 1
+        if evicted:
+            logger.debug(f"Page cache evicted {evicted} entries")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries()), "bytes": self._total_bytes}
@@ -0,0 +1,112 @@
+"""
+On-demand sampling profiler for the daemon and the RSS server.
+
+A background thread samples every other thread's stack through
+sys._current_frames() at a fixed interval for a bounded duration and writes
+the result in collapsed-stack format (one ``frame;frame;... count`` line per
+distinct stack, root first) — the input format of flamegraph.pl, speedscope
+and inferno. Pure Python, no tracing hooks: the profiled code runs at full
+speed and only the sampler thread pays for the walk.
+
+Triggers: the daemon starts a profile when a ``.profile`` control file
+appears in the data dir (its content, if any, is the duration in seconds);
+the RSS server exposes POST /api/debug/profile, which profiles the worker
+that handles it or writes the control file for the daemon.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from types import FrameType
+
+logger = logging.getLogger("profiler")
+
+DEFAULT_DURATION_S = 30
+MAX_DURATION_S = 300
+SAMPLE_INTERVAL_S = 0.01
+
+# Only one profile per process at a time.
+_active_lock = threading.Lock()
+
+
+def clamp_duration(raw: object) -> int:
+    """Parse a requested duration; fall back to the default, cap at MAX_DURATION_S."""
+    try:
+        seconds = int(str(raw).strip())
+    except (TypeError, ValueError):
+        return DEFAULT_DURATION_S
+    return max(1, min(MAX_DURATION_S, seconds))
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _collapse(frame: FrameType | None, thread_name: str) -> str:
+    stack: list[str] = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.append(thread_name)
+    return ";".join(reversed(stack))
+
+
+def sample_stacks(
+    duration_s: float, interval_s: float = SAMPLE_INTERVAL_S
+) -> tuple[Counter[str], int]:
+    """Sample all other threads for `duration_s`; returns (stack counts, sweeps)."""
+    own = threading.get_ident()
+    counts: Counter[str] = Counter()
+    sweeps = 0
+    deadline = time.monotonic() + duration_s
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            counts[_collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+        sweeps += 1
+        time.sleep(interval_s)
+    return counts, sweeps
+
+
+def write_collapsed(counts: Counter[str], out_dir: str, label: str) -> str:
+    """Write collapsed stacks to <out_dir>/profile-<label>-<UTC stamp>.folded."""
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(out_dir, f"profile-{label}-{stamp}.folded")
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, n in counts.most_common():
+            f.write(f"{stack} {n}\n")
+    return path
+
+
+def is_profiling() -> bool:
+    return _active_lock.locked()
+
+
+def start_profile(duration_s: float, out_dir: str, label: str) -> bool:
+    """Start a background profile; False if one is already running in this process."""
+    if not _active_lock.acquire(blocking=False):
+        return False
+
+    def _run() -> None:
+        try:
+            logger.info(f"🔬 Profiling {label} for {duration_s:.0f}s...")
+            counts, sweeps = sample_stacks(duration_s)
+            path = write_collapsed(counts, out_dir, label)
+            logger.info(f"🔬 Profile written: {path} ({sweeps} samples)")
+        except Exception as e:
+            logger.error(f"Profiling failed: {e}")
+        finally:
+            _active_lock.release()
+
+    threading.Thread(target=_run, name="bind-profiler", daemon=True).start()
+    return True
@@ -0,0 +1,96 @@
+"""
+Per-MagnetStore LRU cache of query results (search pages, facet counts).
+
+Entries are tagged with the version of the magnets and their metadata they
+were computed at — see MagnetStore._magnet_version(): it moves when a magnet
+is added, updated or deleted, or metadata is stored, by this connection or
+another process — and the whole cache is dropped as soon as a lookup sees a
+newer version. Heartbeats and queue or scrape-run bookkeeping leave it alone.
+
+Bounded by entry count and by an estimate of the entries' size in bytes;
+the least recently used entries are evicted first.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from src.core.telemetry import REGISTRY
+
+CACHE_LOOKUPS = REGISTRY.counter(
+    "bind_result_cache_lookups_total", "Result cache lookups by cache and result (hit, miss)"
+)
+_CACHE_BYTES = REGISTRY.gauge("bind_result_cache_bytes", "Estimated size of cached results")
+_CACHE_ENTRIES = REGISTRY.gauge("bind_result_cache_entries", "Cached results")
+
+
+def approx_size(value: Any) -> int:
+    """Rough memory footprint of a result built from dicts, lists, tuples and scalars."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approx_size(v) for v in value)
+    return size
+
+
+class ResultCache:
+    def __init__(self, name: str, max_entries: int, max_bytes: int) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._version: Hashable = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, version: Hashable, key: Hashable) -> Any | None:
+        """The cached result for `key`, or None (a miss) — also when `version` is newer."""
+        with self._lock:
+            if version != self._version:
+                self._clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is None:
+                CACHE_LOOKUPS.inc(cache=self.name, result="miss")
+                return None
+            self._entries.move_to_end(key)
+            CACHE_LOOKUPS.inc(cache=self.name, result="hit")
+            return entry[0]
+
+    def put(self, version: Hashable, key: Hashable, value: Any) -> None:
+        """Cache `value`, computed at `version` after get() missed at that version;
+        dropped if the cache has seen a newer version since."""
+        nbytes = approx_size(value)
+        with self._lock:
+            if version != self._version or nbytes > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+            self._publish()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+        self._publish()
+
+    def _publish(self) -> None:
+        _CACHE_BYTES.set(self.nbytes, cache=self.name)
+        _CACHE_ENTRIES.set(len(self._entries), cache=self.name)
@@ -8,8 +8,17 @@ from typing import Any
 import curl_cffi.requests.exceptions as curl_exc
 import requests.exceptions as requests_exc
 
+from src.core.cancellation import CancelToken
+from src.core.stage_timer import timed
+from src.core.telemetry import REGISTRY
+
 logger = logging.getLogger("RetryEngine")
 
+_ATTEMPTS = REGISTRY.counter("bind_fetch_attempts_total", "HTTP fetch attempts, by egress layer")
+_BACKOFF_SECONDS = REGISTRY.counter(
+    "bind_retry_backoff_seconds_total", "Seconds slept in retry backoff, by egress layer"
+)
+
 # Transient network failures that warrant in-layer retry with backoff.
 # These are the *real* exception types raised by the two egress libraries
 # (both are hard deps in requirements.txt). Neither subclasses the Python
@@ -30,6 +39,11 @@ TRANSIENT_NETWORK_ERRORS: tuple[type[BaseException], ...] = (
 )
 
 
+# Less budget than this counts as spent: no request is started with a timeout
+# it cannot realistically meet (and libcurl reads a timeout of 0 as "none").
+MIN_REQUEST_S = 1.0
+
+
 @dataclass
 class RetryConfig:
     max_attempts: int = 3
@@ -40,6 +54,42 @@ class RetryConfig:
     )
 
 
+class Deadline:
+    """
+    Time budget for fetching one URL, shared by every egress layer and retry.
+    Created by EgressManager.fetch and handed to RetryEngine.execute, which
+    fails fast instead of starting an attempt or a backoff sleep the
+    remaining budget cannot cover.
+    """
+
+    def __init__(self, budget_s: float) -> None:
+        self.budget_s = budget_s
+        self._expires_at = time.monotonic() + budget_s
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """True once less than MIN_REQUEST_S of the budget is left."""
+        return self.remaining() < MIN_REQUEST_S
+
+    def clamp(self, seconds: float) -> float:
+        """Limit a per-request timeout to the remaining budget.
+
+        Raises DeadlineExceeded instead of returning less than MIN_REQUEST_S:
+        the budget can run out between the caller's `expired` check and here.
+        """
+        remaining = self.remaining()
+        if remaining < MIN_REQUEST_S:
+            raise DeadlineExceeded(f"Fetch budget of {self.budget_s:.0f}s exhausted")
+        return min(seconds, remaining)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised by Deadline.clamp when too little budget is left to start a request."""
+
+
 class RetryEngine:
     """
     Executes a callable with exponential backoff and full jitter.
@@ -47,6 +97,11 @@ class RetryEngine:
     transient network, or non-retryable (escalate immediately).
     Uses duck-typing on the exception's .response attribute to avoid
     coupling to a specific HTTP library's exception hierarchy.
+    With a CancelToken, backoff sleeps end (raising JobCancelled) as soon as
+    the owning job is cancelled, and no further attempt is started. With a
+    Deadline, attempts stop once the URL's budget is spent and a backoff
+    longer than the remaining budget fails fast. Retry-After is capped at
+    config.max_delay.
     """
 
     def execute(
@@ -54,10 +109,24 @@ class RetryEngine:
         fn: Callable[[], Any],
         config: RetryConfig,
         layer_name: str,
+        cancel: CancelToken | None = None,
+        deadline: Deadline | None = None,
     ) -> Any:
         for attempt in range(1, config.max_attempts + 1):
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            if deadline is not None and deadline.expired:
+                logger.warning(
+                    f"[{layer_name}] Fetch budget of {deadline.budget_s:.0f}s exhausted. "
+                    "Escalating to next layer."
+                )
+                return None
+            _ATTEMPTS.inc(layer=layer_name)
             try:
                 return fn()
+            except DeadlineExceeded as e:
+                logger.warning(f"[{layer_name}] {e}. Escalating to next layer.")
+                return None
             except Exception as e:
                 response = getattr(e, "response", None)
                 status = getattr(response, "status_code", 0) if response else 0
@@ -65,14 +134,18 @@ class RetryEngine:
                 if status == 429:
                     if attempt == config.max_attempts:
                         return None
-                    wait = self._parse_retry_after(response) or self._jitter(
-                        config.base_delay * (2**attempt), config.max_delay
+                    retry_after = self._parse_retry_after(response)
+                    wait = (
+                        min(retry_after, config.max_delay)
+                        if retry_after
+                        else self._jitter(config.base_delay * (2**attempt), config.max_delay)
                     )
                     logger.warning(
                         f"[{layer_name}] 429 rate-limited. "
                         f"Waiting {wait:.0f}s (attempt {attempt}/{config.max_attempts})"
                     )
-                    time.sleep(wait)
+                    if not self._backoff(wait, layer_name, cancel, deadline):
+                        return None
 
                 elif status in config.retryable_status_codes:
                     if attempt == config.max_attempts:
@@ -82,7 +155,8 @@ class RetryEngine:
                         f"[{layer_name}] HTTP {status} on attempt "
                         f"{attempt}/{config.max_attempts}. Backoff: {delay:.1f}s"
                     )
-                    time.sleep(delay)
+                    if not self._backoff(delay, layer_name, cancel, deadline):
+                        return None
 
                 elif status and status not in config.retryable_status_codes:
                     logger.warning(
@@ -98,7 +172,8 @@ class RetryEngine:
                         f"[{layer_name}] Transient {type(e).__name__} on attempt "
                         f"{attempt}/{config.max_attempts}. Backoff: {delay:.1f}s"
                     )
-                    time.sleep(delay)
+                    if not self._backoff(delay, layer_name, cancel, deadline):
+                        return None
 
                 else:
                     logger.warning(
@@ -109,6 +184,34 @@ class RetryEngine:
 
         return None
 
+    def _backoff(
+        self,
+        seconds: float,
+        layer_name: str,
+        cancel: CancelToken | None,
+        deadline: Deadline | None,
+    ) -> bool:
+        """Sleep before the next attempt; False if the remaining budget cannot cover it."""
+        if deadline is not None and seconds >= deadline.remaining():
+            logger.warning(
+                f"[{layer_name}] Backoff {seconds:.1f}s exceeds the remaining fetch budget "
+                f"({deadline.remaining():.1f}s). Failing fast."
+            )
+            return False
+        with timed("retry_backoff"):
+            try:
+                self._sleep(seconds, cancel)
+            finally:
+                _BACKOFF_SECONDS.inc(seconds, layer=layer_name)
+        return True
+
+    @staticmethod
+    def _sleep(seconds: float, cancel: CancelToken | None) -> None:
+        if cancel is not None:
+            cancel.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
     @staticmethod
     def _jitter(delay: float, cap: float) -> float:
         """Full jitter: random value in [0, min(cap, delay)]."""
@@ -4,13 +4,18 @@ import logging
 import random
 import re
 import time
+from dataclasses import dataclass
 from typing import Any
 
 from bs4 import BeautifulSoup
 
 from src.config_manager import LiveConfig
+from src.core.cancellation import CancelToken
 from src.core.egress_manager import EgressManager, FetchExhausted
+from src.core.metadata import BookMetadata, extract_metadata
+from src.core.page_cache import PageCache
 from src.core.schema_monitor import SchemaHealthMonitor
+from src.core.stage_timer import timed
 
 logger = logging.getLogger("Scraper")
 
@@ -71,34 +76,58 @@ class CircuitBreaker:
         return False
 
 
+@dataclass
+class DetailResult:
+    """Outcome of processing one detail page."""
+
+    info_hash: str | None
+    # Why info_hash is None: "circuit_open", "fetch_failed" or "parse_failed".
+    failure: str | None = None
+    # Author, narrator, format etc. from the same parse; None when it failed.
+    metadata: BookMetadata | None = None
+
+
 class BindScraper:
     # Network Configuration
     REQUEST_TIMEOUT = 30  # seconds - prevents indefinite hangs
+    # Politeness delay before each request, drawn uniformly from this range.
+    JITTER_S: tuple[float, float] = (2.0, 5.0)
 
-    def __init__(self, egress_manager: EgressManager | None = None) -> None:
+    def __init__(
+        self,
+        egress_manager: EgressManager | None = None,
+        page_cache: PageCache | None = None,
+    ) -> None:
         self.circuit_breaker = CircuitBreaker()
         self.egress = egress_manager or EgressManager.from_env()
+        # Optional on-disk cache of detail pages; None disables caching.
+        self.page_cache = page_cache
         self.schema_monitor = SchemaHealthMonitor()
         # Read at instance creation via LiveConfig (env > config.env > default);
         # a changed ABB_URL applies to scrapers created after the change.
         self.base_url = LiveConfig().get("ABB_URL")
 
-    def _get_page(self, url: str) -> str | None:
+    def _get_page(self, url: str, cancel: CancelToken | None = None) -> str | None:
         """
         Fetch a page via the egress manager (three-layer waterfall with retry).
         Circuit breaker gates the entire attempt; only opens after all egress
-        paths and all retries are exhausted.
+        paths and all retries are exhausted. A cancelled `cancel` token aborts
+        the politeness sleep and any retry backoff with JobCancelled.
         """
         if not self.circuit_breaker.can_attempt():
             logger.error("⛔ Circuit breaker OPEN. Skipping request.")
             return None
 
-        delay = random.uniform(2.0, 5.0)
+        delay = random.uniform(*self.JITTER_S)
         logger.debug(f"Sleeping for {delay:.2f}s...")
-        time.sleep(delay)
+        with timed("jitter_sleep"):
+            if cancel is not None:
+                cancel.sleep(delay)
+            else:
+                time.sleep(delay)
 
         try:
-            result = self.egress.fetch(url)
+            result = self.egress.fetch(url, cancel=cancel)
             self.circuit_breaker.record_success()
             return result
         except FetchExhausted:
@@ -106,21 +135,48 @@ class BindScraper:
             self.circuit_breaker.record_failure()
             return None
 
-    def extract_info_hash(self, detail_page_url: str) -> str | None:
+    def extract_info_hash(
+        self, detail_page_url: str, cancel: CancelToken | None = None
+    ) -> str | None:
+        """Fetch a detail page and return its Info Hash (see extract_details)."""
+        return self.extract_details(detail_page_url, cancel=cancel).info_hash
+
+    def extract_details(
+        self, detail_page_url: str, cancel: CancelToken | None = None
+    ) -> DetailResult:
         """
         Fetches a detail page and extracts the Info Hash using a ranked
         4-strategy waterfall. Each strategy outcome is recorded by the
-        SchemaHealthMonitor for drift detection.
+        SchemaHealthMonitor for drift detection. Pages served from the page
+        cache skip the network (and the politeness sleep) entirely; only pages
+        that yielded a hash are written to it. On failure the result says why,
+        so callers can back off pages that are persistently broken. Book
+        metadata is read from the same parse tree as the hash.
         """
         if not detail_page_url.startswith("http"):
             detail_page_url = f"{self.base_url}{detail_page_url}"
 
-        html = self._get_page(detail_page_url)
+        cached = self.page_cache.get(detail_page_url) if self.page_cache else None
+        if cached is None and not self.circuit_breaker.can_attempt():
+            logger.error("⛔ Circuit breaker OPEN. Skipping request.")
+            return DetailResult(None, "circuit_open")
+        html = cached or self._get_page(detail_page_url, cancel=cancel)
         if not html:
-            return None
+            return DetailResult(None, "fetch_failed")
+
+        with timed("parse"):
+            soup = BeautifulSoup(html, "html.parser")
+            found = self._parse_hash_soup(soup, detail_page_url)
+            metadata = extract_metadata(soup) if found else None
+        if found:
+            if self.page_cache and cached is None:
+                self.page_cache.put(detail_page_url, html)
+            return DetailResult(found, metadata=metadata)
 
-        soup = BeautifulSoup(html, "html.parser")
+        return DetailResult(None, "parse_failed")
 
+    def _parse_hash_soup(self, soup: BeautifulSoup, url: str) -> str | None:
+        """Run the ranked parse strategies; record the outcome for drift detection."""
         strategies: list[tuple[str, Any]] = [
             ("td_exact", self._parse_hash_table_td),
             ("th_exact", self._parse_hash_table_th),
@@ -129,13 +185,13 @@ class BindScraper:
         ]
 
         for strategy_name, strategy_fn in strategies:
-            result = strategy_fn(soup, detail_page_url)
+            result = strategy_fn(soup, url)
             if result:
-                self.schema_monitor.record(detail_page_url, strategy_name, True)
+                self.schema_monitor.record(url, strategy_name, True)
                 return str(result)
 
-        logger.warning(f"All parse strategies failed for {detail_page_url}")
-        self.schema_monitor.record(detail_page_url, None, False)
+        logger.warning(f"All parse strategies failed for {url}")
+        self.schema_monitor.record(url, None, False)
         return None
 
     def _parse_hash_table_td(self, soup: BeautifulSoup, url: str) -> str | None:
@@ -176,9 +232,9 @@ class BindScraper:
             return match.group(1).lower()
         return None
 
-    def get_recent_books(self) -> list[dict[str, str]]:
+    def get_recent_books(self, cancel: CancelToken | None = None) -> list[dict[str, str]]:
         rss_url = f"{self.base_url}/rss"
-        xml = self._get_page(rss_url)
+        xml = self._get_page(rss_url, cancel=cancel)
         if not xml:
             return []
 
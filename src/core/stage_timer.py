@@ -0,0 +1,93 @@
+"""
+Per-stage timing for the scrape pipeline.
+
+run_job activates a StageRecorder for the duration of a run; code anywhere
+below it (BindScraper, EgressManager, RetryEngine) wraps its work in
+``with timed("stage"):``. Outside an active run ``timed`` is a no-op, so the
+hooks cost nothing in the RSS server or in tests. Stages nest — e.g.
+``detail_page`` contains ``jitter_sleep``, ``egress.*`` and ``parse`` — so
+their totals are not additive.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_active: ContextVar[StageRecorder | None] = ContextVar("bind_stage_recorder", default=None)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in [0, 100]) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class StageRecorder:
+    """Collects stage durations for one scrape run (thread-safe).
+
+    `on_stage`, if given, is called with each stage name as it is entered
+    (live progress reporting).
+    """
+
+    def __init__(self, on_stage: Callable[[str], None] | None = None) -> None:
+        self._samples: dict[str, list[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.on_stage = on_stage
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[stage].append(seconds)
+
+    def samples(self, stage: str) -> list[float]:
+        """Sorted durations recorded for `stage`."""
+        with self._lock:
+            return sorted(self._samples.get(stage, ()))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Histogram summary per stage: count, total_s, p50_s, p95_s, max_s."""
+        with self._lock:
+            snapshot = {stage: sorted(values) for stage, values in self._samples.items()}
+        return {
+            stage: {
+                "count": len(values),
+                "total_s": round(sum(values), 4),
+                "p50_s": round(percentile(values, 50), 4),
+                "p95_s": round(percentile(values, 95), 4),
+                "max_s": round(values[-1], 4),
+            }
+            for stage, values in snapshot.items()
+        }
+
+
+@contextmanager
+def recording(recorder: StageRecorder | None) -> Iterator[None]:
+    """Make `recorder` the target of timed() in the current thread/context."""
+    token = _active.set(recorder)
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Time the enclosed block into the active recorder, if any."""
+    recorder = _active.get()
+    if recorder is None:
+        yield
+        return
+    if recorder.on_stage is not None:
+        recorder.on_stage(stage)
+    t0 = time.monotonic()
+    try:
+        yield
+    finally:
+        recorder.add(stage, time.monotonic() - t0)
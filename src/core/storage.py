@@ -1,10 +1,74 @@
+import json
 import logging
+import os
+import re
 import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from functools import wraps
+from typing import Any, TypeVar, cast
+
+from src.core.hash_filter import FILTER_CHECKS, HashFilter
+from src.core.metadata import BookMetadata
+from src.core.result_cache import ResultCache
+from src.core.suggest import PrefixIndex
+from src.core.telemetry import REGISTRY
+from src.core.titles import fold_prefix, normalize_title
 
 logger = logging.getLogger("storage")
 
+_QUERY_SECONDS = REGISTRY.histogram(
+    "bind_sqlite_query_seconds", "Wall time spent in MagnetStore methods, by method"
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class QueryTally:
+    """MagnetStore calls made while this tally is active (one per HTTP request)."""
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+_query_tally: ContextVar[QueryTally | None] = ContextVar("bind_query_tally", default=None)
+
+
+def start_query_tally() -> QueryTally:
+    """Start counting MagnetStore calls in the current context; returns the tally."""
+    tally = QueryTally()
+    _query_tally.set(tally)
+    return tally
+
+
+def _observed(fn: F) -> F:
+    """Run a MagnetStore method holding the store's connection lock, and record
+    its wall time in bind_sqlite_query_seconds and in the active QueryTally, if any."""
+    method = fn.__name__
+
+    @wraps(fn)
+    def wrapper(self: "MagnetStore", *args: Any, **kwargs: Any) -> Any:
+        with self._conn_lock:
+            t0 = time.perf_counter()
+            try:
+                return fn(self, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - t0
+                _QUERY_SECONDS.observe(elapsed, method=method)
+                tally = _query_tally.get()
+                if tally is not None:
+                    tally.count += 1
+                    tally.seconds += elapsed
+
+    return cast(F, wrapper)
+
+
 _SCHEMA_DDL = [
     """CREATE TABLE IF NOT EXISTS magnets (
         id              INTEGER PRIMARY KEY,
@@ -12,21 +76,88 @@ _SCHEMA_DDL = [
         title           TEXT    NOT NULL,
         collected_date  TEXT    NOT NULL,
         collected_at    TEXT    NOT NULL,
-        source          TEXT    DEFAULT NULL
+        source          TEXT    DEFAULT NULL,
+        title_norm      TEXT    DEFAULT NULL
     )""",
     """CREATE TABLE IF NOT EXISTS scrape_runs (
         id         INTEGER PRIMARY KEY AUTOINCREMENT,
         run_at     TEXT NOT NULL,
-        result     TEXT NOT NULL CHECK(result IN ('success', 'failure', 'empty', 'timeout')),
+        result     TEXT NOT NULL
+                       CHECK(result IN ('success', 'failure', 'empty', 'timeout', 'cancelled')),
         items_new  INTEGER NOT NULL DEFAULT 0,
         duration_s REAL    NOT NULL DEFAULT 0.0
     )""",
+    """CREATE TABLE IF NOT EXISTS scrape_run_stages (
+        run_id  INTEGER NOT NULL,
+        stage   TEXT    NOT NULL,
+        count   INTEGER NOT NULL,
+        total_s REAL    NOT NULL,
+        p50_s   REAL    NOT NULL,
+        p95_s   REAL    NOT NULL,
+        max_s   REAL    NOT NULL,
+        PRIMARY KEY (run_id, stage)
+    )""",
     """CREATE TABLE IF NOT EXISTS daemon_heartbeat (
         id           INTEGER PRIMARY KEY CHECK (id = 1),
         beat_at      TEXT    NOT NULL,
         state        TEXT    NOT NULL,
         interval_min INTEGER NOT NULL
     )""",
+    """CREATE TABLE IF NOT EXISTS fetch_failures (
+        url             TEXT PRIMARY KEY,
+        reason          TEXT    NOT NULL,
+        attempts        INTEGER NOT NULL DEFAULT 1,
+        last_attempt_at TEXT    NOT NULL,
+        next_retry_at   TEXT    NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS scrape_queue (
+        id          INTEGER PRIMARY KEY AUTOINCREMENT,
+        link        TEXT    NOT NULL UNIQUE,
+        title       TEXT    NOT NULL,
+        state       TEXT    NOT NULL DEFAULT 'pending'
+                        CHECK(state IN ('pending', 'fetched', 'saved', 'failed')),
+        info_hash   TEXT    DEFAULT NULL,
+        metadata    TEXT    DEFAULT NULL,  -- BookMetadata as JSON while 'fetched'
+        enqueued_at TEXT    NOT NULL,
+        updated_at  TEXT    NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_scrape_queue_state ON scrape_queue(state, id)",
+    """CREATE TABLE IF NOT EXISTS import_jobs (
+        id            INTEGER PRIMARY KEY AUTOINCREMENT,
+        source        TEXT    NOT NULL,
+        fingerprint   TEXT    NOT NULL,
+        format        TEXT    NOT NULL,
+        state         TEXT    NOT NULL DEFAULT 'running'
+                          CHECK(state IN ('running', 'done', 'abandoned')),
+        position      INTEGER NOT NULL DEFAULT 0,
+        rows_inserted INTEGER NOT NULL DEFAULT 0,
+        started_at    TEXT    NOT NULL,
+        updated_at    TEXT    NOT NULL
+    )""",
+    # Book metadata read from the detail page (src/core/metadata.py); one row
+    # per magnet that had any. NOCASE columns so the filter indexes serve
+    # case-insensitive equality.
+    """CREATE TABLE IF NOT EXISTS magnet_meta (
+        magnet_id    INTEGER PRIMARY KEY REFERENCES magnets(id) ON DELETE CASCADE,
+        author       TEXT    COLLATE NOCASE,
+        narrator     TEXT    COLLATE NOCASE,
+        format       TEXT    COLLATE NOCASE,
+        bitrate_kbps INTEGER,
+        size_bytes   INTEGER,
+        category     TEXT    COLLATE NOCASE
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_magnet_meta_author ON magnet_meta(author)",
+    "CREATE INDEX IF NOT EXISTS idx_magnet_meta_narrator ON magnet_meta(narrator)",
+    "CREATE INDEX IF NOT EXISTS idx_magnet_meta_format ON magnet_meta(format, bitrate_kbps)",
+    "CREATE INDEX IF NOT EXISTS idx_magnet_meta_category ON magnet_meta(category)",
+    # Bumped by writes that change what search, facets and suggestions read
+    # without going through magnet_changes: set_metadata() on a stored magnet
+    # and the title_norm backfill. See MagnetStore._magnet_version().
+    """CREATE TABLE IF NOT EXISTS meta_version (
+        id      INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    )""",
+    "INSERT OR IGNORE INTO meta_version (id, version) VALUES (1, 0)",
     "CREATE UNIQUE INDEX IF NOT EXISTS idx_magnets_info_hash ON magnets(info_hash)",
     "CREATE INDEX IF NOT EXISTS idx_magnets_date_id ON magnets(collected_date DESC, id DESC)",
     """CREATE VIRTUAL TABLE IF NOT EXISTS magnets_fts USING fts5(
@@ -48,9 +179,147 @@ _SCHEMA_DDL = [
 ]
 
 
+# Releases of one book share magnets.title_norm (src/core/titles.py).
+# release_groups keeps one row per title_norm, with its number of releases and
+# the newest one, maintained by triggers. Created by _upgrade_schema after it
+# has added the title_norm column to older databases.
+_RELEASE_GROUP_DDL = [
+    "CREATE INDEX IF NOT EXISTS idx_magnets_title_norm ON magnets(title_norm, id)",
+    """CREATE TABLE IF NOT EXISTS release_groups (
+        title_norm TEXT    PRIMARY KEY,
+        releases   INTEGER NOT NULL,
+        latest_id  INTEGER NOT NULL
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_release_groups_latest ON release_groups(latest_id)",
+    """CREATE TRIGGER IF NOT EXISTS magnets_group_ai AFTER INSERT ON magnets
+        WHEN new.title_norm IS NOT NULL
+    BEGIN
+        INSERT INTO release_groups(title_norm, releases, latest_id)
+            VALUES (new.title_norm, 1, new.id)
+            ON CONFLICT(title_norm) DO UPDATE
+                SET releases = releases + 1, latest_id = max(latest_id, excluded.latest_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS magnets_group_ad AFTER DELETE ON magnets
+        WHEN old.title_norm IS NOT NULL
+    BEGIN
+        UPDATE release_groups SET releases = releases - 1,
+            latest_id = CASE WHEN latest_id <> old.id THEN latest_id ELSE COALESCE(
+                (SELECT MAX(id) FROM magnets WHERE title_norm = old.title_norm), 0) END
+            WHERE title_norm = old.title_norm;
+        DELETE FROM release_groups WHERE title_norm = old.title_norm AND releases <= 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS magnets_group_au AFTER UPDATE OF title_norm ON magnets
+        WHEN old.title_norm IS NOT new.title_norm
+    BEGIN
+        UPDATE release_groups SET releases = releases - 1,
+            latest_id = CASE WHEN latest_id <> old.id THEN latest_id ELSE COALESCE(
+                (SELECT MAX(id) FROM magnets WHERE title_norm = old.title_norm), 0) END
+            WHERE title_norm = old.title_norm;
+        DELETE FROM release_groups WHERE title_norm = old.title_norm AND releases <= 0;
+        INSERT INTO release_groups(title_norm, releases, latest_id)
+            SELECT new.title_norm, 1, new.id WHERE new.title_norm IS NOT NULL
+            ON CONFLICT(title_norm) DO UPDATE
+                SET releases = releases + 1, latest_id = max(latest_id, excluded.latest_id);
+    END""",
+]
+
+# search(filters=...) keys and the magnet_meta condition each one adds.
+SEARCH_FILTERS = {
+    "author": "mm.author = ?",
+    "narrator": "mm.narrator = ?",
+    "format": "mm.format = ?",
+    "category": "mm.category = ?",
+    "min_bitrate": "mm.bitrate_kbps >= ?",
+}
+
+# Facets counted by MagnetStore.facet_counts(): the table each comes from and
+# its value for a row of that table ({row} is new/old in triggers, m/mm in queries).
+FACETS = {
+    "format": ("magnet_meta", "{row}.format"),
+    "category": ("magnet_meta", "{row}.category"),
+    "source": ("magnets", "{row}.source"),
+    "month": ("magnets", "substr({row}.collected_date, 1, 7)"),
+}
+FACET_LIMIT = 20
+
+# Bounds of the per-store result caches (src/core/result_cache.py).
+SEARCH_CACHE_ENTRIES = 1024
+SEARCH_CACHE_BYTES = 16 * 1024 * 1024
+FACET_CACHE_ENTRIES = 256
+FACET_CACHE_BYTES = 4 * 1024 * 1024
+
+# Dropped for the duration of MagnetStore.bulk_load(): per-row FTS and
+# release-group upkeep and the secondary indexes are rebuilt once at the end
+# instead. The info_hash unique index stays — INSERT OR IGNORE relies on it
+# for de-duplication.
+_BULK_LOAD_SUSPENDED = (
+    "magnets_ai",
+    "magnets_ad",
+    "magnets_au",
+    "magnets_group_ai",
+    "magnets_group_ad",
+    "magnets_group_au",
+    "magnets_facet_ai",
+    "magnets_facet_ad",
+    "magnets_facet_au",
+    "idx_magnets_date_id",
+    "idx_magnets_title_norm",
+)
+
+# PRAGMA user_version records how magnets.info_hash is stored: 0/1 as
+# 40-char lowercase hex TEXT (the default), 2 as the raw 20-byte digest.
+# BIND_HASH_STORAGE=blob|text converts an existing database at startup.
+SCHEMA_VERSION_TEXT_HASH = 1
+SCHEMA_VERSION_BLOB_HASH = 2
+HASH_STORAGE_MODES = ("text", "blob")
+
+# Rejects text hashes from a process still running in text mode after the
+# database was converted, instead of letting them bypass de-duplication.
+_BLOB_HASH_GUARD_DDL = """CREATE TRIGGER IF NOT EXISTS magnets_hash_blob
+    BEFORE INSERT ON magnets
+    WHEN typeof(new.info_hash) <> 'blob' OR length(new.info_hash) <> 20
+BEGIN
+    SELECT RAISE(ABORT, 'info_hash must be a 20-byte BLOB in this database');
+END"""
+
+_RE_HEX_HASH = re.compile(r"[0-9a-f]{40}")
+# Rows read per query while filling the hash filter.
+_FILTER_BATCH = 10_000
+
+# MagnetStore.suggest(): what it completes, default and maximum completions.
+SUGGEST_KINDS = ("title", "author")
+SUGGEST_LIMIT = 10
+SUGGEST_MAX = 25
+# Changes caught up one by one at most; a larger backlog (after a bulk import
+# or a long scrape) rebuilds the suggestion index, which is far cheaper than
+# inserting into its sorted lists row by row.
+SUGGEST_CATCH_UP_MAX = 5000
+
+# Negative-cache backoff for detail pages that failed: 1h after the first
+# failure, doubling per further failure, capped at one week.
+FAILURE_BACKOFF_BASE_S = 3600
+FAILURE_BACKOFF_MAX_S = 7 * 24 * 3600
+
+# Finished (saved/failed) scrape_queue rows are kept this long so an item still
+# listed in the RSS feed is recognised and not processed again.
+QUEUE_RETENTION_DAYS = 30
+
+
+def _utc_stamp(dt: datetime) -> str:
+    """Fixed-width UTC timestamp, safe to compare as a string in SQL."""
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _unhex(value: Any) -> Any:
+    """SQL bind_unhex(): 40-char hex text -> 20-byte BLOB; anything else unchanged."""
+    return bytes.fromhex(value) if isinstance(value, str) else value
+
+
 def _open(db_path: str) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path, timeout=30.0, isolation_level=None, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.create_function("bind_unhex", 1, _unhex, deterministic=True)
+    conn.create_function("bind_normalize_title", 1, normalize_title, deterministic=True)
     for pragma in [
         "PRAGMA journal_mode = WAL",
         "PRAGMA synchronous = NORMAL",
@@ -86,35 +355,348 @@ def _probe(db_path: str) -> sqlite3.Connection:
     return conn
 
 
-def _upgrade_schema(conn: sqlite3.Connection) -> None:
-    """Migrate scrape_runs CHECK constraint to include 'timeout' if missing."""
+def _upgrade_schema(conn: sqlite3.Connection, hash_storage: str | None = None) -> None:
+    """Migrate the scrape_runs CHECK constraint to include 'timeout' and
+    'cancelled' if missing, and convert info_hash storage when `hash_storage`
+    differs from the database's."""
     row = conn.execute(
         "SELECT sql FROM sqlite_master WHERE type='table' AND name='scrape_runs'"
     ).fetchone()
-    if row and "'timeout'" not in row[0]:
+    if row and "'cancelled'" not in row[0]:
         conn.execute("ALTER TABLE scrape_runs RENAME TO _scrape_runs_old")
         conn.execute(
             """CREATE TABLE scrape_runs (
                 id         INTEGER PRIMARY KEY AUTOINCREMENT,
                 run_at     TEXT NOT NULL,
                 result     TEXT NOT NULL
-                               CHECK(result IN ('success', 'failure', 'empty', 'timeout')),
+                               CHECK(result IN ('success', 'failure', 'empty', 'timeout',
+                                                'cancelled')),
                 items_new  INTEGER NOT NULL DEFAULT 0,
                 duration_s REAL    NOT NULL DEFAULT 0.0
             )"""
         )
         conn.execute("INSERT INTO scrape_runs SELECT * FROM _scrape_runs_old")
         conn.execute("DROP TABLE _scrape_runs_old")
-        logger.info("Upgraded scrape_runs schema: added 'timeout' result variant")
+        logger.info("Upgraded scrape_runs schema: added 'timeout'/'cancelled' result variants")
+    columns = [r[1] for r in conn.execute("PRAGMA table_info(scrape_queue)").fetchall()]
+    if columns and "metadata" not in columns:
+        conn.execute("ALTER TABLE scrape_queue ADD COLUMN metadata TEXT DEFAULT NULL")
+        logger.info("Upgraded scrape_queue schema: added metadata")
+    columns = [r[1] for r in conn.execute("PRAGMA table_info(magnets)").fetchall()]
+    if columns:
+        if "title_norm" not in columns:
+            conn.execute("ALTER TABLE magnets ADD COLUMN title_norm TEXT DEFAULT NULL")
+            logger.info("Upgraded magnets schema: added title_norm")
+        for stmt in _RELEASE_GROUP_DDL:
+            conn.execute(stmt)
+    if hash_storage is not None:
+        _convert_hash_storage(conn, to_blob=hash_storage == "blob")
+
+
+@contextmanager
+def _update_triggers_suspended(conn: sqlite3.Connection) -> Iterator[None]:
+    """Drop the FTS and change-log UPDATE triggers for a rewrite of columns
+    neither cares about, and recreate them. Call inside a transaction."""
+    saved = conn.execute(
+        "SELECT name, sql FROM sqlite_master"
+        " WHERE type = 'trigger' AND name IN ('magnets_au', 'magnets_log_au')"
+    ).fetchall()
+    for name, _ in saved:
+        conn.execute(f"DROP TRIGGER {name}")
+    yield
+    for _, sql in saved:
+        conn.execute(sql)
+
+
+def _backfill_title_norm(conn: sqlite3.Connection) -> None:
+    """Fill title_norm (and so release_groups) for rows written without it —
+    databases from before the column, and bulk loads by migrate.py."""
+    if not conn.execute("SELECT 1 FROM magnets WHERE title_norm IS NULL LIMIT 1").fetchone():
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        with _update_triggers_suspended(conn):
+            count = conn.execute(
+                "UPDATE magnets SET title_norm = bind_normalize_title(title)"
+                " WHERE title_norm IS NULL"
+            ).rowcount
+        # The change-log trigger was suspended: publish the regrouping this way.
+        conn.execute("UPDATE meta_version SET version = version + 1")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    logger.info(f"Normalised {count} titles for release grouping")
+
+
+def _blob_hashes(conn: sqlite3.Connection) -> bool:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0]) == SCHEMA_VERSION_BLOB_HASH
+
+
+def _convert_hash_storage(conn: sqlite3.Connection, to_blob: bool) -> None:
+    """Rewrite every stored info_hash as BLOB (`to_blob`) or hex TEXT, in one transaction.
+
+    The change log is converted alongside, and its update trigger is suspended
+    so the rewrite is not published as a change to every magnet.
+    """
+    if _blob_hashes(conn) == to_blob:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if _blob_hashes(conn) == to_blob:  # another process converted it meanwhile
+            conn.execute("COMMIT")
+            return
+        if to_blob:
+            bad = conn.execute(
+                "SELECT COUNT(*) FROM magnets"
+                " WHERE length(info_hash) <> 40 OR info_hash GLOB '*[^0-9a-f]*'"
+            ).fetchone()[0]
+            if bad:
+                conn.execute("ROLLBACK")
+                logger.warning(
+                    f"Keeping info_hash as TEXT: {bad} stored hashes are not 40 hex characters"
+                )
+                return
+        convert = "bind_unhex(info_hash)" if to_blob else "lower(hex(info_hash))"
+        with _update_triggers_suspended(conn):
+            count = conn.execute(f"UPDATE magnets SET info_hash = {convert}").rowcount
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='magnet_changes'"
+        ).fetchone():
+            conn.execute(f"UPDATE magnet_changes SET info_hash = {convert}")
+        if to_blob:
+            conn.execute(_BLOB_HASH_GUARD_DDL)
+        else:
+            conn.execute("DROP TRIGGER IF EXISTS magnets_hash_blob")
+        version = SCHEMA_VERSION_BLOB_HASH if to_blob else SCHEMA_VERSION_TEXT_HASH
+        conn.execute(f"PRAGMA user_version = {version}")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    logger.info(f"Converted {count} info_hash values to {'BLOB' if to_blob else 'TEXT'}")
+    # Rows shrank in place; compact the file so the saving reaches the page cache.
+    conn.execute("VACUUM")
+
+
+# Append-only change log for incremental sync (/api/magnets/since): one row per
+# insert or update ('upsert') and a tombstone per delete, in a single seq order.
+_CHANGE_LOG_DDL = [
+    """CREATE TABLE magnet_changes (
+        seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+        magnet_id INTEGER NOT NULL,
+        info_hash TEXT    NOT NULL,
+        op        TEXT    NOT NULL CHECK(op IN ('upsert', 'delete'))
+    )""",
+    """CREATE TRIGGER magnets_log_ai AFTER INSERT ON magnets BEGIN
+        INSERT INTO magnet_changes(magnet_id, info_hash, op)
+            VALUES (new.id, new.info_hash, 'upsert');
+    END""",
+    """CREATE TRIGGER magnets_log_au AFTER UPDATE ON magnets BEGIN
+        INSERT INTO magnet_changes(magnet_id, info_hash, op)
+            SELECT old.id, old.info_hash, 'delete' WHERE old.info_hash <> new.info_hash;
+        INSERT INTO magnet_changes(magnet_id, info_hash, op)
+            VALUES (new.id, new.info_hash, 'upsert');
+    END""",
+    """CREATE TRIGGER magnets_log_ad AFTER DELETE ON magnets BEGIN
+        INSERT INTO magnet_changes(magnet_id, info_hash, op)
+            VALUES (old.id, old.info_hash, 'delete');
+    END""",
+]
+
+
+def _ensure_change_log(conn: sqlite3.Connection) -> None:
+    """Create magnet_changes and seed it with the existing archive, atomically.
+
+    Table, triggers and backfill commit together under a write lock, so no
+    magnet inserted by another process in between can be missing from the log.
+    """
+    if conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='magnet_changes'"
+    ).fetchone():
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='magnet_changes'"
+        ).fetchone():
+            for stmt in _CHANGE_LOG_DDL:
+                conn.execute(stmt)
+            cur = conn.execute(
+                "INSERT INTO magnet_changes(magnet_id, info_hash, op)"
+                " SELECT id, info_hash, 'upsert' FROM magnets ORDER BY id"
+            )
+            if cur.rowcount:
+                logger.info(f"Seeded magnet change log with {cur.rowcount} existing magnets")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _facet_triggers(table: str) -> list[str]:
+    """Triggers keeping facet_counts current for the facets read from `table`."""
+
+    def add(row: str, delta: int) -> str:
+        return "".join(
+            f"""
+        INSERT INTO facet_counts(facet, value, count)
+            SELECT '{name}', {expr.format(row=row)}, {delta}
+            WHERE {expr.format(row=row)} IS NOT NULL
+            ON CONFLICT(facet, value) DO UPDATE SET count = count + excluded.count;"""
+            for name, (source, expr) in FACETS.items()
+            if source == table
+        )
+
+    def drop_empty(row: str) -> str:
+        return "".join(
+            f"""
+        DELETE FROM facet_counts
+            WHERE facet = '{name}' AND value = {expr.format(row=row)} AND count <= 0;"""
+            for name, (source, expr) in FACETS.items()
+            if source == table
+        )
+
+    prefix = "magnets_facet" if table == "magnets" else f"{table}_facet"
+    triggers = [
+        f"CREATE TRIGGER {prefix}_ai AFTER INSERT ON {table} BEGIN{add('new', 1)}\n    END",
+        f"CREATE TRIGGER {prefix}_ad AFTER DELETE ON {table} BEGIN"
+        f"{add('old', -1)}{drop_empty('old')}\n    END",
+    ]
+    if table == "magnets":
+        # The magnets facets are derived from these two columns only.
+        triggers.append(
+            f"CREATE TRIGGER {prefix}_au AFTER UPDATE OF source, collected_date ON magnets BEGIN"
+            f"{add('old', -1)}{drop_empty('old')}{add('new', 1)}\n    END"
+        )
+    return triggers
+
+
+# Per-facet value counts of the whole archive, for facet_counts() without a
+# query or filters. Trigger-maintained; rebuilt after MagnetStore.bulk_load().
+_FACET_DDL = [
+    """CREATE TABLE facet_counts (
+        facet TEXT    NOT NULL,
+        value TEXT    NOT NULL COLLATE NOCASE,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (facet, value)
+    ) WITHOUT ROWID""",
+    *_facet_triggers("magnets"),
+    *_facet_triggers("magnet_meta"),
+]
+
+
+def _rebuild_facet_counts(conn: sqlite3.Connection) -> None:
+    """Recount facet_counts from scratch. Call inside a transaction."""
+    conn.execute("DELETE FROM facet_counts")
+    for name, (table, expr) in FACETS.items():
+        value = expr.format(row="t")
+        conn.execute(
+            "INSERT INTO facet_counts(facet, value, count)"
+            f" SELECT ?, {value}, COUNT(*) FROM {table} t"
+            f" WHERE {value} IS NOT NULL GROUP BY {value}",
+            (name,),
+        )
+
+
+def _ensure_facet_counts(conn: sqlite3.Connection) -> None:
+    """Create facet_counts and its triggers and seed it, atomically (see _ensure_change_log)."""
+    exists = "SELECT 1 FROM sqlite_master WHERE type='table' AND name='facet_counts'"
+    if conn.execute(exists).fetchone():
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if not conn.execute(exists).fetchone():
+            for stmt in _FACET_DDL:
+                conn.execute(stmt)
+            _rebuild_facet_counts(conn)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _checked_filters(filters: dict[str, Any] | None) -> dict[str, Any]:
+    """`filters` without None values; ValueError for keys not in SEARCH_FILTERS."""
+    filters = {k: v for k, v in (filters or {}).items() if v is not None}
+    unknown = set(filters) - set(SEARCH_FILTERS)
+    if unknown:
+        raise ValueError(f"Unknown search filter(s): {', '.join(sorted(unknown))}")
+    return filters
+
+
+def _match_conditions(query: str | None, filters: dict[str, Any]) -> tuple[list[str], list[Any]]:
+    """WHERE conditions (on magnets m and magnet_meta mm) selecting what search() matches."""
+    conditions = [SEARCH_FILTERS[name] for name in filters]
+    params: list[Any] = list(filters.values())
+    if query and len(query) < 3:
+        conditions.append("m.title LIKE ? COLLATE NOCASE")
+        params.append(f"%{query}%")
+    elif query:
+        conditions.append("m.id IN (SELECT rowid FROM magnets_fts WHERE title LIKE ?)")
+        params.append(f"%{query}%")
+    return conditions, params
 
 
 class MagnetStore:
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, read_only: bool = False) -> None:
+        """Open (creating or upgrading) the database at `db_path`.
+
+        `read_only` opens an existing, current database for reads only —
+        no schema check, upgrade or hash conversion — as the change feed does.
+        """
         self.db_path = db_path
-        self._conn = _probe(db_path)
+        # One connection per store, shared by the threads of a gunicorn gthread
+        # worker: every public method holds this lock (see _observed), so their
+        # transactions and the cached state below never interleave. SQLite
+        # serialises calls on one connection anyway.
+        self._conn_lock = threading.RLock()
+        self._conn = _open(db_path) if read_only else _probe(db_path)
+        if read_only:
+            self._conn.execute("PRAGMA query_only = ON")
+        else:
+            self._open_schema()
+        # Hash storage mode, re-read whenever another connection commits: any
+        # process may convert the database while this one keeps running.
+        self._blob = _blob_hashes(self._conn)
+        self._blob_checked_at = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        # Built on the first has_hash(); see _maybe_stored().
+        self._filter: HashFilter | None = None
+        self._filter_seq = 0
+        self._filter_version = -1
+        self._filter_lock = threading.Lock()
+        # Built on the first suggest(); see _build_suggest().
+        self._suggest: dict[str, PrefixIndex] | None = None
+        self._suggest_seq = 0
+        self._suggest_meta = 0
+        self._suggest_version: tuple[int, int] | None = None
+        self._suggest_lock = threading.Lock()
+        # See _magnet_version().
+        self._magnet_version_at: tuple[int, int] | None = None
+        self._magnet_version_value = (0, 0)
+        self._search_cache = ResultCache("search", SEARCH_CACHE_ENTRIES, SEARCH_CACHE_BYTES)
+        self._facet_cache = ResultCache("facets", FACET_CACHE_ENTRIES, FACET_CACHE_BYTES)
+        logger.info(f"MagnetStore ready at {db_path}{' (read-only)' if read_only else ''}")
+
+    def _open_schema(self) -> None:
+        """Create missing tables, upgrade old schemas and convert hash storage."""
         self._init_schema()
-        _upgrade_schema(self._conn)
-        logger.info(f"MagnetStore ready at {db_path}")
+        hash_storage = os.environ.get("BIND_HASH_STORAGE", "").strip().lower() or None
+        if hash_storage not in (None, *HASH_STORAGE_MODES):
+            logger.warning(f"Ignoring BIND_HASH_STORAGE={hash_storage!r}; use 'text' or 'blob'")
+            hash_storage = None
+        _upgrade_schema(self._conn, hash_storage)
+        _ensure_change_log(self._conn)
+        _ensure_facet_counts(self._conn)
+        _backfill_title_norm(self._conn)
+        interrupted = self._conn.execute(
+            "SELECT COUNT(*) FROM import_jobs WHERE state = 'running'"
+        ).fetchone()[0]
+        if interrupted:
+            logger.warning(
+                f"{interrupted} bulk import(s) did not finish — search may miss their rows "
+                "until `bind import` is re-run on the same file(s) to resume."
+            )
 
     def _init_schema(self) -> None:
         for stmt in _SCHEMA_DDL:
@@ -123,47 +705,414 @@ class MagnetStore:
     def close(self) -> None:
         self._conn.close()
 
+    @property
+    def _blob_hashes(self) -> bool:
+        """True if info hashes are stored as BLOBs (see SCHEMA_VERSION_BLOB_HASH)."""
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._blob_checked_at:
+            blob = _blob_hashes(self._conn)
+            if blob != self._blob:
+                logger.info(f"info_hash storage changed to {'BLOB' if blob else 'TEXT'}")
+                self._blob = blob
+            self._blob_checked_at = version
+        return self._blob
+
+    def _key(self, info_hash: str, blob: bool | None = None) -> str | bytes:
+        """`info_hash` as stored: lowercase hex, or the 20-byte digest in BLOB mode.
+        Pass `blob` (self._blob_hashes, read once) when converting many hashes."""
+        if not (self._blob_hashes if blob is None else blob):
+            return info_hash.lower()
+        key = bytes.fromhex(info_hash)
+        if len(key) != 20:
+            raise ValueError(f"info_hash must be 40 hex characters: {info_hash!r}")
+        return key
+
+    def _hex(self, column: str = "info_hash") -> str:
+        """SQL expression reading `column` back as lowercase hex."""
+        return f"lower(hex({column}))" if self._blob_hashes else column
+
+    def _data_version(self) -> tuple[int, int]:
+        """Changes whenever the database does: ``PRAGMA data_version`` moves on
+        commits by other connections, total_changes on this connection's writes."""
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        return version, self._conn.total_changes
+
+    def _magnet_version(self) -> tuple[int, int]:
+        """(last magnet_changes seq, meta_version): moves only when magnets or
+        their metadata change, not on heartbeats or queue and run bookkeeping.
+        Re-read only when _data_version() has moved."""
+        version = self._data_version()
+        if version != self._magnet_version_at:
+            row = self._conn.execute(
+                "SELECT (SELECT COALESCE(MAX(seq), 0) FROM magnet_changes),"
+                " (SELECT version FROM meta_version)"
+            ).fetchone()
+            self._magnet_version_value = (row[0], row[1])
+            self._magnet_version_at = version
+        return self._magnet_version_value
+
+    def clear_caches(self) -> None:
+        """Drop cached search and facet results (magnet and metadata writes drop them anyway)."""
+        self._search_cache.clear()
+        self._facet_cache.clear()
+
+    def _maybe_stored(self, info_hash: str) -> bool:
+        """False if the hash filter proves `info_hash` (lowercase hex) is not stored.
+
+        The filter is built on first use and afterwards only costs a
+        ``PRAGMA data_version`` per call: when another connection has
+        committed, hashes it added are read from the change log.
+        """
+        with self._filter_lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._filter is None or self._filter.full:
+                self._build_filter()
+            elif version != self._filter_version:
+                self._catch_up_filter()
+            self._filter_version = version
+            assert self._filter is not None
+            return info_hash in self._filter
+
+    def _build_filter(self) -> None:
+        # The change-log position is taken first: anything committed while the
+        # table is read is caught up from there (adding a hash twice is harmless).
+        self._filter_seq = self._conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM magnet_changes"
+        ).fetchone()[0]
+        count = self._conn.execute("SELECT COUNT(*) FROM magnets").fetchone()[0]
+        hf = HashFilter(capacity=count * 2)
+        after_id = 0
+        while True:
+            rows = self._conn.execute(
+                f"SELECT id, {self._hex()} FROM magnets WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, _FILTER_BATCH),
+            ).fetchall()
+            if not rows:
+                break
+            for _, h in rows:
+                if _RE_HEX_HASH.fullmatch(h):
+                    hf.add(h)
+            after_id = rows[-1][0]
+        self._filter = hf
+        self._catch_up_filter()
+        logger.debug(f"Built info-hash filter: {hf.count} hashes, {hf.nbytes} bytes")
+
+    def _catch_up_filter(self) -> None:
+        assert self._filter is not None
+        while True:
+            rows = self._conn.execute(
+                f"SELECT seq, {self._hex()} FROM magnet_changes"
+                " WHERE seq > ? AND op = 'upsert' ORDER BY seq LIMIT ?",
+                (self._filter_seq, _FILTER_BATCH),
+            ).fetchall()
+            if not rows:
+                break
+            for _, h in rows:
+                if _RE_HEX_HASH.fullmatch(h):
+                    self._filter.add(h)
+            self._filter_seq = rows[-1][0]
+        self._filter.publish()
+
+    def _remember(self, info_hashes: Iterable[str]) -> None:
+        """Add hashes this connection just wrote to the filter, if it is built."""
+        with self._filter_lock:
+            if self._filter is None:
+                return
+            for h in info_hashes:
+                h = h.lower()
+                if _RE_HEX_HASH.fullmatch(h):
+                    self._filter.add(h)
+            self._filter.publish()
+
+    @_observed
     def add_magnet(
         self,
         info_hash: str,
         title: str,
         collected_date: str,
         source: str | None = None,
+        metadata: BookMetadata | None = None,
     ) -> bool:
+        """Insert a magnet unless its hash is stored; `metadata` (if any) is
+        written in the same transaction, so readers never see one without the other."""
         now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            key = self._key(info_hash)
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO magnets"
+                " (info_hash, title, collected_date, collected_at, source, title_norm)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, title, collected_date, now, source, normalize_title(title)),
+            )
+            if cur.rowcount > 0 and metadata:
+                self._write_metadata(key, metadata)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        if cur.rowcount > 0:
+            self._remember([info_hash])
+        return cur.rowcount > 0
+
+    @_observed
+    def insert_many(self, rows: Iterable[tuple[str, str, str, str | None]]) -> int:
+        """Insert (info_hash, title, collected_date, source) rows in one transaction.
+
+        Duplicate hashes are ignored, as in add_magnet. Returns rows inserted.
+        """
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        rows = list(rows)
+        # IMMEDIATE: the storage mode read below cannot change before the insert.
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            blob = self._blob_hashes
+            cur = self._conn.executemany(
+                "INSERT OR IGNORE INTO magnets"
+                " (info_hash, title, collected_date, collected_at, source, title_norm)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (self._key(h, blob), title, date, now, source, normalize_title(title))
+                    for h, title, date, source in rows
+                ),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._remember(r[0] for r in rows)
+        return cur.rowcount
+
+    @contextmanager
+    def bulk_load(self) -> Iterator[None]:
+        """Suspend FTS, release-group and facet triggers and secondary indexes
+        while loading; rebuild once on exit.
+
+        If the process dies inside the block, the next MagnetStore() recreates
+        triggers and indexes, but the FTS index and release_groups lack the
+        rows loaded so far until an import finishes (resuming rebuilds them).
+        """
+        placeholders = ",".join("?" * len(_BULK_LOAD_SUSPENDED))
+        saved = self._conn.execute(
+            f"SELECT type, name, sql FROM sqlite_master WHERE name IN ({placeholders})",
+            _BULK_LOAD_SUSPENDED,
+        ).fetchall()
+        for kind, name, _ in saved:
+            self._conn.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+        try:
+            yield
+        finally:
+            for kind, name, sql in saved:
+                # Another process opening the store meanwhile may have recreated it.
+                if not self._conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?", (kind, name)
+                ).fetchone():
+                    self._conn.execute(sql)
+            self._conn.execute("INSERT INTO magnets_fts(magnets_fts) VALUES ('rebuild')")
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM release_groups")
+            self._conn.execute(
+                "INSERT INTO release_groups(title_norm, releases, latest_id)"
+                " SELECT title_norm, COUNT(*), MAX(id) FROM magnets"
+                " WHERE title_norm IS NOT NULL GROUP BY title_norm"
+            )
+            _rebuild_facet_counts(self._conn)
+            # Results read mid-load lacked the rows now indexed: drop cached ones.
+            self._conn.execute("UPDATE meta_version SET version = version + 1")
+            self._conn.execute("COMMIT")
+            self._conn.execute("ANALYZE")
+
+    @_observed
+    def start_import(
+        self, source: str, fingerprint: str, fmt: str, restart: bool = False
+    ) -> dict[str, Any]:
+        """Resume the unfinished import of `source` (same fingerprint) or start a new one."""
+        now = _utc_stamp(datetime.now(timezone.utc))
+        row = self._conn.execute(
+            "SELECT * FROM import_jobs WHERE source = ? AND fingerprint = ? AND state = 'running'"
+            " ORDER BY id DESC LIMIT 1",
+            (source, fingerprint),
+        ).fetchone()
+        if row is not None and not restart:
+            return dict(row)
+        if row is not None:
+            self._conn.execute(
+                "UPDATE import_jobs SET state = 'abandoned', updated_at = ? WHERE id = ?",
+                (now, row["id"]),
+            )
         cur = self._conn.execute(
-            "INSERT OR IGNORE INTO magnets (info_hash, title, collected_date, collected_at, source)"
+            "INSERT INTO import_jobs (source, fingerprint, format, started_at, updated_at)"
             " VALUES (?, ?, ?, ?, ?)",
-            (info_hash.lower(), title, collected_date, now, source),
+            (source, fingerprint, fmt, now, now),
+        )
+        return dict(
+            self._conn.execute(
+                "SELECT * FROM import_jobs WHERE id = ?", (cur.lastrowid,)
+            ).fetchone()
         )
-        return cur.rowcount > 0
 
+    @_observed
+    def import_chunk(
+        self, job_id: int, rows: Iterable[tuple[str, str, str, str, str | None]], position: int
+    ) -> int:
+        """Insert (info_hash, title, collected_date, collected_at, source) rows and move
+        the job's checkpoint to `position`, in one transaction. Returns rows inserted."""
+        rows = list(rows)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            blob = self._blob_hashes
+            params = (
+                (self._key(h, blob), title, date, at, source, normalize_title(title))
+                for h, title, date, at, source in rows
+            )
+            cur = self._conn.executemany(
+                "INSERT OR IGNORE INTO magnets"
+                " (info_hash, title, collected_date, collected_at, source, title_norm)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                params,
+            )
+            inserted = cur.rowcount
+            self._conn.execute(
+                "UPDATE import_jobs SET position = ?, rows_inserted = rows_inserted + ?,"
+                " updated_at = ? WHERE id = ?",
+                (position, inserted, _utc_stamp(datetime.now(timezone.utc)), job_id),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._remember(r[0] for r in rows)
+        return inserted
+
+    @_observed
+    def finish_import(self, job_id: int) -> None:
+        self._conn.execute(
+            "UPDATE import_jobs SET state = 'done', updated_at = ? WHERE id = ?",
+            (_utc_stamp(datetime.now(timezone.utc)), job_id),
+        )
+
+    @_observed
     def has_hash(self, info_hash: str) -> bool:
+        try:
+            key = self._key(info_hash)
+        except ValueError:
+            return False
+        hex_hash = info_hash.lower()
+        filtered = bool(_RE_HEX_HASH.fullmatch(hex_hash))
+        if filtered and not self._maybe_stored(hex_hash):
+            FILTER_CHECKS.inc(result="new")
+            return False
         row = self._conn.execute(
-            "SELECT 1 FROM magnets WHERE info_hash = ? LIMIT 1",
-            (info_hash.lower(),),
+            "SELECT 1 FROM magnets WHERE info_hash = ? LIMIT 1", (key,)
         ).fetchone()
+        if filtered:
+            FILTER_CHECKS.inc(result="present" if row else "false_positive")
         return row is not None
 
+    @_observed
     def recent(self, limit: int = 100) -> list[dict[str, Any]]:
         rows = self._conn.execute(
-            "SELECT info_hash, title, collected_date FROM magnets"
+            f"SELECT {self._hex()} AS info_hash, title, collected_date FROM magnets"
             " ORDER BY collected_date DESC, id DESC LIMIT ?",
             (limit,),
         ).fetchall()
         return [dict(r) for r in rows]
 
+    @_observed
+    def set_metadata(self, info_hash: str, metadata: BookMetadata) -> bool:
+        """Store (replace) the book metadata of a stored magnet; False if unknown."""
+        try:
+            key = self._key(info_hash)
+        except ValueError:
+            return False
+        self._conn.execute("BEGIN")
+        try:
+            stored = self._write_metadata(key, metadata)
+            if stored:
+                # Not a magnet change, so not in magnet_changes; readers watch this.
+                self._conn.execute("UPDATE meta_version SET version = version + 1")
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return stored
+
+    def _write_metadata(self, key: str | bytes, metadata: BookMetadata) -> bool:
+        # DELETE + INSERT rather than INSERT OR REPLACE: REPLACE's implicit
+        # delete does not fire the facet_counts triggers.
+        self._conn.execute(
+            "DELETE FROM magnet_meta WHERE magnet_id = (SELECT id FROM magnets WHERE info_hash = ?)",
+            (key,),
+        )
+        cur = self._conn.execute(
+            "INSERT INTO magnet_meta"
+            " (magnet_id, author, narrator, format, bitrate_kbps, size_bytes, category)"
+            " SELECT id, :author, :narrator, :format, :bitrate_kbps, :size_bytes, :category"
+            " FROM magnets WHERE info_hash = :key",
+            {**metadata.as_row(), "key": key},
+        )
+        return cur.rowcount > 0
+
+    @_observed
+    def metadata_of(self, info_hash: str) -> BookMetadata | None:
+        try:
+            key = self._key(info_hash)
+        except ValueError:
+            return None
+        row = self._conn.execute(
+            "SELECT mm.author, mm.narrator, mm.format, mm.bitrate_kbps, mm.size_bytes,"
+            " mm.category FROM magnet_meta mm JOIN magnets m ON m.id = mm.magnet_id"
+            " WHERE m.info_hash = ?",
+            (key,),
+        ).fetchone()
+        return BookMetadata(**dict(row)) if row else None
+
+    @_observed
     def search(
         self,
         query: str | None,
         page: int = 1,
         per_page: int = 50,
+        collapse: bool = False,
+        filters: dict[str, Any] | None = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """A page of magnets matching `query` (newest first) and the total match count.
+
+        With `collapse`, each release group is one row — its newest release,
+        with the group size in ``releases`` — and the total counts groups.
+        `filters` (keys of SEARCH_FILTERS) restrict the result to magnets
+        whose metadata matches; with `collapse` they apply to the newest release.
+
+        Results are cached until magnets or their metadata change; ASCII
+        queries are matched case-insensitively, so they share an entry across case.
+        """
+        filters = _checked_filters(filters)
+        if query and query.isascii():
+            query = query.lower()
+        key = (query or None, page, per_page, collapse, tuple(sorted(filters.items())))
+        version = self._magnet_version()
+        cached = self._search_cache.get(version, key)
+        if cached is None:
+            cached = self._search(query, page, per_page, collapse, filters)
+            self._search_cache.put(version, key, cached)
+        rows, total = cached
+        return [dict(r) for r in rows], total
+
+    def _search(
+        self,
+        query: str | None,
+        page: int,
+        per_page: int,
+        collapse: bool,
+        filters: dict[str, Any],
     ) -> tuple[list[dict[str, Any]], int]:
         offset = (page - 1) * per_page
+        if collapse or filters:
+            return self._search_joined(query, filters, collapse, per_page, offset)
 
         if not query:
             rows = self._conn.execute(
-                "SELECT info_hash, title, collected_date FROM magnets"
+                f"SELECT {self._hex()} AS info_hash, title, collected_date FROM magnets"
                 " ORDER BY collected_date DESC, id DESC LIMIT ? OFFSET ?",
                 (per_page, offset),
             ).fetchall()
@@ -175,7 +1124,7 @@ class MagnetStore:
         if len(query) < 3:
             # Short query: FTS trigram needs ≥3 chars; fall back to full scan
             rows = self._conn.execute(
-                "SELECT info_hash, title, collected_date FROM magnets"
+                f"SELECT {self._hex()} AS info_hash, title, collected_date FROM magnets"
                 " WHERE title LIKE ? COLLATE NOCASE"
                 " ORDER BY collected_date DESC, id DESC LIMIT ? OFFSET ?",
                 (pattern, per_page, offset),
@@ -186,7 +1135,7 @@ class MagnetStore:
             ).fetchone()[0]
         else:
             rows = self._conn.execute(
-                "SELECT info_hash, title, collected_date FROM magnets"
+                f"SELECT {self._hex()} AS info_hash, title, collected_date FROM magnets"
                 " WHERE id IN (SELECT rowid FROM magnets_fts WHERE title LIKE ?)"
                 " ORDER BY collected_date DESC, id DESC LIMIT ? OFFSET ?",
                 (pattern, per_page, offset),
@@ -198,6 +1147,210 @@ class MagnetStore:
 
         return [dict(r) for r in rows], total
 
+    def _search_joined(
+        self,
+        query: str | None,
+        filters: dict[str, Any],
+        collapse: bool,
+        limit: int,
+        offset: int,
+    ) -> tuple[list[dict[str, Any]], int]:
+        # Joining on release_groups.latest_id keeps one row per group without
+        # grouping the result set; the date index still drives the ordering
+        # unless a selective metadata index is the better start.
+        base = " FROM magnets m"
+        columns = f"{self._hex('m.info_hash')} AS info_hash, m.title, m.collected_date"
+        if collapse:
+            base += " JOIN release_groups g ON g.latest_id = m.id"
+            columns += ", g.releases"
+        if filters:
+            base += " JOIN magnet_meta mm ON mm.magnet_id = m.id"
+        conditions, params = _match_conditions(query, filters)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._conn.execute(
+            f"SELECT {columns}{base}{where}"
+            " ORDER BY m.collected_date DESC, m.id DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        ).fetchall()
+        if where:
+            total = self._conn.execute(f"SELECT COUNT(*){base}{where}", params).fetchone()[0]
+        else:
+            total = self._conn.execute("SELECT COUNT(*) FROM release_groups").fetchone()[0]
+        return [dict(r) for r in rows], total
+
+    @_observed
+    def facet_counts(
+        self,
+        query: str | None = None,
+        filters: dict[str, Any] | None = None,
+        limit: int = FACET_LIMIT,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Value counts of each facet (FACETS) over the magnets search() would
+        match, most frequent first, at most `limit` values per facet.
+
+        The whole archive is read from facet_counts; a query or filters count
+        their matches in one grouped pass. Results are cached per arguments
+        until magnets or their metadata change (here or in another process).
+        """
+        filters = _checked_filters(filters)
+        key = (query or None, tuple(sorted(filters.items())), limit)
+        version = self._magnet_version()
+        cached = self._facet_cache.get(version, key)
+        if cached is not None:
+            return cast(dict[str, list[dict[str, Any]]], cached)
+        if query or filters:
+            result = self._count_facets(query, filters, limit)
+        else:
+            result = {
+                name: [
+                    dict(r)
+                    for r in self._conn.execute(
+                        "SELECT value, count FROM facet_counts WHERE facet = ?"
+                        " ORDER BY count DESC, value LIMIT ?",
+                        (name, limit),
+                    )
+                ]
+                for name in FACETS
+            }
+        self._facet_cache.put(version, key, result)
+        return result
+
+    def _count_facets(
+        self, query: str | None, filters: dict[str, Any], limit: int
+    ) -> dict[str, list[dict[str, Any]]]:
+        # One grouped pass over the matches — the FTS rowid set for a query —
+        # yields every combination of facet values; the per-facet totals are
+        # summed from those (far fewer than the matching rows).
+        values = [
+            expr.format(row="m" if table == "magnets" else "mm") for table, expr in FACETS.values()
+        ]
+        conditions, params = _match_conditions(query, filters)
+        rows = self._conn.execute(
+            f"SELECT {', '.join(values)}, COUNT(*)"
+            " FROM magnets m LEFT JOIN magnet_meta mm ON mm.magnet_id = m.id"
+            f" WHERE {' AND '.join(conditions)} GROUP BY {', '.join(values)}",
+            params,
+        ).fetchall()
+        # Keyed case-insensitively, as facet_counts.value and the filters are.
+        totals: dict[str, dict[str, list[Any]]] = {name: {} for name in FACETS}
+        for row in rows:
+            for name, value in zip(FACETS, row[:-1], strict=True):
+                if value is not None:
+                    totals[name].setdefault(str(value).casefold(), [value, 0])[1] += row[-1]
+        return {
+            name: [
+                {"value": v, "count": c}
+                for v, c in sorted(counts.values(), key=lambda vc: (-vc[1], vc[0]))[:limit]
+            ]
+            for name, counts in totals.items()
+        }
+
+    @_observed
+    def suggest(
+        self, prefix: str, kinds: Iterable[str] = SUGGEST_KINDS, limit: int = SUGGEST_LIMIT
+    ) -> list[dict[str, Any]]:
+        """Titles and/or authors starting with `prefix`, most releases/magnets first.
+
+        Served from an in-memory prefix index (src/core/suggest.py) that is
+        caught up from the change log when magnets have changed, and rebuilt
+        when metadata of stored magnets has (meta_version); the FTS table is
+        never read. Titles are release groups, shown as their newest release.
+        """
+        folded = fold_prefix(prefix)
+        if not folded.strip():
+            return []
+        with self._suggest_lock:
+            version = self._magnet_version()
+            if self._suggest is None or version[1] != self._suggest_meta:
+                self._build_suggest()
+            elif version != self._suggest_version:
+                self._catch_up_suggest()
+            self._suggest_version = version
+            assert self._suggest is not None
+            found: list[dict[str, Any]] = [
+                {"text": text, "kind": kind, "count": count}
+                for kind in kinds
+                for text, count in self._suggest[kind].complete(folded, limit)
+            ]
+        found.sort(key=lambda s: (-s["count"], s["text"]))
+        return found[:limit]
+
+    def _build_suggest(self) -> None:
+        # Change-log position and metadata version first, as in _build_filter().
+        self._suggest_seq, self._suggest_meta = self._conn.execute(
+            "SELECT (SELECT COALESCE(MAX(seq), 0) FROM magnet_changes),"
+            " (SELECT version FROM meta_version)"
+        ).fetchone()
+        titles = PrefixIndex(
+            (r[0], r[1], r[2])
+            for r in self._conn.execute(
+                "SELECT g.title_norm, m.title, g.releases"
+                " FROM release_groups g JOIN magnets m ON m.id = g.latest_id"
+            )
+        )
+        authors = PrefixIndex(
+            (fold_prefix(r[0]).strip(), r[0], r[1])
+            for r in self._conn.execute(
+                "SELECT author, COUNT(*) FROM magnet_meta WHERE author IS NOT NULL GROUP BY author"
+            )
+        )
+        self._suggest = {"title": titles, "author": authors}
+        self._catch_up_suggest()
+        logger.debug(f"Built suggestion index: {len(titles)} titles, {len(authors)} authors")
+
+    def _catch_up_suggest(self) -> None:
+        """Add magnets inserted since the index was built. Weights of updated
+        magnets may be counted twice; a delete or a large backlog rebuilds the index."""
+        assert self._suggest is not None
+        backlog = self._conn.execute(
+            "SELECT COUNT(*) FROM magnet_changes WHERE seq > ?", (self._suggest_seq,)
+        ).fetchone()[0]
+        if backlog > max(SUGGEST_CATCH_UP_MAX, len(self._suggest["title"]) // 10):
+            self._build_suggest()
+            return
+        while True:
+            rows = self._conn.execute(
+                "SELECT c.seq, c.op, m.title, m.title_norm, mm.author FROM magnet_changes c"
+                " LEFT JOIN magnets m ON m.id = c.magnet_id"
+                " LEFT JOIN magnet_meta mm ON mm.magnet_id = c.magnet_id"
+                " WHERE c.seq > ? ORDER BY c.seq LIMIT ?",
+                (self._suggest_seq, _FILTER_BATCH),
+            ).fetchall()
+            if not rows:
+                return
+            if any(r["op"] == "delete" for r in rows):
+                self._build_suggest()
+                return
+            for r in rows:
+                if r["title"] is None:  # deleted since; its tombstone follows
+                    continue
+                key = r["title_norm"] or normalize_title(r["title"])
+                self._suggest["title"].add(key, r["title"])
+                if r["author"]:
+                    self._suggest["author"].add(fold_prefix(r["author"]).strip(), r["author"])
+            self._suggest_seq = rows[-1]["seq"]
+
+    @_observed
+    def releases_of(self, info_hash: str) -> list[dict[str, Any]] | None:
+        """All releases grouped with `info_hash` (itself included), newest first;
+        None if the hash is not stored."""
+        try:
+            key = self._key(info_hash)
+        except ValueError:
+            return None
+        row = self._conn.execute(
+            "SELECT id, title_norm FROM magnets WHERE info_hash = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        rows = self._conn.execute(
+            f"SELECT {self._hex()} AS info_hash, title, collected_date FROM magnets"
+            " WHERE title_norm = ? OR id = ? ORDER BY id DESC",
+            (row["title_norm"], row["id"]),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    @_observed
     def stats(self) -> dict[str, Any]:
         today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         total = self._conn.execute("SELECT COUNT(*) FROM magnets").fetchone()[0]
@@ -224,20 +1377,62 @@ class MagnetStore:
             "last_date": last_row[0] if last_row else None,
         }
 
+    @_observed
     def scrape_runs(self, limit: int = 30) -> list[Any]:
         return self._conn.execute(
-            "SELECT run_at, result, items_new, duration_s"
+            "SELECT run_at, result, items_new, duration_s, id"
             " FROM scrape_runs ORDER BY id DESC LIMIT ?",
             (limit,),
         ).fetchall()
 
-    def record_scrape_run(self, result: str, items_new: int, duration_s: float) -> None:
+    @_observed
+    def record_scrape_run(self, result: str, items_new: int, duration_s: float) -> int:
+        """Insert a scrape_runs row; returns its id (for record_run_stages)."""
         run_at = datetime.now(timezone.utc).isoformat()
-        self._conn.execute(
+        cur = self._conn.execute(
             "INSERT INTO scrape_runs (run_at, result, items_new, duration_s) VALUES (?, ?, ?, ?)",
             (run_at, result, items_new, duration_s),
         )
+        return int(cur.lastrowid or 0)
+
+    @_observed
+    def record_run_stages(self, run_id: int, stages: dict[str, dict[str, float]]) -> None:
+        """Persist a StageRecorder summary for one scrape run."""
+        if not stages:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO scrape_run_stages"
+            " (run_id, stage, count, total_s, p50_s, p95_s, max_s)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (run_id, stage, s["count"], s["total_s"], s["p50_s"], s["p95_s"], s["max_s"])
+                for stage, s in stages.items()
+            ],
+        )
 
+    @_observed
+    def run_stages(self, run_ids: list[int]) -> dict[int, dict[str, dict[str, float]]]:
+        """Stage timing summaries keyed by run id, then stage name."""
+        if not run_ids:
+            return {}
+        placeholders = ",".join("?" * len(run_ids))
+        rows = self._conn.execute(
+            "SELECT run_id, stage, count, total_s, p50_s, p95_s, max_s"
+            f" FROM scrape_run_stages WHERE run_id IN ({placeholders})",
+            run_ids,
+        ).fetchall()
+        out: dict[int, dict[str, dict[str, float]]] = {}
+        for r in rows:
+            out.setdefault(r[0], {})[r[1]] = {
+                "count": r[2],
+                "total_s": r[3],
+                "p50_s": r[4],
+                "p95_s": r[5],
+                "max_s": r[6],
+            }
+        return out
+
+    @_observed
     def beat(self, state: str, interval_min: int) -> None:
         """Write the daemon liveness heartbeat (single row, id=1).
 
@@ -258,6 +1453,7 @@ class MagnetStore:
         finally:
             conn.close()
 
+    @_observed
     def last_heartbeat(self) -> dict[str, Any] | None:
         """Return the latest heartbeat row, or None if the daemon never beat."""
         row = self._conn.execute(
@@ -265,6 +1461,86 @@ class MagnetStore:
         ).fetchone()
         return dict(row) if row else None
 
+    @_observed
+    def data_version(self) -> int:
+        """PRAGMA data_version: changes whenever another connection commits."""
+        return int(self._conn.execute("PRAGMA data_version").fetchone()[0])
+
+    @_observed
+    def latest_ids(self) -> tuple[int, int]:
+        """(highest magnets.id, highest scrape_runs.id), 0 for an empty table."""
+        row = self._conn.execute(
+            "SELECT (SELECT COALESCE(MAX(id), 0) FROM magnets),"
+            " (SELECT COALESCE(MAX(id), 0) FROM scrape_runs)"
+        ).fetchone()
+        return int(row[0]), int(row[1])
+
+    @_observed
+    def magnets_after(self, after_id: int, limit: int = 50) -> list[dict[str, Any]]:
+        """Magnets with id > after_id, oldest first."""
+        rows = self._conn.execute(
+            f"SELECT id, {self._hex()} AS info_hash, title, collected_date FROM magnets"
+            " WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    @_observed
+    def scrape_runs_after(self, after_id: int, limit: int = 20) -> list[dict[str, Any]]:
+        """Scrape runs with id > after_id, oldest first."""
+        rows = self._conn.execute(
+            "SELECT id, run_at, result, items_new, duration_s FROM scrape_runs"
+            " WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    @_observed
+    def changes_since(self, seq: int, limit: int = 1000) -> tuple[list[dict[str, Any]], int, bool]:
+        """Magnet changes after `seq` for incremental sync: (changes, next_seq, has_more).
+
+        An upsert carries the magnet's current values; a delete is a tombstone
+        with only the info_hash. Several changes to one magnet within the page
+        collapse into the latest, so a page may hold fewer than `limit` entries.
+        """
+        rows = self._conn.execute(
+            f"SELECT c.seq, c.op, {self._hex('c.info_hash')} AS info_hash, m.id AS current_id,"
+            f" {self._hex('m.info_hash')} AS current_hash, m.title,"
+            " m.collected_date, m.collected_at, m.source"
+            " FROM magnet_changes c"
+            " LEFT JOIN magnets m ON c.op = 'upsert' AND m.id = c.magnet_id"
+            " WHERE c.seq > ? ORDER BY c.seq LIMIT ?",
+            (seq, limit + 1),
+        ).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        latest: dict[str, dict[str, Any]] = {}
+        for r in rows:
+            if r["op"] == "upsert":
+                if r["current_id"] is None:
+                    continue  # deleted since; its tombstone is later in the log
+                change = {
+                    "seq": r["seq"],
+                    "op": "upsert",
+                    "info_hash": r["current_hash"],
+                    "title": r["title"],
+                    "collected_date": r["collected_date"],
+                    "collected_at": r["collected_at"],
+                    "source": r["source"],
+                }
+            else:
+                change = {"seq": r["seq"], "op": "delete", "info_hash": r["info_hash"]}
+            latest.pop(change["info_hash"], None)
+            latest[change["info_hash"]] = change
+        next_seq = rows[-1]["seq"] if rows else seq
+        return list(latest.values()), next_seq, has_more
+
+    @_observed
+    def latest_change_seq(self) -> int:
+        row = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM magnet_changes").fetchone()
+        return int(row[0])
+
+    @_observed
     def daily_counts(self, days: int = 30) -> list[dict[str, Any]]:
         """Return per-day magnet counts for the last `days` days, zero-filled."""
         rows = self._conn.execute(
@@ -280,3 +1556,134 @@ class MagnetStore:
             d = (today - timedelta(days=i)).strftime("%Y-%m-%d")
             result.append({"date": d, "count": counts.get(d, 0)})
         return result
+
+    @_observed
+    def record_fetch_failure(self, url: str, reason: str) -> dict[str, Any]:
+        """Record a failed detail page and schedule its next retry (exponential backoff).
+
+        Returns the updated negative-cache entry.
+        """
+        now = datetime.now(timezone.utc)
+        row = self._conn.execute(
+            "SELECT attempts FROM fetch_failures WHERE url = ?", (url,)
+        ).fetchone()
+        attempts = (row[0] if row else 0) + 1
+        backoff_s = min(FAILURE_BACKOFF_BASE_S * 2 ** (attempts - 1), FAILURE_BACKOFF_MAX_S)
+        entry = {
+            "url": url,
+            "reason": reason,
+            "attempts": attempts,
+            "last_attempt_at": _utc_stamp(now),
+            "next_retry_at": _utc_stamp(now + timedelta(seconds=backoff_s)),
+        }
+        self._conn.execute(
+            "INSERT OR REPLACE INTO fetch_failures"
+            " (url, reason, attempts, last_attempt_at, next_retry_at)"
+            " VALUES (:url, :reason, :attempts, :last_attempt_at, :next_retry_at)",
+            entry,
+        )
+        return entry
+
+    @_observed
+    def in_failure_backoff(self, url: str) -> bool:
+        """True if url failed before and its next retry time has not arrived yet."""
+        row = self._conn.execute(
+            "SELECT 1 FROM fetch_failures WHERE url = ? AND next_retry_at > ?",
+            (url, _utc_stamp(datetime.now(timezone.utc))),
+        ).fetchone()
+        return row is not None
+
+    @_observed
+    def clear_fetch_failure(self, url: str) -> None:
+        """Forget a previously failed url once it has been processed successfully."""
+        self._conn.execute("DELETE FROM fetch_failures WHERE url = ?", (url,))
+
+    @_observed
+    def fetch_failures(self, limit: int = 100) -> list[dict[str, Any]]:
+        """Return negative-cache entries, chronic failures first."""
+        rows = self._conn.execute(
+            "SELECT url, reason, attempts, last_attempt_at, next_retry_at FROM fetch_failures"
+            " ORDER BY attempts DESC, last_attempt_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    @_observed
+    def enqueue_books(self, books: list[dict[str, str]]) -> int:
+        """Add RSS items to the persisted scrape queue; returns the number queued.
+
+        Items already in the queue keep their state — a saved item is never
+        processed twice — except failed ones, which go back to pending (their
+        negative-cache backoff still decides when they are fetched again).
+        Finished rows older than QUEUE_RETENTION_DAYS are pruned.
+        """
+        now = datetime.now(timezone.utc)
+        stamp = _utc_stamp(now)
+        queued = 0
+        self._conn.execute("BEGIN")
+        try:
+            for book in books:
+                cur = self._conn.execute(
+                    "INSERT INTO scrape_queue (link, title, state, enqueued_at, updated_at)"
+                    " VALUES (?, ?, 'pending', ?, ?)"
+                    " ON CONFLICT(link) DO UPDATE SET state = 'pending', updated_at = excluded.updated_at"
+                    " WHERE state = 'failed'",
+                    (book["link"], book["title"], stamp, stamp),
+                )
+                queued += cur.rowcount
+            self._conn.execute(
+                "DELETE FROM scrape_queue WHERE state IN ('saved', 'failed') AND updated_at < ?",
+                (_utc_stamp(now - timedelta(days=QUEUE_RETENTION_DAYS)),),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return queued
+
+    @_observed
+    def queued_items(self) -> list[dict[str, Any]]:
+        """Unfinished queue items (pending or fetched), oldest first. A fetched
+        item carries the metadata read with its hash (a BookMetadata or None)."""
+        rows = self._conn.execute(
+            "SELECT link, title, state, info_hash, metadata FROM scrape_queue"
+            " WHERE state IN ('pending', 'fetched') ORDER BY id"
+        ).fetchall()
+        items = [dict(r) for r in rows]
+        for item in items:
+            if item["metadata"] is not None:
+                item["metadata"] = BookMetadata(**json.loads(item["metadata"]))
+        return items
+
+    @_observed
+    def mark_queue_item(
+        self,
+        link: str,
+        state: str,
+        info_hash: str | None = None,
+        metadata: BookMetadata | None = None,
+    ) -> None:
+        """Advance a queue item's state; info_hash is kept once known. `metadata`
+        is kept until the next state change, so a 'fetched' item resumed by a
+        later run is saved with it."""
+        self._conn.execute(
+            "UPDATE scrape_queue SET state = ?, info_hash = COALESCE(?, info_hash),"
+            " metadata = ?, updated_at = ? WHERE link = ?",
+            (
+                state,
+                info_hash,
+                json.dumps(metadata.as_row()) if metadata else None,
+                _utc_stamp(datetime.now(timezone.utc)),
+                link,
+            ),
+        )
+
+    @_observed
+    def queue_counts(self) -> dict[str, int]:
+        """Number of scrape_queue rows per state."""
+        counts = {"pending": 0, "fetched": 0, "saved": 0, "failed": 0}
+        for state, count in self._conn.execute(
+            "SELECT state, COUNT(*) FROM scrape_queue GROUP BY state"
+        ).fetchall():
+            counts[state] = count
+        return counts
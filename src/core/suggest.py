@@ -0,0 +1,104 @@
+"""
+In-memory prefix index for typeahead suggestions, used by MagnetStore.suggest().
+
+Keys are folded strings (src/core/titles.py) kept in one sorted list, so the
+completions of a prefix are a contiguous slice found by binary search. Each
+key carries the text to display and a weight — releases of a title, magnets
+of an author — and the heaviest completions are returned first.
+
+A slice of at most SCAN_LIMIT keys is ranked on the spot. Prefixes matching
+more keys than that (one or two letters, "the ") get a precomputed list of
+their TOP_K heaviest keys when the index is built, kept current by add(), so
+every lookup stays well under a millisecond and the ranking is exact. (A
+slice that only grows past SCAN_LIMIT through add() is ranked on its first
+SCAN_LIMIT keys until the index is next rebuilt.)
+
+add() inserts into sorted lists (O(n) per new key): it suits catching up a
+few thousand new keys; rebuild the index for anything larger.
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left
+from collections.abc import Iterable
+
+SCAN_LIMIT = 2000
+TOP_K = 25
+
+# Sorts after every character a key can contain: prefix + _END bounds a slice.
+_END = "\U0010ffff"
+
+
+class PrefixIndex:
+    def __init__(self, items: Iterable[tuple[str, str, int]] = ()) -> None:
+        """Index (key, display, weight) items; duplicate keys are merged."""
+        merged: dict[str, tuple[str, int]] = {}
+        for key, display, weight in items:
+            merged[key] = (display, merged.get(key, ("", 0))[1] + weight)
+        # Parallel lists sorted by key; the latest display text of a key wins.
+        self._keys = sorted(merged)
+        self._display = [merged[k][0] for k in self._keys]
+        self._weights = [merged[k][1] for k in self._keys]
+        # Prefix -> {key: weight} of its TOP_K heaviest keys, for prefixes
+        # matching more than SCAN_LIMIT keys.
+        self._top: dict[str, dict[str, int]] = {}
+        self._build_top()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _build_top(self) -> None:
+        # Walk the prefix tree from single characters down, only into slices
+        # still too large to rank on the spot; each level costs O(n) at most.
+        keys, weights = self._keys, self._weights
+        pending = [("", 0, len(keys))]
+        while pending:
+            prefix, start, stop = pending.pop()
+            if prefix:
+                best = heapq.nlargest(TOP_K, range(start, stop), key=weights.__getitem__)
+                self._top[prefix] = {keys[i]: weights[i] for i in best}
+            depth = len(prefix)
+            pos = start
+            while pos < stop:
+                if len(keys[pos]) == depth:  # the prefix itself is a key
+                    pos += 1
+                    continue
+                child = prefix + keys[pos][depth]
+                end = bisect_left(keys, child + _END, pos, stop)
+                if end - pos > SCAN_LIMIT:
+                    pending.append((child, pos, end))
+                pos = end
+
+    def add(self, key: str, display: str, weight: int = 1) -> None:
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            self._display[i] = display
+            self._weights[i] += weight
+        else:
+            self._keys.insert(i, key)
+            self._display.insert(i, display)
+            self._weights.insert(i, weight)
+        total = self._weights[i]
+        for depth in range(1, len(key) + 1):
+            top = self._top.get(key[:depth])
+            if top is None:  # longer prefixes match fewer keys: none has a list either
+                break
+            top[key] = total
+            if len(top) > TOP_K:
+                del top[max(top, key=lambda k: (-top[k], k))]
+
+    def complete(self, prefix: str, limit: int) -> list[tuple[str, int]]:
+        """Up to `limit` (display, weight) completions of `prefix`, heaviest first
+        (ties in key order)."""
+        if not prefix:
+            return []
+        top = self._top.get(prefix)
+        if top is not None:
+            ranked = sorted(top, key=lambda k: (-top[k], k))[:limit]
+            return [(self._display[bisect_left(self._keys, k)], top[k]) for k in ranked]
+        start = bisect_left(self._keys, prefix)
+        end = min(len(self._keys), start + SCAN_LIMIT)
+        stop = bisect_left(self._keys, prefix + _END, start, end)
+        best = heapq.nlargest(limit, range(start, stop), key=self._weights.__getitem__)
+        return [(self._display[i], self._weights[i]) for i in best]
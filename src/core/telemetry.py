@@ -0,0 +1,405 @@
+"""
+In-process counters, gauges and histograms in Prometheus text format (0.0.4).
+
+Each process (daemon, each gunicorn worker) owns one REGISTRY. Instruments
+are plain in-memory updates, so the scrape endpoint never touches SQLite.
+The daemon writes its registry to a textfile on the heartbeat cadence
+(write_textfile), and every gunicorn worker writes its own every
+TEXTFILE_INTERVAL_S (WorkerTextfile). A scrape of /metrics/prometheus lands
+on one worker, which serves its live registry merged with the other
+workers' files and the daemon's (merge_expositions). ``process`` and
+``worker`` constant labels keep the series apart where metric names overlap.
+
+Gauges describing live objects (circuit breaker, proxy pool) are refreshed
+by collectors registered with add_collector, which run right before render.
+"""
+
+from __future__ import annotations
+
+import glob
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterable
+
+from src.core.stage_timer import percentile
+
+logger = logging.getLogger("telemetry")
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Daemon textfile, relative to the data dir (next to bind.db).
+DAEMON_TEXTFILE = "daemon.prom"
+# RSS server worker textfiles, <data dir>/metrics/server-<pid>.prom.
+SERVER_TEXTFILE_DIR = "metrics"
+TEXTFILE_INTERVAL_S = 15.0
+# A worker file not rewritten for this long belongs to a worker that is gone.
+TEXTFILE_STALE_S = 4 * TEXTFILE_INTERVAL_S
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Iterable[tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, lock: threading.Lock) -> None:
+        self.name = name
+        self.help = help_text
+        self._lock = lock
+
+    @staticmethod
+    def _key(labels: dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    @abstractmethod
+    def samples(self, const: LabelKey) -> list[str]: ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, lock: threading.Lock) -> None:
+        super().__init__(name, help_text, lock)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self, const: LabelKey) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(key, const)} {_format_value(v)}"
+            for key, v in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, lock: threading.Lock) -> None:
+        super().__init__(name, help_text, lock)
+        self._values: dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self, const: LabelKey) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(key, const)} {_format_value(v)}"
+            for key, v in sorted(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        lock: threading.Lock,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, lock)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts..., sum, count]
+        self._values: dict[LabelKey, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            row[-2] += value
+            row[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        row = self._values.get(self._key(labels))
+        return int(row[-1]) if row else 0
+
+    def samples(self, const: LabelKey) -> list[str]:
+        lines: list[str] = []
+        for key, row in sorted(self._values.items()):
+            cumulative = 0.0
+            for bound, n in zip(self.buckets, row, strict=False):
+                cumulative += n
+                le = (("le", _format_value(bound)),)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(key, tuple(const) + le)} "
+                    f"{_format_value(cumulative)}"
+                )
+            inf = (("le", "+Inf"),)
+            lines.append(
+                f"{self.name}_bucket{_format_labels(key, tuple(const) + inf)} "
+                f"{_format_value(row[-1])}"
+            )
+            lines.append(f"{self.name}_sum{_format_labels(key, const)} {_format_value(row[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(key, const)} {_format_value(row[-1])}")
+        return lines
+
+
+class Registry:
+    """A named set of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self.const_labels: dict[str, str] = {}
+
+    def _get_or_create(
+        self, cls: type[_Metric], name: str, help_text: str, **kw: object
+    ) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, threading.Lock(), **kw)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._get_or_create(Counter, name, help_text)  # type: ignore[return-value]
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, help_text: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(  # type: ignore[return-value]
+            Histogram, name, help_text, buckets=buckets
+        )
+
+    def add_collector(self, fn: Callable[[], None]) -> None:
+        """Register a callback that refreshes gauges just before rendering."""
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        for fn in list(self._collectors):
+            try:
+                fn()
+            except Exception as e:  # a broken collector must not break the scrape
+                logger.debug(f"Metrics collector failed: {e}")
+        const = tuple(sorted(self.const_labels.items()))
+        lines: list[str] = []
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        for m in metrics:
+            with m._lock:
+                samples = m.samples(const)
+            if not samples:
+                continue
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class RollingLatency:
+    """
+    The last `window` request samples per key (route), for percentile
+    summaries that follow recent behaviour rather than process lifetime.
+    Each sample is (total seconds, SQL seconds, MagnetStore call count).
+    """
+
+    def __init__(self, window: int = 500) -> None:
+        self.window = window
+        self._samples: dict[str, deque[tuple[float, float, int]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self, key: str, seconds: float, sql_seconds: float = 0.0, sql_count: int = 0
+    ) -> None:
+        with self._lock:
+            dq = self._samples.get(key)
+            if dq is None:
+                dq = self._samples[key] = deque(maxlen=self.window)
+            dq.append((seconds, sql_seconds, sql_count))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Per key: count, p50/p95/p99/max latency, mean SQL time (ms) and store calls."""
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._samples.items()}
+        out: dict[str, dict[str, float]] = {}
+        for key, samples in sorted(snapshot.items()):
+            totals = sorted(s[0] for s in samples)
+            n = len(samples)
+            out[key] = {
+                "count": n,
+                "p50_ms": round(percentile(totals, 50) * 1000, 2),
+                "p95_ms": round(percentile(totals, 95) * 1000, 2),
+                "p99_ms": round(percentile(totals, 99) * 1000, 2),
+                "max_ms": round(totals[-1] * 1000, 2),
+                "sql_ms_avg": round(sum(s[1] for s in samples) / n * 1000, 2),
+                "store_calls_avg": round(sum(s[2] for s in samples) / n, 2),
+            }
+        return out
+
+
+def merge_expositions(*texts: str) -> str:
+    """Combine expositions so each metric family appears once (HELP/TYPE first)."""
+    families: dict[str, list[str]] = {}
+    headers: dict[str, list[str]] = {}
+    for text in texts:
+        current = ""
+        for line in text.splitlines():
+            if not line:
+                continue
+            if line.startswith("# "):
+                parts = line.split(" ", 3)
+                if len(parts) >= 3 and parts[1] in ("HELP", "TYPE"):
+                    current = parts[2]
+                    families.setdefault(current, [])
+                    hdr = headers.setdefault(current, [])
+                    if not any(h.split(" ", 2)[1] == parts[1] for h in hdr):
+                        hdr.append(line)
+                continue
+            families.setdefault(current, []).append(line)
+    out: list[str] = []
+    for name, samples in families.items():
+        out.extend(headers.get(name, []))
+        out.extend(samples)
+    return "\n".join(out) + "\n" if out else ""
+
+
+def write_textfile(registry: Registry, path: str) -> None:
+    """Atomically write the registry's exposition to `path`."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(registry.render())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class WorkerTextfile:
+    """
+    Publishes this gunicorn worker's registry for its sibling workers.
+
+    Started lazily on the first request in each worker (gunicorn imports the
+    app before forking, so neither the pid nor a thread started at import
+    would be right): sets the registry's ``process``/``worker`` labels once
+    and rewrites metrics/server-<pid>.prom every interval_s.
+    """
+
+    def __init__(
+        self, registry: Registry, data_dir: str, interval_s: float = TEXTFILE_INTERVAL_S
+    ) -> None:
+        self.registry = registry
+        self.directory = os.path.join(data_dir, SERVER_TEXTFILE_DIR)
+        self.interval_s = interval_s
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"server-{pid}.prom")
+
+    def ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            self.registry.const_labels.update(process="server", worker=str(pid))
+        threading.Thread(target=self._run, name="bind-metrics-textfile", daemon=True).start()
+
+    def _run(self) -> None:
+        path = self._path(os.getpid())
+        while True:
+            try:
+                write_textfile(self.registry, path)
+            except Exception as e:  # metrics are best-effort, never fatal
+                logger.debug(f"Could not write {path}: {e}")
+            time.sleep(self.interval_s)
+
+    def render_all(self) -> str:
+        """This worker's live registry merged with the other workers' textfiles.
+
+        Files not rewritten within TEXTFILE_STALE_S (exited workers) are
+        skipped and removed.
+        """
+        self.ensure_started()
+        own = self._path(os.getpid())
+        texts = [self.registry.render()]
+        now = time.time()
+        for path in sorted(glob.glob(os.path.join(self.directory, "server-*.prom"))):
+            if path == own:
+                continue
+            try:
+                if now - os.path.getmtime(path) > TEXTFILE_STALE_S:
+                    os.unlink(path)
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    texts.append(f.read())
+            except OSError:  # rewritten or removed underneath us
+                continue
+        return merge_expositions(*texts)
+
+
+# One registry per process; the daemon and server set const_labels["process"].
+REGISTRY = Registry()
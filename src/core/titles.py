@@ -0,0 +1,53 @@
+"""
+Title normalisation for grouping releases of the same audiobook.
+
+Uploads of one book differ in bitrate, format and packaging tags but rarely
+in the words of the title, so two releases belong to the same group when
+their normalised titles are equal:
+
+    "Dune - Frank Herbert [64kbps MP3] (Unabridged)"  -> "dune frank herbert"
+    "Dune - Frank Herbert (M4B, 128 kbps)"             -> "dune frank herbert"
+
+Casefolded, accents and punctuation removed, release tags dropped. Numbers
+that are not part of a tag (series numbers, years) are kept, so "Book 1" and
+"Book 2" stay apart.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+_RE_TAGS = re.compile(
+    r"""
+    \b(?:
+        \d+(?:[.,]\d+)?\s*(?:kbps|kb/s|kbit/s|kbits|k|khz|hz|mb|mib|gb|gib)
+      | mp3|m4b|m4a|aac|flac|ogg|opus|wma|wav|vbr|cbr|mono|stereo
+      | unabridged|abridged|audiobook|audio\s+book|retail|repack
+    )\b
+    """,
+    re.VERBOSE,
+)
+_RE_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_title(title: str) -> str:
+    """Grouping key for `title`; the casefolded title if nothing but tags is left."""
+    if title.isascii():
+        text = title.lower()
+    else:
+        text = unicodedata.normalize("NFKD", title)
+        text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = _RE_TAGS.sub(" ", text)
+    return _RE_NON_WORD.sub(" ", text).strip() or title.casefold().strip()
+
+
+def fold_prefix(text: str) -> str:
+    """A typed prefix folded as normalize_title folds titles (case, accents,
+    punctuation), keeping tags and a trailing space — the user is still typing."""
+    if text.isascii():
+        text = text.lower()
+    else:
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    return _RE_NON_WORD.sub(" ", text).lstrip()
@@ -0,0 +1,175 @@
+"""
+Event-driven sleep for the daemon main loop.
+
+ControlWatcher.wait() blocks until something the daemon cares about happens
+— a control file (.trigger, .profile, .enable-scraping) appears or is touched
+in the data dir, config.env is rewritten, another thread calls wake() — or
+until the timeout (the next scheduled job or heartbeat) expires. Events for
+other files in the watched directories (the database and its journal,
+metrics textfiles) are read and ignored without ending the wait.
+
+On Linux the watched directories are registered with inotify through ctypes
+(no extra dependency); elsewhere, or when inotify is unavailable (e.g. the
+per-user watch limit is exhausted), wait() degrades to polling every
+POLL_FALLBACK_S, which is the daemon's historical 1-second loop.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterable
+
+logger = logging.getLogger("watcher")
+
+POLL_FALLBACK_S = 1.0
+
+# Data-dir files whose creation or touch wakes the daemon.
+CONTROL_FILES = (".trigger", ".profile", ".enable-scraping")
+
+# <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+# struct inotify_event: wd, mask, cookie, len, then `len` bytes of NUL-padded name.
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class ControlWatcher:
+    """Sleep until a watched file changes, wake() is called, or a timeout.
+
+    `names` limits the wake-ups to files with those names in the watched
+    directories; None wakes on any change.
+    """
+
+    def __init__(self, directories: list[str], names: Iterable[str] | None = None) -> None:
+        self._names = None if names is None else frozenset(names)
+        self._wake_r, self._wake_w = os.pipe()
+        for fd in (self._wake_r, self._wake_w):
+            os.set_blocking(fd, False)
+        self._inotify_fd: int | None = self._init_inotify(sorted(set(directories)))
+
+    @property
+    def event_driven(self) -> bool:
+        """False when running in the polling fallback."""
+        return self._inotify_fd is not None
+
+    def _init_inotify(self, directories: list[str]) -> int | None:
+        libc = _load_libc()
+        if libc is None:
+            logger.info(f"inotify unavailable; polling control files every {POLL_FALLBACK_S}s")
+            return None
+        fd: int = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            logger.warning(f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}; polling")
+            return None
+        for directory in directories:
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                logger.warning(
+                    f"Cannot watch {directory}: {os.strerror(err)}; polling control files"
+                )
+                os.close(fd)
+                return None
+        return fd
+
+    def wake(self) -> None:
+        """Interrupt a pending wait(). Safe from other threads and signal handlers."""
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass  # pipe full: a wake-up is already pending
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to `timeout` seconds; True if woken by an event, False on timeout."""
+        fds = [self._wake_r]
+        if self._inotify_fd is not None:
+            fds.append(self._inotify_fd)
+        else:
+            timeout = min(timeout, POLL_FALLBACK_S)
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            try:
+                ready, _, _ = select.select(fds, [], [], max(0.0, deadline - time.monotonic()))
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    return True
+                raise
+            if not ready:
+                return False
+            woken = False
+            for fd in ready:
+                if fd == self._inotify_fd:
+                    woken |= self._read_events(fd)
+                else:
+                    self._drain(fd)
+                    woken = True
+            if woken:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+
+    def _read_events(self, fd: int) -> bool:
+        """Consume pending inotify events; True if any concerns a watched name."""
+        relevant = False
+        try:
+            while data := os.read(fd, 4096):
+                relevant |= self._relevant(data)
+        except BlockingIOError:
+            pass
+        return relevant
+
+    def _relevant(self, data: bytes) -> bool:
+        if self._names is None:
+            return True
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            start = offset + _EVENT_HEADER.size
+            name = os.fsdecode(data[start : start + length].rstrip(b"\0"))
+            if mask & IN_Q_OVERFLOW or name in self._names:
+                return True  # on overflow events were lost: assume one was ours
+            offset = start + length
+        return False
+
+    @staticmethod
+    def _drain(fd: int) -> None:
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        for fd in (self._wake_r, self._wake_w, self._inotify_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._inotify_fd = None
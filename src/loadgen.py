@@ -0,0 +1,320 @@
+"""
+Synthetic load generator: a local stand-in for the upstream site plus a
+driver that runs the real scrape pipeline (run_job -> BindScraper ->
+EgressManager -> RetryEngine) against it.
+
+    python -m src.loadgen --items 100 --latency-ms 80 --error-rate 0.05 \\
+        --challenge-rate 0.02 --rate-limit-rate 0.02 --runs 3 --json load.json
+    python -m src.loadgen --serve --port 8099     # mock only; point ABB_URL at it
+
+The mock serves /rss (RSS 2.0 with `items` entries) and one detail page per
+entry, injecting latency, HTTP 5xx errors, Cloudflare-style challenge pages
+and 429s with Retry-After at the configured rates. Each run shifts the feed
+to fresh items, so every run does the full per-item work. The report gives
+items/minute, per-item latency percentiles and upstream responses by kind.
+Only loopback addresses are served; nothing leaves the machine.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import click
+
+from src.core.stage_timer import StageRecorder, percentile
+
+logger = logging.getLogger("loadgen")
+
+CHALLENGE_HTML = (
+    "<!DOCTYPE html><html><head><title>Just a moment...</title></head>"
+    "<body><h1>Checking your browser before accessing the site.</h1></body></html>"
+)
+
+
+@dataclass
+class UpstreamProfile:
+    """Behaviour of the mock upstream. Rates are per-request probabilities."""
+
+    items: int = 50
+    latency_ms: float = 50.0
+    latency_jitter_ms: float = 25.0
+    error_rate: float = 0.0
+    challenge_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_s: int = 1
+    parse_failure_rate: float = 0.0
+    seed: int = 0
+
+
+def book_hash(seed: int, index: int) -> str:
+    return hashlib.sha1(f"loadgen:{seed}:{index}".encode()).hexdigest()
+
+
+class MockUpstream:
+    """Threaded HTTP server imitating the upstream RSS feed and detail pages."""
+
+    def __init__(self, profile: UpstreamProfile, port: int = 0) -> None:
+        self.profile = profile
+        self.generation = 0
+        self.responses: Counter[str] = Counter()
+        self._rng = random.Random(profile.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> MockUpstream:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock-upstream", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> MockUpstream:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def next_generation(self) -> None:
+        """Shift the feed to a fresh set of items."""
+        self.generation += 1
+
+    def _roll(self) -> tuple[float, float]:
+        with self._lock:
+            return self._rng.random(), self._rng.gauss(0, 1)
+
+    def _fault(self) -> str | None:
+        p = self.profile
+        roll, _ = self._roll()
+        for kind, rate in (
+            ("error", p.error_rate),
+            ("challenge", p.challenge_rate),
+            ("rate_limited", p.rate_limit_rate),
+        ):
+            if roll < rate:
+                return kind
+            roll -= rate
+        return None
+
+    def rss(self) -> str:
+        first = self.generation * self.profile.items
+        items = "".join(
+            f"<item><title>Synthetic Book {i}</title>"
+            f"<link>{self.base_url}/audio-books/book-{i}/</link></item>"
+            for i in range(first, first + self.profile.items)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>Mock upstream</title>{items}</channel></rss>"
+        )
+
+    def detail(self, index: int) -> str:
+        roll, _ = self._roll()
+        if roll < self.profile.parse_failure_rate:
+            return "<html><body><p>Layout changed, no hash here.</p></body></html>"
+        return (
+            "<html><body><div class='postContent'><table>"
+            f"<tr><td>Info Hash:</td><td>{book_hash(self.profile.seed, index)}</td></tr>"
+            "</table></div></body></html>"
+        )
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _send(
+                self, status: int, body: str, ctype: str, headers: dict[str, str] | None = None
+            ) -> None:
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                p = upstream.profile
+                _, gauss = upstream._roll()
+                delay_ms = max(0.0, p.latency_ms + gauss * p.latency_jitter_ms)
+                time.sleep(delay_ms / 1000)
+
+                fault = upstream._fault()
+                with upstream._lock:
+                    upstream.responses[fault or "ok"] += 1
+                if fault == "error":
+                    self._send(503, "Service Unavailable", "text/plain")
+                elif fault == "challenge":
+                    self._send(403, CHALLENGE_HTML, "text/html")
+                elif fault == "rate_limited":
+                    self._send(
+                        429,
+                        "Too Many Requests",
+                        "text/plain",
+                        {"Retry-After": str(p.retry_after_s)},
+                    )
+                elif self.path.rstrip("/") == "/rss":
+                    self._send(200, upstream.rss(), "application/rss+xml")
+                elif self.path.startswith("/audio-books/book-"):
+                    try:
+                        index = int(self.path.rstrip("/").rsplit("-", 1)[1])
+                    except ValueError:
+                        self._send(404, "Not Found", "text/plain")
+                        return
+                    self._send(200, upstream.detail(index), "text/html")
+                else:
+                    self._send(404, "Not Found", "text/plain")
+
+        return Handler
+
+
+def run_load(
+    profile: UpstreamProfile,
+    runs: int = 1,
+    jitter_s: tuple[float, float] = (0.0, 0.0),
+    data_dir: str | None = None,
+) -> dict[str, Any]:
+    """Run `runs` scrape jobs against a fresh mock upstream; returns the report."""
+    from src.bind import run_job
+    from src.core.egress_manager import EgressManager
+    from src.core.scraper import BindScraper
+    from src.core.storage import MagnetStore
+    from src.core.tracker_manager import TrackerManager
+
+    data_dir = data_dir or tempfile.mkdtemp(prefix="bind-loadgen-")
+    store = MagnetStore(os.path.join(data_dir, "loadgen.db"))
+    tracker_manager = TrackerManager(data_dir)
+    run_reports: list[dict[str, Any]] = []
+    with MockUpstream(profile) as upstream:
+        scraper = BindScraper(egress_manager=EgressManager(proxy_list=[]))
+        scraper.base_url = upstream.base_url
+        scraper.JITTER_S = jitter_s
+        for n in range(runs):
+            upstream.next_generation()
+            stages = StageRecorder()
+            t0 = time.monotonic()
+            saved = run_job(data_dir, scraper, store, tracker_manager, stages=stages)
+            elapsed = time.monotonic() - t0
+            per_item = stages.samples("detail_page")
+            run_reports.append(
+                {
+                    "run": n + 1,
+                    "saved": saved,
+                    "duration_s": round(elapsed, 3),
+                    "items_per_min": round(saved / elapsed * 60, 1) if elapsed else 0.0,
+                    "item_p50_ms": round(percentile(per_item, 50) * 1000, 1),
+                    "item_p95_ms": round(percentile(per_item, 95) * 1000, 1),
+                    "item_p99_ms": round(percentile(per_item, 99) * 1000, 1),
+                    "item_max_ms": round(per_item[-1] * 1000, 1) if per_item else 0.0,
+                    "stages": stages.summary(),
+                }
+            )
+        responses = dict(upstream.responses)
+    store.close()
+    total_saved = sum(r["saved"] for r in run_reports)
+    total_s = sum(r["duration_s"] for r in run_reports)
+    return {
+        "profile": asdict(profile),
+        "jitter_s": list(jitter_s),
+        "runs": run_reports,
+        "upstream_responses": responses,
+        "total_saved": total_saved,
+        "items_per_min": round(total_saved / total_s * 60, 1) if total_s else 0.0,
+    }
+
+
+@click.command()
+@click.option("--items", default=50, show_default=True, help="RSS items per run")
+@click.option("--latency-ms", default=50.0, show_default=True, help="Mean response latency")
+@click.option("--latency-jitter-ms", default=25.0, show_default=True, help="Latency std dev")
+@click.option("--error-rate", default=0.0, show_default=True, help="Share of HTTP 503s")
+@click.option("--challenge-rate", default=0.0, show_default=True, help="Share of CF challenges")
+@click.option("--rate-limit-rate", default=0.0, show_default=True, help="Share of 429s")
+@click.option("--retry-after", default=1, show_default=True, help="Retry-After on 429s (s)")
+@click.option("--parse-failure-rate", default=0.0, show_default=True, help="Pages without hash")
+@click.option("--seed", default=0, show_default=True, help="Fault/latency RNG seed")
+@click.option("--runs", default=1, show_default=True, help="Scrape jobs to run")
+@click.option("--jitter", default="0,0", show_default=True, help="Politeness sleep range, s")
+@click.option("--serve", is_flag=True, help="Only run the mock upstream until interrupted")
+@click.option("--port", default=0, help="Port for --serve (default: random)")
+@click.option("--json", "json_path", default=None, help="Write the JSON report to this path")
+def main(
+    items: int,
+    latency_ms: float,
+    latency_jitter_ms: float,
+    error_rate: float,
+    challenge_rate: float,
+    rate_limit_rate: float,
+    retry_after: int,
+    parse_failure_rate: float,
+    seed: int,
+    runs: int,
+    jitter: str,
+    serve: bool,
+    port: int,
+    json_path: str | None,
+) -> None:
+    """Drive the scrape pipeline against a local mock upstream."""
+    profile = UpstreamProfile(
+        items=items,
+        latency_ms=latency_ms,
+        latency_jitter_ms=latency_jitter_ms,
+        error_rate=error_rate,
+        challenge_rate=challenge_rate,
+        rate_limit_rate=rate_limit_rate,
+        retry_after_s=retry_after,
+        parse_failure_rate=parse_failure_rate,
+        seed=seed,
+    )
+    if serve:
+        with MockUpstream(profile, port=port) as upstream:
+            click.echo(f"Mock upstream at {upstream.base_url} (RSS: {upstream.base_url}/rss)")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                return
+    lo, _, hi = jitter.partition(",")
+    report = run_load(profile, runs=runs, jitter_s=(float(lo), float(hi or lo)))
+    for r in report["runs"]:
+        click.echo(
+            f"run {r['run']}: {r['saved']} saved in {r['duration_s']}s "
+            f"({r['items_per_min']}/min), item p50 {r['item_p50_ms']}ms "
+            f"p95 {r['item_p95_ms']}ms p99 {r['item_p99_ms']}ms"
+        )
+    click.echo(f"upstream responses: {report['upstream_responses']}")
+    click.echo(f"overall: {report['items_per_min']} items/min")
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        click.echo(f"JSON report written to {json_path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
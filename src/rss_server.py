@@ -6,15 +6,19 @@ Lightweight Flask server that reads from SQLite and serves:
 - React SPA at /* (served from static/dist/)
 - JSON API at /api/*
 - Health check at /health
+- Prometheus metrics at /metrics/prometheus
 """
 
+import gzip
 import hmac
+import json
 import logging
 import math
 import os
 import pathlib
 import secrets
 import subprocess
+import threading
 import time
 from collections.abc import Callable
 from datetime import datetime, timedelta, timezone
@@ -22,12 +26,42 @@ from functools import wraps
 from typing import Any, TypeVar, cast
 from xml.sax.saxutils import escape
 
-from flask import Flask, Response, abort, jsonify, redirect, request, send_from_directory, session
+from flask import (
+    Flask,
+    Response,
+    abort,
+    g,
+    jsonify,
+    redirect,
+    request,
+    send_from_directory,
+    session,
+)
 
 from src.config_manager import ConfigManager, LiveConfig
-from src.core.magnet import generate_magnet
+from src.core.change_feed import ChangeFeed, parse_cursor
+from src.core.control import control_request, control_socket_path
+from src.core.export import FORMATS as EXPORT_FORMATS
+from src.core.export import export_chunks, gzip_chunks
+from src.core.magnet import magnet_with_suffix, tracker_suffix
+from src.core.profiler import clamp_duration, is_profiling, start_profile
 from src.core.scraper import BindScraper
-from src.core.storage import MagnetStore
+from src.core.storage import (
+    SEARCH_FILTERS,
+    SUGGEST_KINDS,
+    SUGGEST_LIMIT,
+    SUGGEST_MAX,
+    MagnetStore,
+    start_query_tally,
+)
+from src.core.telemetry import (
+    CONTENT_TYPE,
+    DAEMON_TEXTFILE,
+    REGISTRY,
+    RollingLatency,
+    WorkerTextfile,
+    merge_expositions,
+)
 from src.core.tracker_manager import TrackerManager
 from src.security import (
     change_password,
@@ -161,6 +195,62 @@ MAX_ITEMS = 100
 _data_dir = os.path.dirname(os.path.abspath(BIND_DB_PATH))
 tracker_manager = TrackerManager(_data_dir)
 store = MagnetStore(BIND_DB_PATH)
+# Live dashboard events; the per-worker poll thread starts on first subscriber.
+change_feed = ChangeFeed(BIND_DB_PATH)
+
+
+# =============================================================================
+# Request metrics
+# =============================================================================
+
+_REQUEST_SECONDS = REGISTRY.histogram(
+    "bind_http_request_duration_seconds", "Flask request latency, by route, method and status"
+)
+_REQUEST_STORE_CALLS = REGISTRY.histogram(
+    "bind_http_request_store_calls",
+    "MagnetStore calls per request, by route",
+    buckets=(0, 1, 2, 5, 10, 25, 50),
+)
+# Per-endpoint percentiles over the most recent requests (this worker), in /api/metrics.
+_endpoint_latency = RollingLatency()
+# Publishes this worker's registry so whichever worker serves a Prometheus
+# scrape can include the others' series.
+worker_metrics = WorkerTextfile(REGISTRY, _data_dir)
+
+
+@app.before_request
+def _start_request_timer() -> None:
+    # Registered ahead of the IP allowlist so rejected requests are timed too.
+    worker_metrics.ensure_started()
+    g.request_started = time.perf_counter()
+    g.query_tally = start_query_tally()
+
+
+@app.after_request
+def _observe_request(response: Response) -> Response:
+    started = g.get("request_started")
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    tally = g.query_tally
+    rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+    _REQUEST_SECONDS.observe(
+        elapsed, route=rule, method=request.method, status=str(response.status_code)
+    )
+    _REQUEST_STORE_CALLS.observe(tally.count, route=rule)
+    _endpoint_latency.observe(f"{request.method} {rule}", elapsed, tally.seconds, tally.count)
+    response.headers["Server-Timing"] = (
+        f'db;dur={tally.seconds * 1000:.1f};desc="{tally.count} store_calls", '
+        f"app;dur={elapsed * 1000:.1f}"
+    )
+    # Read live, like the other config.env keys: a change applies to the next request.
+    if elapsed * 1000 >= live_config.get_int("BIND_SLOW_REQUEST_MS"):
+        logger.warning(
+            f"🐢 Slow request: {request.method} {request.path} took {elapsed * 1000:.0f}ms "
+            f"({tally.count} store calls, {tally.seconds * 1000:.0f}ms in SQLite)"
+        )
+    return response
+
 
 ip_allowlist_middleware(app, live_config)
 
@@ -203,7 +293,7 @@ def check_setup_required() -> Any:
     if (
         request.path.startswith("/api/")
         or request.path.startswith("/static/")
-        or request.path in ["/health", "/feed.xml"]
+        or request.path in ["/health", "/feed.xml", "/metrics/prometheus"]
     ):
         return None
     # React SPA handles the client-side setup redirect; this is a server-side safety net
@@ -257,6 +347,7 @@ def _date_to_rfc2822(date_str: str) -> str:
 
 
 def _enrich(rows: list[dict[str, Any]], trackers: list[str]) -> list[dict[str, Any]]:
+    suffix = tracker_suffix(trackers)
     enriched = []
     for r in rows:
         enriched.append(
@@ -264,7 +355,7 @@ def _enrich(rows: list[dict[str, Any]], trackers: list[str]) -> list[dict[str, A
                 **r,
                 "hash": r["info_hash"],
                 "date": r["collected_date"],
-                "magnet": generate_magnet(r["info_hash"], r["title"], trackers),
+                "magnet": magnet_with_suffix(r["info_hash"], r["title"], suffix),
             }
         )
     return enriched
@@ -373,6 +464,22 @@ def health() -> dict[str, Any]:
     }
 
 
+@app.route("/metrics/prometheus")
+def metrics_prometheus() -> Response:
+    # Unauthenticated like /health (scrapers cannot hold a session); still
+    # subject to the IP allowlist. Served from this worker's registry, the other
+    # workers' and the daemon's textfiles only — no SQLite queries, so a 15s
+    # scrape is cheap.
+    try:
+        with open(os.path.join(_data_dir, DAEMON_TEXTFILE), encoding="utf-8") as f:
+            daemon_text = f.read()
+    except OSError:
+        daemon_text = ""
+    return Response(
+        merge_expositions(worker_metrics.render_all(), daemon_text), content_type=CONTENT_TYPE
+    )
+
+
 # =============================================================================
 # JSON API — Auth
 # =============================================================================
@@ -469,21 +576,127 @@ def api_magnets() -> Any:
     except ValueError:
         page = 1
     per_page = 50
+    # ?collapse=1: one row per release group (its newest upload, with `releases`).
+    collapse = request.args.get("collapse", "") in ("1", "true")
+    # Metadata filters (?author=, ?narrator=, ?format=, ?category=, ?min_bitrate=).
+    filters: dict[str, Any] = {
+        name: value for name in SEARCH_FILTERS if (value := request.args.get(name, "").strip())
+    }
+    if "min_bitrate" in filters:
+        try:
+            filters["min_bitrate"] = int(filters["min_bitrate"])
+        except ValueError:
+            return jsonify({"error": "min_bitrate must be an integer (kbps)"}), 400
     current_trackers = tracker_manager.get_trackers()
-    rows, total_count = store.search(query=query or None, page=page, per_page=per_page)
+    rows, total_count = store.search(
+        query=query or None, page=page, per_page=per_page, collapse=collapse, filters=filters
+    )
     magnets = _enrich(rows, current_trackers)
     total_pages = math.ceil(total_count / per_page) if total_count else 1
-    return jsonify(
+    payload = {
+        "magnets": magnets,
+        "query": query,
+        "page": page,
+        "total_pages": total_pages,
+        "total_count": total_count,
+        "collapsed": collapse,
+        "filters": filters,
+    }
+    # ?facets=1: value counts per facet (format, category, source, month) of all matches.
+    if request.args.get("facets", "") in ("1", "true"):
+        payload["facets"] = store.facet_counts(query=query or None, filters=filters)
+    return jsonify(payload)
+
+
+@app.route("/api/suggest")
+@requires_session_auth
+def api_suggest() -> Any:
+    """Typeahead: ?q= prefix -> top title/author completions (?kind=title|author, ?limit=)."""
+    kind = request.args.get("kind", "")
+    if kind and kind not in SUGGEST_KINDS:
+        return jsonify({"error": f"kind must be one of: {', '.join(SUGGEST_KINDS)}"}), 400
+    try:
+        limit = min(SUGGEST_MAX, max(1, int(request.args.get("limit", SUGGEST_LIMIT))))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    suggestions = store.suggest(
+        request.args.get("q", ""), kinds=(kind,) if kind else SUGGEST_KINDS, limit=limit
+    )
+    return jsonify({"suggestions": suggestions})
+
+
+@app.route("/api/magnets/<info_hash>/releases")
+@requires_session_auth
+def api_magnet_releases(info_hash: str) -> Any:
+    """Every release grouped with this magnet by normalised title, newest first."""
+    rows = store.releases_of(info_hash)
+    if rows is None:
+        return jsonify({"error": "Unknown info hash"}), 404
+    return jsonify({"releases": _enrich(rows, tracker_manager.get_trackers())})
+
+
+# Bulk sync pages: default and hard cap on changes per response.
+SYNC_PAGE_DEFAULT = 1000
+SYNC_PAGE_MAX = 10_000
+
+
+def _json_maybe_gzipped(payload: dict[str, Any]) -> Response:
+    """JSON response, gzip-compressed when the client accepts it."""
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    response = Response(body, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    if request.accept_encodings.best_match(["gzip"]):
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+@app.route("/api/magnets/since")
+@requires_session_auth
+def api_magnets_since() -> Any:
+    """Incremental sync: magnet upserts and deletions after change sequence ?seq=N.
+
+    Clients start at seq=0, apply `changes` in order, and call again with
+    `next_seq` until `has_more` is false; later syncs cost only the delta.
+    """
+    try:
+        seq = max(0, int(request.args.get("seq", 0)))
+        limit = min(SYNC_PAGE_MAX, max(1, int(request.args.get("limit", SYNC_PAGE_DEFAULT))))
+    except ValueError:
+        return jsonify({"error": "seq and limit must be integers"}), 400
+    changes, next_seq, has_more = store.changes_since(seq, limit)
+    return _json_maybe_gzipped(
         {
-            "magnets": magnets,
-            "query": query,
-            "page": page,
-            "total_pages": total_pages,
-            "total_count": total_count,
+            "changes": changes,
+            "next_seq": next_seq,
+            "has_more": has_more,
+            "latest_seq": store.latest_change_seq(),
         }
     )
 
 
+@app.route("/api/export")
+@requires_session_auth
+def api_export() -> Any:
+    """Download the whole archive: ?format=ndjson|csv|magnets, ?gzip=1 for a .gz file.
+
+    Streamed batch by batch, so memory use does not grow with the archive.
+    """
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    mimetype, ext = EXPORT_FORMATS[fmt]
+    filename = f"bind-export-{datetime.now(timezone.utc):%Y%m%d}.{ext}"
+    chunks = export_chunks(store, fmt, tracker_manager.get_trackers())
+    if request.args.get("gzip", "").lower() in ("1", "true", "yes"):
+        chunks, mimetype, filename = gzip_chunks(chunks), "application/gzip", filename + ".gz"
+    return Response(
+        chunks,
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @app.route("/api/stats")
 @requires_session_auth
 def api_stats() -> Any:
@@ -527,18 +740,42 @@ def api_metrics() -> Any:
     total_runs = len(runs)
     success_count = sum(1 for r in runs if r[1] == "success")
     success_rate = round(success_count / total_runs * 100) if total_runs else None
-    runs_out = [{"run_at": r[0], "result": r[1], "new_items": r[2], "duration": r[3]} for r in runs]
+    stages = store.run_stages([r[4] for r in runs])
+    runs_out = [
+        {
+            "run_at": r[0],
+            "result": r[1],
+            "new_items": r[2],
+            "duration": r[3],
+            "stages": stages.get(r[4], {}),
+        }
+        for r in runs
+    ]
     return jsonify(
         {
             "stats": db_stats,
             "runs": runs_out,
             "success_rate": success_rate,
             "daily_counts": store.daily_counts(),
+            "queue": store.queue_counts(),
+            "endpoints": _endpoint_latency.summary(),
             "now": datetime.now(timezone.utc).isoformat(timespec="seconds"),
         }
     )
 
 
+@app.route("/api/fetch-failures")
+@requires_session_auth
+def api_fetch_failures() -> Any:
+    """Detail pages in the negative cache (failed hash extraction, backing off)."""
+    try:
+        limit = min(500, max(1, int(request.args.get("limit", 100))))
+    except ValueError:
+        limit = 100
+    failures = store.fetch_failures(limit=limit)
+    return jsonify({"failures": failures, "count": len(failures)})
+
+
 # =============================================================================
 # JSON API — Settings (auth required)
 # =============================================================================
@@ -709,6 +946,57 @@ def api_logs() -> Any:
     )
 
 
+# =============================================================================
+# Live events — Server-Sent Events (auth required)
+# =============================================================================
+
+# Streams end before gunicorn's 30s worker timeout; EventSource reconnects
+# after SSE_RETRY_MS and resumes from its Last-Event-ID.
+SSE_STREAM_S = 25.0
+SSE_KEEPALIVE_S = 10.0
+SSE_RETRY_MS = 2000
+
+# Each open stream holds a gunicorn thread for up to SSE_STREAM_S. Capped per
+# worker so streams never take every thread (--threads 4 in the shipped units):
+# past the cap /api/events answers 503 and the dashboard falls back to polling.
+SSE_MAX_STREAMS = 2
+_sse_slots = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
+
+@app.route("/api/events")
+@requires_session_auth
+def api_events() -> Any:
+    """Server-Sent Events: `magnets`, `scrape_run` and `daemon` state changes.
+
+    Event ids are change-feed cursors valid in every worker; resume with the
+    Last-Event-ID header (sent by EventSource) or ?cursor=.
+    """
+    resume = parse_cursor(request.headers.get("Last-Event-ID") or request.args.get("cursor"))
+    if not _sse_slots.acquire(blocking=False):
+        return (
+            jsonify({"ok": False, "message": "Too many open event streams, retry later."}),
+            503,
+            {"Retry-After": str(math.ceil(SSE_STREAM_S))},
+        )
+
+    def stream() -> Any:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        for event in change_feed.follow(resume, SSE_STREAM_S, SSE_KEEPALIVE_S):
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"id: {event['cursor']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    response = Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Runs when the server closes the response: stream ended or client went away.
+    response.call_on_close(_sse_slots.release)
+    return response
+
+
 # =============================================================================
 # JSON API — Manual scrape trigger (auth required)
 # =============================================================================
@@ -717,6 +1005,22 @@ def api_logs() -> Any:
 @app.route("/api/trigger-scrape", methods=["POST"])
 @requires_session_auth
 def api_trigger_scrape() -> Any:
+    # Fast path: the daemon's control socket starts the job at once and
+    # returns its id for /api/scrape/progress. No socket (daemon down, older
+    # daemon, separate host) -> the .trigger file the daemon watches.
+    reply = control_request(control_socket_path(_data_dir), {"cmd": "trigger"})
+    if reply is not None:
+        if reply.get("ok"):
+            return jsonify(
+                {"ok": True, "job_id": reply["job_id"], "message": "Scrape job started."}
+            )
+        return jsonify(
+            {
+                "ok": False,
+                "job_id": reply.get("job_id"),
+                "message": "A scrape job is already running or queued.",
+            }
+        ), 409
     trigger_file = os.path.join(_data_dir, ".trigger")
     try:
         if os.path.exists(trigger_file):
@@ -741,6 +1045,88 @@ def api_trigger_scrape() -> Any:
         return jsonify({"ok": False, "message": f"Could not write trigger file: {e}"}), 500
 
 
+@app.route("/api/scrape/progress")
+@requires_session_auth
+def api_scrape_progress() -> Any:
+    """Live state of the current/last scrape run and daemon events after ?since=N.
+
+    Answers from the daemon's memory over the control socket — no DB reads.
+    `available` is false when the daemon's control socket is not reachable.
+    """
+    try:
+        since = max(0, int(request.args.get("since", 0)))
+    except ValueError:
+        since = 0
+    path = control_socket_path(_data_dir)
+    progress = control_request(path, {"cmd": "progress"})
+    events = control_request(path, {"cmd": "events", "since": since}) if progress else None
+    if progress is None or events is None:
+        return jsonify({"available": False, "job": None, "events": [], "last": since})
+    return jsonify(
+        {
+            "available": True,
+            "job": progress.get("job"),
+            "events": events.get("events", []),
+            "last": events.get("last", since),
+        }
+    )
+
+
+@app.route("/api/scrape/cancel", methods=["POST"])
+@requires_session_auth
+def api_scrape_cancel() -> Any:
+    reply = control_request(control_socket_path(_data_dir), {"cmd": "cancel"})
+    if reply is None:
+        return jsonify({"ok": False, "message": "Daemon control socket not reachable."}), 503
+    if not reply.get("ok"):
+        return jsonify({"ok": False, "message": "No scrape job is running."}), 409
+    return jsonify(
+        {
+            "ok": True,
+            "job_id": reply["job_id"],
+            "message": "Cancellation requested — the job stops at its next item.",
+        }
+    )
+
+
+@app.route("/api/debug/profile", methods=["POST"])
+@requires_session_auth
+def api_debug_profile() -> Any:
+    """Start a sampling profile of this worker or of the daemon.
+
+    Body: {"target": "server" | "daemon", "seconds": 1..300 (default 30)}.
+    Collapsed stacks are written to the logs dir as profile-<target>-*.folded.
+    A server profile covers only the gunicorn worker that served this request.
+    """
+    data = request.get_json(silent=True) or {}
+    target = data.get("target", "server")
+    seconds = clamp_duration(data.get("seconds"))
+    if target == "daemon":
+        # The control socket starts the profile at once, even mid-run; the
+        # .profile file is only read between runs of the daemon's main loop.
+        reply = control_request(
+            control_socket_path(_data_dir), {"cmd": "profile", "seconds": seconds}
+        )
+        if reply is not None and reply.get("ok"):
+            return jsonify({"ok": True, "message": f"Profiling the daemon for {seconds}s."}), 202
+        if reply is not None and reply.get("error") == "busy":
+            return jsonify({"ok": False, "message": "A profile is already running."}), 409
+        # No socket, or a daemon without the profile command: fall back to the file.
+        try:
+            with open(os.path.join(_data_dir, ".profile"), "w", encoding="utf-8") as f:
+                f.write(str(seconds))
+        except OSError as e:
+            return jsonify({"ok": False, "message": f"Could not write profile request: {e}"}), 500
+        return jsonify(
+            {"ok": True, "message": f"Daemon profile requested ({seconds}s), starts within ~1s."}
+        ), 202
+    if target != "server":
+        return jsonify({"ok": False, "message": "target must be 'server' or 'daemon'."}), 400
+    if is_profiling() or not start_profile(seconds, get_logs_dir(), f"server-{os.getpid()}"):
+        return jsonify({"ok": False, "message": "A profile is already running."}), 409
+    return jsonify({"ok": True, "message": f"Profiling worker {os.getpid()} for {seconds}s."}), 202
+
+
 # =============================================================================
 # SPA catch-all — must be last
 # =============================================================================
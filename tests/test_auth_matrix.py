@@ -30,7 +30,16 @@ PROTECTED_ROUTES: list[tuple[str, str, bool]] = [
     ("POST", "/api/settings/password", True),
     ("GET", "/api/logs", False),
     ("POST", "/api/trigger-scrape", False),
+    ("GET", "/api/scrape/progress", False),
+    ("GET", "/api/events", False),
+    ("POST", "/api/scrape/cancel", False),
     ("GET", "/api/magnets", False),
+    ("GET", "/api/magnets/since", False),
+    ("GET", "/api/magnets/<info_hash>/releases", False),
+    ("GET", "/api/suggest", False),
+    ("GET", "/api/export", False),
+    ("GET", "/api/fetch-failures", False),
+    ("POST", "/api/debug/profile", True),
 ]
 
 # Routes that are intentionally public (no session required).
@@ -49,6 +58,12 @@ PUBLIC_API_ROUTES: set[str] = {
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def _no_real_profiler(monkeypatch):
+    """POST /api/debug/profile would start a real sampler thread in this process."""
+    monkeypatch.setattr("src.rss_server.start_profile", lambda *a, **kw: True)
+
+
 def _set_csrf(client, token: str = "test-csrf-token") -> None:
     """Inject a CSRF token into the session so JSON-CSRF validation passes."""
     with client.session_transaction() as sess:
@@ -0,0 +1,43 @@
+"""Smoke tests for the benchmark harness (src/bench.py)."""
+
+import json
+
+import click
+import pytest
+from click.testing import CliRunner
+from src import bench, rss_server
+
+
+def test_parse_sizes():
+    assert bench.parse_sizes("10k, 1M,500") == [("10k", 10_000), ("1M", 1_000_000), ("500", 500)]
+    with pytest.raises(click.BadParameter):
+        bench.parse_sizes("huge")
+
+
+def test_synthetic_rows_are_deterministic():
+    assert list(bench.synthetic_rows(20, seed=1)) == list(bench.synthetic_rows(20, seed=1))
+    assert list(bench.synthetic_rows(5, seed=1)) != list(bench.synthetic_rows(5, seed=2))
+
+
+def test_build_archive_is_reused(tmp_path):
+    path = bench.build_archive(str(tmp_path), "tiny", 50)
+    mtime = (tmp_path / "bench-tiny-1729.db").stat().st_mtime_ns
+    assert bench.build_archive(str(tmp_path), "tiny", 50) == path
+    assert (tmp_path / "bench-tiny-1729.db").stat().st_mtime_ns == mtime
+    assert bench._row_count(path) == 50
+
+
+def test_cli_writes_json_report(tmp_path):
+    original_store = rss_server.store
+    out = tmp_path / "report.json"
+    result = CliRunner().invoke(
+        bench.main,
+        ["--sizes", "200", "--repeat", "2", "--db-dir", str(tmp_path), "--json", str(out)],
+    )
+    assert result.exit_code == 0, result.output
+    report = json.loads(out.read_text())
+    ops = {(r["size"], r["op"]) for r in report["results"]}
+    assert ("200", "feed_xml") in ops
+    assert (None, "extract_info_hash") in ops
+    assert all(r["p50_ms"] >= 0 for r in report["results"])
+    assert rss_server.store is original_store
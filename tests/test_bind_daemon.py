@@ -2,12 +2,14 @@ import concurrent.futures
 import logging
 import os
 import signal
+from contextlib import contextmanager
 from unittest.mock import MagicMock, patch
 
 import pytest
 from click.testing import CliRunner
 from src.bind import check_disk_space, cli, run_job
 from src.config_manager import LiveConfig
+from src.core.scraper import DetailResult
 
 
 def _make_scraper(books=None, info_hash="aabbccdd" * 5):
@@ -15,7 +17,9 @@ def _make_scraper(books=None, info_hash="aabbccdd" * 5):
     scraper.get_recent_books.return_value = (
         books if books is not None else [{"title": "Test Book", "link": "/audio-books/test/"}]
     )
-    scraper.extract_info_hash.return_value = info_hash
+    scraper.extract_details.return_value = DetailResult(
+        info_hash, None if info_hash else "parse_failed"
+    )
     return scraper
 
 
@@ -90,7 +94,7 @@ class TestRunJob:
         hashes = ["aa" * 20, "bb" * 20]
         scraper = MagicMock()
         scraper.get_recent_books.return_value = books
-        scraper.extract_info_hash.side_effect = hashes
+        scraper.extract_details.side_effect = [DetailResult(h) for h in hashes]
         run_job(str(fresh_store.db_path), scraper, fresh_store, _make_tracker_manager())
         assert fresh_store.stats()["total"] == 2
         assert fresh_store.has_hash(hashes[0])
@@ -99,6 +103,15 @@ class TestRunJob:
     def test_store_exception_does_not_crash_job(self, fresh_store):
         scraper = _make_scraper()
         broken_store = MagicMock()
+        broken_store.queued_items.return_value = [
+            {
+                "link": "/audio-books/test/",
+                "title": "Test Book",
+                "state": "pending",
+                "info_hash": None,
+            }
+        ]
+        broken_store.in_failure_backoff.return_value = False
         broken_store.has_hash.return_value = False
         broken_store.add_magnet.side_effect = Exception("db error")
         broken_store.db_path = fresh_store.db_path
@@ -141,6 +154,17 @@ class TestDaemonCommand:
 # ---------------------------------------------------------------------------
 
 
+@contextmanager
+def _stop_main_loop():
+    """Exit the daemon main loop after its first tick, before it blocks in ControlWatcher."""
+    with (
+        patch("src.bind.ControlWatcher"),
+        patch("src.bind.ControlServer"),
+        patch("src.bind.next_wait_s", side_effect=SystemExit(0)),
+    ):
+        yield
+
+
 def _make_daemon_mocks(probe_return="ok"):
     """Return (mock_executor, mock_future, mock_scraper, mock_store) for daemon tests."""
     mock_future = MagicMock()
@@ -169,7 +193,7 @@ class TestRunJobEdgeCases:
     def test_add_magnet_returns_false_counts_as_dupe(self, fresh_store):
         scraper = MagicMock()
         scraper.get_recent_books.return_value = [{"title": "Test Book", "link": "/test/"}]
-        scraper.extract_info_hash.return_value = "aabbccdd" * 5
+        scraper.extract_details.return_value = DetailResult("aabbccdd" * 5)
 
         with patch.object(fresh_store, "add_magnet", return_value=False):
             run_job(str(fresh_store.db_path), scraper, fresh_store, _make_tracker_manager())
@@ -179,7 +203,7 @@ class TestRunJobEdgeCases:
     def test_saved_counter_is_updated_on_save(self, fresh_store):
         scraper = MagicMock()
         scraper.get_recent_books.return_value = [{"title": "Book A", "link": "/a/"}]
-        scraper.extract_info_hash.return_value = "aa" * 20
+        scraper.extract_details.return_value = DetailResult("aa" * 20)
         counter = [0]
         run_job(
             str(fresh_store.db_path),
@@ -209,7 +233,7 @@ class TestDaemonConfigLoading:
             patch("src.bind.TrackerManager"),
             patch("concurrent.futures.ThreadPoolExecutor", return_value=mock_executor),
             patch("src.bind.schedule"),
-            patch("time.sleep", side_effect=SystemExit(0)),
+            _stop_main_loop(),
         ):
             with caplog.at_level(logging.INFO, logger="BIND"):
                 CliRunner().invoke(cli, ["daemon", "--db-path", str(tmp_path / "bind.db")])
@@ -244,7 +268,7 @@ class TestDaemonSignalRegistration:
             patch("concurrent.futures.ThreadPoolExecutor", return_value=mock_executor),
             patch("src.bind.schedule"),
             patch("signal.signal", side_effect=capture_signal),
-            patch("time.sleep", side_effect=SystemExit(0)),
+            _stop_main_loop(),
         ):
             CliRunner().invoke(cli, ["daemon", "--db-path", str(tmp_path / "bind.db")])
 
@@ -262,7 +286,7 @@ class TestDaemonProbeWarning:
             patch("src.bind.TrackerManager"),
             patch("concurrent.futures.ThreadPoolExecutor", return_value=mock_executor),
             patch("src.bind.schedule"),
-            patch("time.sleep", side_effect=SystemExit(0)),
+            _stop_main_loop(),
         ):
             with caplog.at_level(logging.WARNING, logger="BIND"):
                 CliRunner().invoke(cli, ["daemon", "--db-path", str(tmp_path / "bind.db")])
@@ -278,7 +302,7 @@ class TestDaemonProbeWarning:
 
 class TestRunJobWithTimeout:
     def _invoke_capturing_rjwt(self, tmp_path, mock_executor, mock_scraper, mock_store):
-        """Run daemon until time.sleep breaks the loop; return captured run_job_with_timeout."""
+        """Run daemon until the main loop is stopped; return captured run_job_with_timeout."""
         captured = {}
         mock_sched = MagicMock()
         mock_sched.every.return_value.minutes.do.side_effect = (
@@ -291,7 +315,7 @@ class TestRunJobWithTimeout:
             patch("src.bind.TrackerManager"),
             patch("concurrent.futures.ThreadPoolExecutor", return_value=mock_executor),
             patch("src.bind.schedule", mock_sched),
-            patch("time.sleep", side_effect=SystemExit(0)),
+            _stop_main_loop(),
         ):
             CliRunner().invoke(cli, ["daemon", "--db-path", str(tmp_path / "bind.db")])
 
@@ -347,6 +371,47 @@ class TestRunJobWithTimeout:
         assert any("exceeded" in r.message for r in caplog.records)
         mock_store.record_scrape_run.assert_called_with("timeout", 3, pytest.approx(0, abs=5))
 
+    def test_timeout_cancels_the_running_job(self, tmp_path):
+        future_timeout = MagicMock()
+        future_timeout.done.return_value = True
+        future_timeout.result.side_effect = concurrent.futures.TimeoutError()
+
+        mock_executor = MagicMock()
+        mock_executor.submit.return_value = future_timeout
+
+        mock_scraper = MagicMock()
+        mock_scraper.probe_target.return_value = "ok"
+        mock_store = MagicMock()
+        mock_store.record_scrape_run.return_value = None
+
+        self._invoke_capturing_rjwt(tmp_path, mock_executor, mock_scraper, mock_store)
+
+        assert mock_executor.submit.call_args.kwargs["cancel"].cancelled is True
+
+    def test_records_cancelled_run(self, tmp_path):
+        future_cancelled = MagicMock()
+        future_cancelled.done.return_value = True
+
+        def _cancelled(*args, **kwargs):
+            # Cancelled from the control socket after one save: run_job returns early.
+            mock_executor.submit.call_args.kwargs["cancel"].cancel()
+            mock_executor.submit.call_args[0][5][0] = 1
+            return 1
+
+        future_cancelled.result.side_effect = _cancelled
+
+        mock_executor = MagicMock()
+        mock_executor.submit.return_value = future_cancelled
+
+        mock_scraper = MagicMock()
+        mock_scraper.probe_target.return_value = "ok"
+        mock_store = MagicMock()
+        mock_store.record_scrape_run.return_value = None
+
+        self._invoke_capturing_rjwt(tmp_path, mock_executor, mock_scraper, mock_store)
+
+        mock_store.record_scrape_run.assert_called_with("cancelled", 1, pytest.approx(0, abs=5))
+
     def test_records_scrape_run_on_unexpected_exception(self, tmp_path, caplog):
         future_exc = MagicMock()
         future_exc.done.return_value = True
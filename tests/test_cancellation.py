@@ -0,0 +1,123 @@
+"""Tests for cooperative cancellation of scrape jobs (src/core/cancellation.py)."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from src.bind import run_job
+from src.core.cancellation import CancelToken, JobCancelled
+from src.core.retry import RetryConfig, RetryEngine
+from src.core.scraper import BindScraper, DetailResult
+
+
+def _http_error(status):
+    exc = Exception(f"HTTP {status}")
+    exc.response = MagicMock(status_code=status)
+    return exc
+
+
+class TestCancelToken:
+    def test_starts_uncancelled(self):
+        token = CancelToken()
+        assert token.cancelled is False
+        token.raise_if_cancelled()
+
+    def test_raise_if_cancelled(self):
+        token = CancelToken()
+        token.cancel()
+        with pytest.raises(JobCancelled):
+            token.raise_if_cancelled()
+
+    def test_sleep_returns_when_not_cancelled(self):
+        CancelToken().sleep(0)
+
+    def test_sleep_is_interrupted_by_cancel(self):
+        token = CancelToken()
+        threading.Timer(0.05, token.cancel).start()
+        t0 = time.monotonic()
+        with pytest.raises(JobCancelled):
+            token.sleep(30)
+        assert time.monotonic() - t0 < 5
+
+
+class TestRetryEngineCancellation:
+    def test_backoff_sleep_uses_token(self):
+        token = MagicMock()
+        token.sleep.side_effect = JobCancelled()
+        fn = MagicMock(side_effect=_http_error(503))
+        with pytest.raises(JobCancelled):
+            RetryEngine().execute(fn, RetryConfig(max_attempts=3), "test", cancel=token)
+        assert fn.call_count == 1
+
+    def test_no_attempt_after_cancel(self):
+        token = CancelToken()
+        token.cancel()
+        fn = MagicMock(return_value="ok")
+        with pytest.raises(JobCancelled):
+            RetryEngine().execute(fn, RetryConfig(), "test", cancel=token)
+        fn.assert_not_called()
+
+    def test_without_token_uses_time_sleep(self):
+        fn = MagicMock(side_effect=[_http_error(503), "ok"])
+        with patch("time.sleep") as mock_sleep:
+            assert RetryEngine().execute(fn, RetryConfig(base_delay=0), "test") == "ok"
+        mock_sleep.assert_called_once()
+
+
+class TestScraperCancellation:
+    def test_politeness_sleep_is_cancellable(self):
+        egress = MagicMock()
+        scraper = BindScraper(egress_manager=egress)
+        token = CancelToken()
+        token.cancel()
+        with pytest.raises(JobCancelled):
+            scraper._get_page("http://example.com/page", cancel=token)
+        egress.fetch.assert_not_called()
+
+    def test_token_is_passed_to_egress(self):
+        egress = MagicMock()
+        egress.fetch.return_value = "<html>ok</html>"
+        scraper = BindScraper(egress_manager=egress)
+        token = CancelToken()
+        with patch("src.core.scraper.random.uniform", return_value=0):
+            scraper._get_page("http://example.com/page", cancel=token)
+        egress.fetch.assert_called_once_with("http://example.com/page", cancel=token)
+
+
+class TestRunJobCancellation:
+    def _tracker_manager(self):
+        tm = MagicMock()
+        tm.get_trackers.return_value = []
+        return tm
+
+    def test_stops_between_items_and_keeps_rest_queued(self, fresh_store):
+        token = CancelToken()
+        books = [{"title": f"Book {i}", "link": f"/b/{i}/"} for i in range(3)]
+
+        def _extract(link, cancel=None):
+            token.cancel()  # cancelled while the first item is in flight
+            return DetailResult("ab" * 20)
+
+        scraper = MagicMock()
+        scraper.get_recent_books.return_value = books
+        scraper.extract_details.side_effect = _extract
+
+        saved = run_job("/tmp", scraper, fresh_store, self._tracker_manager(), cancel=token)
+
+        assert saved == 1
+        assert scraper.extract_details.call_count == 1
+        assert len(fresh_store.queued_items()) == 2
+
+    def test_cancel_during_fetch_leaves_item_pending(self, fresh_store):
+        scraper = MagicMock()
+        scraper.get_recent_books.return_value = [{"title": "Book", "link": "/b/"}]
+        scraper.extract_details.side_effect = JobCancelled()
+
+        assert run_job("/tmp", scraper, fresh_store, self._tracker_manager()) == 0
+        assert fresh_store.queued_items()[0]["state"] == "pending"
+
+    def test_cancel_during_rss_fetch_returns_zero(self, fresh_store):
+        scraper = MagicMock()
+        scraper.get_recent_books.side_effect = JobCancelled()
+        assert run_job("/tmp", scraper, fresh_store, self._tracker_manager()) == 0
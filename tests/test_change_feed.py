@@ -0,0 +1,134 @@
+"""Tests for the live dashboard change feed (src/core/change_feed.py) and /api/events."""
+
+import threading
+
+import pytest
+from src.core.change_feed import ChangeFeed, parse_cursor
+from src.core.event_ring import EventRing
+from src.core.storage import MagnetStore
+
+HASH_A = "aa" * 20
+HASH_B = "bb" * 20
+
+
+@pytest.fixture
+def feed_and_writer(tmp_path):
+    db = str(tmp_path / "bind.db")
+    writer = MagnetStore(db)  # stands in for the daemon's connection
+    feed = ChangeFeed(db, poll_s=3600)  # tests drive poll() directly
+    feed.ensure_started()
+    yield feed, writer
+    writer.close()
+
+
+def _types(events):
+    return [e["type"] for e in events]
+
+
+class TestEventRing:
+    def test_since_and_stale_cursor(self):
+        ring = EventRing(maxlen=2)
+        for kind in ("a", "b", "c"):
+            ring.emit(kind)
+        events, last = ring.since(0)
+        assert _types(events) == ["b", "c"] and last == 3
+        assert ring.since(3) == ([], 3)
+        assert _types(ring.since(99)[0]) == ["b", "c"]
+
+
+class TestChangeFeed:
+    def test_parse_cursor(self):
+        assert parse_cursor("12:3") == (12, 3)
+        for bad in (None, "", "12", "a:b", "1:-2"):
+            assert parse_cursor(bad) is None
+
+    def test_no_change_no_events(self, feed_and_writer):
+        feed, _ = feed_and_writer
+        assert feed.poll() is False
+        assert feed.ring.last == 0
+
+    def test_feed_connection_is_read_only(self, feed_and_writer):
+        feed, _ = feed_and_writer
+        assert feed._store._conn.execute("PRAGMA query_only").fetchone()[0] == 1
+
+    def test_new_magnets_and_runs_are_published(self, feed_and_writer):
+        feed, writer = feed_and_writer
+        writer.add_magnet(HASH_A, "Book A", "2026-01-01")
+        writer.add_magnet(HASH_B, "Book B", "2026-01-01")
+        run_id = writer.record_scrape_run("success", 2, 1.5)
+
+        assert feed.poll() is True
+        events, _ = feed.ring.since(0)
+        assert _types(events) == ["magnets", "scrape_run"]
+        assert [i["info_hash"] for i in events[0]["items"]] == [HASH_A, HASH_B]
+        assert events[1]["run"]["id"] == run_id
+        assert feed.cursor == (2, run_id)
+        assert events[1]["cursor"] == f"2:{run_id}"
+
+    def test_daemon_state_change(self, feed_and_writer):
+        feed, writer = feed_and_writer
+        writer.beat("scraping", 60)
+        feed.poll()
+        writer.beat("scraping", 60)  # same state: no new event
+        feed.poll()
+        events, _ = feed.ring.since(0)
+        assert _types(events) == ["daemon"] and events[0]["state"] == "scraping"
+
+    def test_follow_resumes_from_cursor(self, feed_and_writer):
+        feed, writer = feed_and_writer
+        writer.add_magnet(HASH_A, "Book A", "2026-01-01")
+        writer.add_magnet(HASH_B, "Book B", "2026-01-01")
+        feed.poll()
+
+        stream = list(feed.follow((1, 0), duration_s=0, keepalive_s=0))
+        assert _types(stream) == ["ready", "magnets"]
+        assert stream[0]["cursor"] == "1:0"
+        assert [i["title"] for i in stream[1]["items"]] == ["Book B"]
+
+    def test_follow_live_events_and_keepalive(self, feed_and_writer):
+        feed, writer = feed_and_writer
+        stream = feed.follow(None, duration_s=5, keepalive_s=0.01)
+        assert next(stream)["type"] == "ready"
+        assert next(stream) is None  # keepalive
+        writer.add_magnet(HASH_A, "Book A", "2026-01-01")
+        feed.poll()
+        assert next(stream)["type"] == "magnets"
+
+
+class TestEventsRoute:
+    def test_streams_sse_frames(self, client, monkeypatch, tmp_path):
+        db = str(tmp_path / "events.db")
+        writer = MagnetStore(db)
+        feed = ChangeFeed(db, poll_s=3600)
+        monkeypatch.setattr("src.rss_server.change_feed", feed)
+        monkeypatch.setattr("src.rss_server.SSE_STREAM_S", 0)
+        writer.add_magnet(HASH_A, "Book A", "2026-01-01")
+
+        resp = client.get("/api/events", headers={"Last-Event-ID": "0:0"})
+        body = resp.get_data(as_text=True)
+        resp.close()
+        writer.close()
+
+        assert resp.mimetype == "text/event-stream"
+        assert body.startswith("retry: ")
+        assert "event: ready\n" in body
+        assert "id: 1:0\nevent: magnets\n" in body
+
+    def test_stream_cap_returns_503_with_retry_after(self, client, monkeypatch, tmp_path):
+        feed = ChangeFeed(str(tmp_path / "events.db"), poll_s=3600)
+        monkeypatch.setattr("src.rss_server.change_feed", feed)
+        monkeypatch.setattr("src.rss_server.SSE_STREAM_S", 0)
+        slots = threading.BoundedSemaphore(1)
+        monkeypatch.setattr("src.rss_server._sse_slots", slots)
+
+        open_stream = client.get("/api/events", buffered=False)
+        assert open_stream.status_code == 200
+        refused = client.get("/api/events")
+        assert refused.status_code == 503
+        assert refused.headers["Retry-After"] == "0"
+
+        open_stream.close()  # releases the slot
+        again = client.get("/api/events")
+        assert again.status_code == 200
+        again.close()
+        assert slots.acquire(blocking=False)
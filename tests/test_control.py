@@ -0,0 +1,162 @@
+"""Tests for the daemon control socket (src/core/control.py)."""
+
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from src.bind import DaemonContext, loop_tick, run_job
+from src.core.cancellation import CancelToken
+from src.core.control import ControlServer, JobControl, control_request
+from src.core.scraper import DetailResult
+from src.core.stage_timer import StageRecorder, recording, timed
+
+
+@pytest.fixture
+def sock_path():
+    # AF_UNIX paths are limited to ~108 bytes; pytest's tmp_path can be longer.
+    d = tempfile.mkdtemp(prefix="bind-ctl-")
+    yield os.path.join(d, "control.sock")
+    shutil.rmtree(d, ignore_errors=True)
+
+
+class TestJobControl:
+    def test_manual_request_is_consumed_by_next_run(self):
+        control = JobControl()
+        job_id, queued = control.request_run()
+        assert queued and control.pending
+        assert control.request_run() == (job_id, False)
+
+        job = control.begin(CancelToken())
+        assert (job.job_id, job.trigger) == (job_id, "manual")
+        assert not control.pending
+        assert control.request_run() == (job_id, False)  # busy while running
+
+    def test_scheduled_run_gets_its_own_id(self):
+        job = JobControl().begin(CancelToken())
+        assert job.trigger == "scheduled" and job.job_id
+
+    def test_cancel_sets_token(self):
+        control = JobControl()
+        assert control.cancel() is None
+        token = CancelToken()
+        job = control.begin(token)
+        assert control.cancel() == job.job_id
+        assert token.cancelled
+        assert control.snapshot()["state"] == "cancelling"
+
+    def test_progress_and_stage_tracking(self):
+        control = JobControl()
+        control.begin(CancelToken())
+        control.update(items_total=3)
+        control.advance(1, "http://x/b/2/")
+        with recording(StageRecorder(on_stage=control.on_stage)), timed("egress.curl_cffi"):
+            snap = control.snapshot()
+        assert snap["items_done"] == 1 and snap["items_total"] == 3
+        assert snap["current_url"] == "http://x/b/2/"
+        assert snap["egress_layer"] == "curl_cffi"
+
+        control.finish("success")
+        snap = control.snapshot()
+        assert snap["state"] == "success" and snap["current_url"] is None
+        control.update(saved=99)  # late update from a timed-out worker is ignored
+        assert control.snapshot()["saved"] == 0
+
+    def test_events_since(self):
+        control = JobControl()
+        control.request_run()
+        control.begin(CancelToken())
+        events, last = control.events_since(0)
+        assert [e["type"] for e in events] == ["queued", "started"]
+        assert control.events_since(last) == ([], last)
+        # A cursor from a previous daemon process replays the ring.
+        assert len(control.events_since(last + 100)[0]) == 2
+
+    def test_events_wait_for_next_event(self):
+        control = JobControl()
+        threading.Timer(0.05, control.request_run).start()
+        events, _ = control.events_since(0, wait=5)
+        assert [e["type"] for e in events] == ["queued"]
+
+    def test_discard_pending(self):
+        control = JobControl()
+        control.request_run()
+        control.discard_pending("busy")
+        assert not control.pending
+        assert control.events_since(0)[0][-1]["type"] == "skipped"
+
+
+class TestControlServer:
+    def test_round_trip_over_socket(self, sock_path):
+        wake = MagicMock()
+        server = ControlServer(sock_path, JobControl(), wake=wake)
+        assert server.start()
+        try:
+            reply = control_request(sock_path, {"cmd": "trigger"})
+            assert reply["ok"] and reply["job_id"]
+            wake.assert_called_once()
+            assert control_request(sock_path, {"cmd": "trigger"})["ok"] is False
+            assert control_request(sock_path, {"cmd": "progress"}) == {"ok": True, "job": None}
+            events = control_request(sock_path, {"cmd": "events", "since": 0})
+            assert events["last"] == 1
+            assert control_request(sock_path, {"cmd": "cancel"})["ok"] is False
+            assert control_request(sock_path, {"cmd": "nope"})["ok"] is False
+        finally:
+            server.close()
+        assert not os.path.exists(sock_path)
+
+    def test_profile_command(self, sock_path):
+        profile = MagicMock(side_effect=[True, False])
+        server = ControlServer(sock_path, JobControl(), wake=MagicMock(), profile=profile)
+        assert server.handle({"cmd": "profile", "seconds": 12}) == {"ok": True, "seconds": 12}
+        profile.assert_called_once_with(12)
+        assert server.handle({"cmd": "profile"}) == {"ok": False, "error": "busy"}
+        without = ControlServer(sock_path, JobControl(), wake=MagicMock())
+        assert without.handle({"cmd": "profile"})["ok"] is False
+
+    def test_no_daemon_returns_none(self, sock_path):
+        assert control_request(sock_path, {"cmd": "progress"}) is None
+
+    def test_replaces_stale_socket_file(self, sock_path):
+        open(sock_path, "w").close()
+        server = ControlServer(sock_path, JobControl(), wake=MagicMock())
+        assert server.start()
+        server.close()
+
+
+class TestDaemonIntegration:
+    def test_loop_tick_runs_pending_manual_job(self, tmp_path):
+        control = JobControl()
+        ctx = DaemonContext(
+            data_dir=str(tmp_path),
+            interval=60,
+            live_config=MagicMock(**{"get_bool.return_value": False}),
+            run_job=MagicMock(),
+            maybe_beat=MagicMock(),
+            control=control,
+        )
+        loop_tick(ctx)
+        ctx.run_job.assert_not_called()
+        control.request_run()
+        loop_tick(ctx)
+        ctx.run_job.assert_called_once()
+
+    def test_run_job_reports_progress(self, fresh_store):
+        scraper = MagicMock()
+        scraper.get_recent_books.return_value = [
+            {"title": f"Book {i}", "link": f"/b/{i}/"} for i in range(2)
+        ]
+        scraper.extract_details.side_effect = [DetailResult("aa" * 20), DetailResult("bb" * 20)]
+        tm = MagicMock()
+        tm.get_trackers.return_value = []
+        control = JobControl()
+        control.begin(CancelToken())
+
+        run_job(str(fresh_store.db_path), scraper, fresh_store, tm, control=control)
+
+        snap = control.snapshot()
+        assert (snap["items_total"], snap["items_done"], snap["saved"]) == (2, 2, 2)
+        progress = [e for e in control.events_since(0)[0] if e["type"] == "progress"]
+        assert [e["current_url"] for e in progress] == ["/b/0/", "/b/1/"]
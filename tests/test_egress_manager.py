@@ -115,6 +115,34 @@ class TestEgressManagerFetch:
         manager.fetch("http://example.com")
         assert "http://proxy.com" in manager._proxy_pool._failed
 
+    def test_exhausted_budget_skips_remaining_layers(self):
+        from src.core.retry import Deadline
+
+        manager = _make_manager()
+        with pytest.raises(FetchExhausted):
+            manager.fetch("http://example.com", deadline=Deadline(0))
+        manager._retry_engine.execute.assert_not_called()
+
+    def test_deadline_is_passed_to_retry_engine(self):
+        from src.core.retry import Deadline
+
+        manager = _make_manager()
+        manager._retry_engine.execute.return_value = "<html>ok</html>"
+        deadline = Deadline(60)
+        manager.fetch("http://example.com", deadline=deadline)
+        assert manager._retry_engine.execute.call_args.kwargs["deadline"] is deadline
+
+    def test_request_timeout_clamped_to_budget(self):
+        from src.core.retry import Deadline
+
+        manager = _make_manager()
+        manager._retry_engine.execute.side_effect = lambda fn, *a, **kw: fn()
+        response = MagicMock()
+        response.text = "<html>ok</html>"
+        manager._cffi_session.get.return_value = response
+        manager.fetch("http://example.com", deadline=Deadline(5))
+        assert manager._cffi_session.get.call_args.kwargs["timeout"] <= 5
+
 
 class TestEgressManagerFetchMethods:
     def test_fetch_curl_cffi_returns_text(self):
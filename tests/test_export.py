@@ -0,0 +1,102 @@
+"""Tests for the streaming archive export (src/core/export.py, /api/export, `bind export`)."""
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from click.testing import CliRunner
+from src.bind import cli
+from src.core import export as export_mod
+from src.core.export import export_chunks, gzip_chunks, iter_rows
+from src.core.magnet import generate_magnet
+from src.core.storage import MagnetStore
+
+TRACKERS = ["udp://t1.example:1337/announce", "udp://t2.example:80"]
+
+
+@pytest.fixture
+def filled_store(fresh_store):
+    for i in range(5):
+        fresh_store.add_magnet(f"{i:040x}", f"Book {i} & Co", "2026-01-0" + str(i + 1))
+    return fresh_store
+
+
+def _export(store, fmt):
+    return b"".join(export_chunks(store, fmt, TRACKERS)).decode()
+
+
+class TestExportChunks:
+    def test_batches_cover_archive_in_id_order(self, filled_store):
+        batches = list(iter_rows(filled_store, batch_size=2))
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert [r["id"] for b in batches for r in b] == [1, 2, 3, 4, 5]
+
+    def test_ndjson(self, filled_store):
+        lines = _export(filled_store, "ndjson").splitlines()
+        assert len(lines) == 5
+        first = json.loads(lines[0])
+        assert first["title"] == "Book 0 & Co"
+        assert first["magnet"] == generate_magnet(first["info_hash"], first["title"], TRACKERS)
+
+    def test_csv(self, filled_store):
+        rows = list(csv.DictReader(io.StringIO(_export(filled_store, "csv"))))
+        assert len(rows) == 5
+        assert rows[4]["collected_date"] == "2026-01-05"
+
+    def test_magnet_list(self, filled_store):
+        lines = _export(filled_store, "magnets").splitlines()
+        assert lines[0] == generate_magnet("0" * 40, "Book 0 & Co", TRACKERS)
+
+    def test_empty_archive(self, fresh_store):
+        assert _export(fresh_store, "ndjson") == ""
+        assert _export(fresh_store, "csv") == "info_hash,title,collected_date,magnet\n"
+
+    def test_unknown_format(self, fresh_store):
+        with pytest.raises(ValueError):
+            list(export_chunks(fresh_store, "xml", TRACKERS))
+
+    def test_gzip_round_trip(self, filled_store, monkeypatch):
+        monkeypatch.setattr(export_mod, "BATCH_SIZE", 2)
+        plain = _export(filled_store, "magnets").encode()
+        packed = b"".join(gzip_chunks(export_chunks(filled_store, "magnets", TRACKERS)))
+        assert gzip.decompress(packed) == plain
+
+
+class TestExportRoute:
+    def test_streams_attachment(self, client, fresh_store, monkeypatch):
+        monkeypatch.setattr("src.rss_server.tracker_manager.get_trackers", lambda: TRACKERS)
+        fresh_store.add_magnet("a" * 40, "Book A", "2026-01-01")
+        resp = client.get("/api/export?format=csv")
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/csv"
+        assert "attachment" in resp.headers["Content-Disposition"]
+        assert "Book A" in resp.get_data(as_text=True)
+
+    def test_gzip_download(self, client, fresh_store):
+        fresh_store.add_magnet("a" * 40, "Book A", "2026-01-01")
+        resp = client.get("/api/export?gzip=1")
+        assert resp.mimetype == "application/gzip"
+        assert resp.headers["Content-Disposition"].endswith('.ndjson.gz"')
+        assert json.loads(gzip.decompress(resp.get_data()))["title"] == "Book A"
+
+    def test_bad_format_400(self, client):
+        assert client.get("/api/export?format=xml").status_code == 400
+
+
+class TestExportCommand:
+    def test_writes_file(self, tmp_path):
+        db = str(tmp_path / "bind.db")
+        store = MagnetStore(db)
+        store.add_magnet("a" * 40, "Book A", "2026-01-01")
+        store.close()
+        out = tmp_path / "out.txt.gz"
+
+        result = CliRunner().invoke(
+            cli, ["export", "--db-path", db, "--format", "magnets", "--gzip", "-o", str(out)]
+        )
+
+        assert result.exit_code == 0, result.output
+        text = gzip.decompress(out.read_bytes()).decode()
+        assert text.startswith(f"magnet:?xt=urn:btih:{'a' * 40}&dn=Book+A")
@@ -0,0 +1,133 @@
+"""Tests for the detail-page negative cache (fetch_failures table)."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from src.bind import run_job
+from src.core.scraper import BindScraper, DetailResult
+from src.core.storage import FAILURE_BACKOFF_BASE_S, FAILURE_BACKOFF_MAX_S
+
+URL = "/audio-books/broken/"
+
+
+def _expire(store, url):
+    past = (datetime.now(timezone.utc) - timedelta(seconds=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    store._conn.execute("UPDATE fetch_failures SET next_retry_at = ? WHERE url = ?", (past, url))
+
+
+def _backoff_s(entry):
+    last = datetime.strptime(entry["last_attempt_at"], "%Y-%m-%dT%H:%M:%SZ")
+    nxt = datetime.strptime(entry["next_retry_at"], "%Y-%m-%dT%H:%M:%SZ")
+    return (nxt - last).total_seconds()
+
+
+class TestFetchFailureStore:
+    def test_unknown_url_not_in_backoff(self, fresh_store):
+        assert fresh_store.in_failure_backoff(URL) is False
+
+    def test_recorded_failure_is_in_backoff(self, fresh_store):
+        fresh_store.record_fetch_failure(URL, "parse_failed")
+        assert fresh_store.in_failure_backoff(URL) is True
+
+    def test_backoff_doubles_per_attempt(self, fresh_store):
+        first = fresh_store.record_fetch_failure(URL, "parse_failed")
+        second = fresh_store.record_fetch_failure(URL, "parse_failed")
+        assert second["attempts"] == 2
+        assert _backoff_s(first) == FAILURE_BACKOFF_BASE_S
+        assert _backoff_s(second) == 2 * FAILURE_BACKOFF_BASE_S
+
+    def test_backoff_is_capped(self, fresh_store):
+        for _ in range(20):
+            entry = fresh_store.record_fetch_failure(URL, "parse_failed")
+        assert _backoff_s(entry) == FAILURE_BACKOFF_MAX_S
+
+    def test_expired_entry_not_in_backoff(self, fresh_store):
+        fresh_store.record_fetch_failure(URL, "parse_failed")
+        _expire(fresh_store, URL)
+        assert fresh_store.in_failure_backoff(URL) is False
+
+    def test_clear_removes_entry(self, fresh_store):
+        fresh_store.record_fetch_failure(URL, "parse_failed")
+        fresh_store.clear_fetch_failure(URL)
+        assert fresh_store.fetch_failures() == []
+
+    def test_list_orders_chronic_failures_first(self, fresh_store):
+        fresh_store.record_fetch_failure("/once/", "fetch_failed")
+        fresh_store.record_fetch_failure(URL, "parse_failed")
+        fresh_store.record_fetch_failure(URL, "parse_failed")
+        rows = fresh_store.fetch_failures()
+        assert [r["url"] for r in rows] == [URL, "/once/"]
+        assert rows[0]["reason"] == "parse_failed"
+
+
+def _scraper(result):
+    scraper = MagicMock()
+    scraper.get_recent_books.return_value = [{"title": "Broken Book", "link": URL}]
+    scraper.extract_details.return_value = result
+    return scraper
+
+
+def _tracker_manager():
+    tm = MagicMock()
+    tm.get_trackers.return_value = []
+    return tm
+
+
+class TestRunJobNegativeCache:
+    def test_parse_failure_is_recorded(self, fresh_store):
+        run_job(
+            "/tmp", _scraper(DetailResult(None, "parse_failed")), fresh_store, _tracker_manager()
+        )
+        assert fresh_store.in_failure_backoff(URL) is True
+
+    def test_circuit_open_is_not_recorded(self, fresh_store):
+        run_job(
+            "/tmp", _scraper(DetailResult(None, "circuit_open")), fresh_store, _tracker_manager()
+        )
+        assert fresh_store.fetch_failures() == []
+
+    def test_page_in_backoff_is_not_fetched(self, fresh_store):
+        fresh_store.record_fetch_failure(URL, "parse_failed")
+        scraper = _scraper(DetailResult("ab" * 20))
+        run_job("/tmp", scraper, fresh_store, _tracker_manager())
+        scraper.extract_details.assert_not_called()
+        assert fresh_store.stats()["total"] == 0
+
+    def test_success_after_backoff_clears_entry(self, fresh_store):
+        fresh_store.record_fetch_failure(URL, "parse_failed")
+        _expire(fresh_store, URL)
+        run_job("/tmp", _scraper(DetailResult("ab" * 20)), fresh_store, _tracker_manager())
+        assert fresh_store.fetch_failures() == []
+        assert fresh_store.has_hash("ab" * 20)
+
+
+class TestExtractDetailsFailureReason:
+    def test_parse_failed(self):
+        scraper = BindScraper(egress_manager=MagicMock())
+        with patch.object(scraper, "_get_page", return_value="<html>nothing</html>"):
+            assert scraper.extract_details("http://x/a").failure == "parse_failed"
+
+    def test_fetch_failed(self):
+        scraper = BindScraper(egress_manager=MagicMock())
+        with patch.object(scraper, "_get_page", return_value=None):
+            assert scraper.extract_details("http://x/a").failure == "fetch_failed"
+
+    def test_circuit_open(self):
+        scraper = BindScraper(egress_manager=MagicMock())
+        scraper.circuit_breaker.is_open = True
+        scraper.circuit_breaker.last_failure = datetime.now().timestamp()
+        with patch.object(scraper, "_get_page") as mock_get_page:
+            assert scraper.extract_details("http://x/a").failure == "circuit_open"
+        mock_get_page.assert_not_called()
+
+
+class TestFetchFailuresRoute:
+    def test_lists_entries(self, client, fresh_store):
+        fresh_store.record_fetch_failure(URL, "parse_failed")
+        data = client.get("/api/fetch-failures").get_json()
+        assert data["count"] == 1
+        assert data["failures"][0]["url"] == URL
+        assert data["failures"][0]["attempts"] == 1
+
+    def test_invalid_limit_falls_back(self, client):
+        assert client.get("/api/fetch-failures?limit=abc").status_code == 200
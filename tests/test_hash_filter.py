@@ -0,0 +1,75 @@
+"""Tests for the info-hash Bloom filter (src/core/hash_filter.py) and its use in has_hash()."""
+
+import hashlib
+
+from src.core.hash_filter import FILTER_CHECKS, HashFilter
+from src.core.storage import MagnetStore
+
+
+def _hash(i):
+    return hashlib.sha1(str(i).encode()).hexdigest()
+
+
+class TestHashFilter:
+    def test_no_false_negatives(self):
+        hf = HashFilter(capacity=1000)
+        hashes = [_hash(i) for i in range(1000)]
+        for h in hashes:
+            hf.add(h)
+        assert all(h in hf for h in hashes)
+
+    def test_false_positive_rate_near_target(self):
+        hf = HashFilter(capacity=100_000, fp_rate=0.01)
+        for i in range(100_000):
+            hf.add(_hash(i))
+        fps = sum(_hash(f"other-{i}") in hf for i in range(20_000))
+        assert fps / 20_000 < 0.02
+        assert 0.005 < hf.estimated_fp_rate() < 0.02
+        assert not hf.full
+
+    def test_sizing(self):
+        hf = HashFilter(capacity=1_000_000, fp_rate=0.01)
+        # ~9.6 bits and 7 probes per hash at 1%.
+        assert 1_150_000 < hf.nbytes < 1_250_000
+        assert hf.num_hashes == 7
+
+
+class TestStoreFilter:
+    def _checks(self, result):
+        return FILTER_CHECKS.value(result=result)
+
+    def test_new_hash_answered_by_filter(self, fresh_store):
+        fresh_store.add_magnet(_hash(1), "Known", "2024-01-01")
+        new_before, present_before = self._checks("new"), self._checks("present")
+
+        assert fresh_store.has_hash(_hash(2)) is False
+        assert fresh_store.has_hash(_hash(1).upper()) is True
+
+        assert self._checks("new") == new_before + 1
+        assert self._checks("present") == present_before + 1
+
+    def test_own_inserts_are_added(self, fresh_store):
+        assert fresh_store.has_hash(_hash(1)) is False  # builds the filter
+        fresh_store.add_magnet(_hash(1), "A", "2024-01-01")
+        fresh_store.insert_many([(_hash(2), "B", "2024-01-01", None)])
+        assert fresh_store.has_hash(_hash(1)) and fresh_store.has_hash(_hash(2))
+
+    def test_inserts_from_other_connections_are_caught_up(self, fresh_store):
+        assert fresh_store.has_hash(_hash(1)) is False
+        other = MagnetStore(fresh_store.db_path)
+        other.add_magnet(_hash(1), "From the daemon", "2024-01-01")
+        other.close()
+        assert fresh_store.has_hash(_hash(1)) is True
+
+    def test_rebuilt_when_full(self, fresh_store, monkeypatch):
+        monkeypatch.setattr("src.core.hash_filter.MIN_CAPACITY", 10)
+        assert fresh_store.has_hash(_hash(0)) is False
+        first = fresh_store._filter
+        fresh_store.insert_many([(_hash(i), f"T{i}", "2024-01-01", None) for i in range(50)])
+        assert fresh_store.has_hash(_hash(49)) is True
+        assert fresh_store._filter is not first
+        assert fresh_store._filter.capacity == 100
+
+    def test_non_hex_hashes_bypass_filter(self, fresh_store):
+        fresh_store.add_magnet("legacy-id", "Odd", "2024-01-01")
+        assert fresh_store.has_hash("legacy-id") is True
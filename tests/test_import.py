@@ -0,0 +1,160 @@
+"""Tests for bulk import (src/core/importer.py, MagnetStore.bulk_load, `bind import`)."""
+
+import gzip
+import json
+
+import pytest
+from click.testing import CliRunner
+from src.bind import cli
+from src.core import importer
+from src.core.importer import detect_format, import_file, iter_records
+from src.core.magnet import generate_magnet
+from src.core.storage import MagnetStore
+
+
+def _magnet_lines(n, start=0):
+    return "".join(generate_magnet(f"{i:040x}", f"Book {i}", []) + "\n" for i in range(start, n))
+
+
+class TestDetectFormat:
+    @pytest.mark.parametrize(
+        "name, fmt",
+        [
+            ("dump.ndjson", "ndjson"),
+            ("dump.jsonl.gz", "ndjson"),
+            ("dump.CSV", "csv"),
+            ("magnets_2026-01-01.txt", "magnets"),
+            ("anything.gz", "magnets"),
+        ],
+    )
+    def test_by_extension(self, name, fmt):
+        assert detect_format(name) == fmt
+
+
+class TestIterRecords:
+    def test_magnet_lines_take_date_from_file_name(self, tmp_path):
+        path = tmp_path / "magnets_2025-03-04.txt"
+        path.write_text(_magnet_lines(2) + "\nnot a magnet\n")
+
+        records = list(iter_records(str(path), "magnets", "2026-01-01"))
+
+        assert records[0] == (f"{0:040x}", "Book 0", "2025-03-04", "2025-03-04T00:00:00.000Z", None)
+        assert records[2] is None
+
+    def test_ndjson_accepts_hash_or_magnet(self, tmp_path):
+        path = tmp_path / "dump.ndjson"
+        path.write_text(
+            json.dumps({"info_hash": "A" * 40, "title": "Upper", "collected_date": "2024-05-06"})
+            + "\n"
+            + json.dumps({"magnet": generate_magnet("b" * 40, "From Magnet", ["udp://t"])})
+            + "\n{broken\n"
+            + json.dumps({"info_hash": "xyz"})
+            + "\n"
+        )
+
+        records = list(iter_records(str(path), "ndjson", "2026-01-01"))
+
+        assert records[0][:3] == ("a" * 40, "Upper", "2024-05-06")
+        assert records[1][:3] == ("b" * 40, "From Magnet", "2026-01-01")
+        assert records[2:] == [None, None]
+
+    def test_csv_gzip(self, tmp_path):
+        path = tmp_path / "dump.csv.gz"
+        path.write_bytes(
+            gzip.compress(b"info_hash,title,collected_date\n" + b"c" * 40 + b',"A, B",2023-01-02\n')
+        )
+
+        assert list(iter_records(str(path), "csv", "2026-01-01")) == [
+            ("c" * 40, "A, B", "2023-01-02", "2023-01-02T00:00:00.000Z", None)
+        ]
+
+
+class TestImportFile:
+    def test_imports_and_skips_duplicates(self, fresh_store, tmp_path):
+        fresh_store.add_magnet(f"{0:040x}", "Existing", "2020-01-01")
+        path = tmp_path / "magnets_2025-01-01.txt"
+        path.write_text(_magnet_lines(5) + "garbage\n")
+
+        with fresh_store.bulk_load():
+            result = import_file(fresh_store, str(path), chunk_size=2)
+
+        assert (result.records, result.inserted, result.invalid) == (6, 4, 1)
+        assert fresh_store.stats()["total"] == 5
+
+    def test_bulk_load_rebuilds_search_and_restores_triggers(self, fresh_store, tmp_path):
+        path = tmp_path / "dump.txt"
+        path.write_text(_magnet_lines(3))
+
+        with fresh_store.bulk_load():
+            import_file(fresh_store, str(path))
+        fresh_store.add_magnet("f" * 40, "Brand New Title", "2026-01-01")
+
+        assert fresh_store.search("Book 2")[1] == 1
+        assert fresh_store.search("Brand New")[1] == 1
+        names = {
+            r[0] for r in fresh_store._conn.execute("SELECT name FROM sqlite_master").fetchall()
+        }
+        assert {"magnets_ai", "magnets_ad", "magnets_au", "idx_magnets_date_id"} <= names
+
+    def test_resumes_after_interruption(self, fresh_store, tmp_path, monkeypatch):
+        path = tmp_path / "dump.txt"
+        path.write_text(_magnet_lines(6))
+        real_chunk = fresh_store.import_chunk
+        calls = []
+
+        def flaky_chunk(job_id, rows, position):
+            calls.append(position)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return real_chunk(job_id, rows, position)
+
+        monkeypatch.setattr(fresh_store, "import_chunk", flaky_chunk)
+        with pytest.raises(KeyboardInterrupt):
+            import_file(fresh_store, str(path), chunk_size=2)
+        monkeypatch.setattr(fresh_store, "import_chunk", real_chunk)
+
+        result = import_file(fresh_store, str(path), chunk_size=2)
+
+        assert result.resumed_from == 2
+        assert result.records == 4
+        assert fresh_store.stats()["total"] == 6
+
+    def test_restart_ignores_checkpoint(self, fresh_store, tmp_path):
+        path = tmp_path / "dump.txt"
+        path.write_text(_magnet_lines(3))
+        job = fresh_store.start_import(
+            str(path.resolve()), importer.fingerprint(str(path)), "magnets"
+        )
+        fresh_store.import_chunk(job["id"], [], 2)
+
+        result = import_file(fresh_store, str(path), restart=True)
+
+        assert result.resumed_from == 0
+        assert result.records == 3
+
+    def test_changed_file_starts_over(self, fresh_store, tmp_path):
+        path = tmp_path / "dump.txt"
+        path.write_text(_magnet_lines(3))
+        job = fresh_store.start_import(str(path.resolve()), "0:0", "magnets")
+        fresh_store.import_chunk(job["id"], [], 2)
+
+        assert import_file(fresh_store, str(path)).resumed_from == 0
+
+
+class TestImportCommand:
+    def test_imports_files(self, tmp_path):
+        db = str(tmp_path / "bind.db")
+        a = tmp_path / "magnets_2025-01-01.txt"
+        a.write_text(_magnet_lines(3))
+        b = tmp_path / "more.ndjson"
+        b.write_text(json.dumps({"info_hash": "e" * 40, "title": "NDJSON Book"}) + "\n")
+
+        result = CliRunner().invoke(cli, ["import", "--db-path", db, str(a), str(b)])
+
+        assert result.exit_code == 0, result.output
+        assert "Done: 4 new of 4 records" in result.output
+        store = MagnetStore(db)
+        try:
+            assert store.search("NDJSON")[1] == 1
+        finally:
+            store.close()
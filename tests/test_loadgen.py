@@ -0,0 +1,55 @@
+"""Tests for the mock upstream and load driver (src/loadgen.py)."""
+
+import urllib.error
+import urllib.request
+
+import pytest
+from src.loadgen import MockUpstream, UpstreamProfile, book_hash, run_load
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return resp.status, resp.read().decode()
+
+
+class TestMockUpstream:
+    def test_serves_rss_and_detail_pages(self):
+        with MockUpstream(UpstreamProfile(items=3, latency_ms=0, latency_jitter_ms=0)) as up:
+            status, rss = _get(f"{up.base_url}/rss")
+            assert status == 200
+            assert rss.count("<item>") == 3
+            _, page = _get(f"{up.base_url}/audio-books/book-1/")
+            assert book_hash(0, 1) in page
+
+    def test_next_generation_serves_fresh_items(self):
+        with MockUpstream(UpstreamProfile(items=2, latency_ms=0, latency_jitter_ms=0)) as up:
+            _, first = _get(f"{up.base_url}/rss")
+            up.next_generation()
+            _, second = _get(f"{up.base_url}/rss")
+            assert "book-0/" in first and "book-0/" not in second
+
+    def test_rate_limit_fault_sets_retry_after(self):
+        profile = UpstreamProfile(latency_ms=0, latency_jitter_ms=0, rate_limit_rate=1.0)
+        with MockUpstream(profile) as up:
+            with pytest.raises(urllib.error.HTTPError) as exc:
+                _get(f"{up.base_url}/rss")
+            assert exc.value.code == 429
+            assert exc.value.headers["Retry-After"] == "1"
+            assert up.responses["rate_limited"] == 1
+
+    def test_challenge_fault_serves_cloudflare_page(self):
+        profile = UpstreamProfile(latency_ms=0, latency_jitter_ms=0, challenge_rate=1.0)
+        with MockUpstream(profile) as up:
+            with pytest.raises(urllib.error.HTTPError) as exc:
+                _get(f"{up.base_url}/rss")
+            assert exc.value.code == 403
+            assert "Just a moment..." in exc.value.read().decode()
+
+
+def test_run_load_drives_the_real_pipeline(tmp_path):
+    profile = UpstreamProfile(items=4, latency_ms=0, latency_jitter_ms=0)
+    report = run_load(profile, runs=2, data_dir=str(tmp_path))
+    assert [r["saved"] for r in report["runs"]] == [4, 4]
+    assert report["total_saved"] == 8
+    assert report["runs"][0]["stages"]["detail_page"]["count"] == 4
+    assert report["upstream_responses"]["ok"] == 10  # 2 feeds + 8 detail pages
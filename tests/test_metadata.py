@@ -0,0 +1,226 @@
+"""Tests for detail-page metadata extraction (src/core/metadata.py) and its storage."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from bs4 import BeautifulSoup
+from src.core.metadata import BookMetadata, extract_metadata, parse_size
+from src.core.result_cache import CACHE_LOOKUPS
+from src.core.scraper import BindScraper
+from src.core.storage import MagnetStore
+
+HASH_A = "a" * 40
+HASH_B = "b" * 40
+HASH_C = "c" * 40
+
+DETAIL_PAGE = """<html><body>
+<div class="postInfo">Category: <a href="#">Fantasy</a> <a href="#">Romance</a>
+    <br>Language: English<span>Keywords: dragons</span></div>
+<div class="postContent">
+    <p>Written by <span class="author">Jane Doe</span>
+       Read by <span class="narrator">John Roe</span></p>
+    <p>Format: <span>M4B</span> / Bitrate: <span>64 Kbps</span><br>Unabridged</p>
+    <table>
+        <tr><td>Info Hash:</td><td>abc123def456789012345678901234567890abcd</td></tr>
+        <tr><td>File Size:</td><td>417.35 MBs</td></tr>
+    </table>
+</div>
+</body></html>"""
+
+
+def _soup(html):
+    return BeautifulSoup(html, "html.parser")
+
+
+class TestExtractMetadata:
+    def test_detail_page(self):
+        assert extract_metadata(_soup(DETAIL_PAGE)) == BookMetadata(
+            author="Jane Doe",
+            narrator="John Roe",
+            format="M4B",
+            bitrate_kbps=64,
+            size_bytes=int(417.35 * 1024**2),
+            category="Fantasy",
+        )
+
+    def test_labelled_lines_without_spans(self):
+        meta = extract_metadata(
+            _soup("<p>Author: Frank Herbert<br>Narrator: Simon Vance<br>Format: MP3</p>")
+        )
+        assert (meta.author, meta.narrator, meta.format) == ("Frank Herbert", "Simon Vance", "MP3")
+
+    def test_missing_fields_are_none(self):
+        meta = extract_metadata(_soup("<p>Format: Various formats</p>"))
+        assert meta == BookMetadata()
+        assert not meta
+
+    @pytest.mark.parametrize(
+        "text, size",
+        [
+            ("1.5 GBs", int(1.5 * 1024**3)),
+            ("700 MB", 700 * 1024**2),
+            ("12,5 KB", 12800),
+            ("", None),
+        ],
+    )
+    def test_parse_size(self, text, size):
+        assert parse_size(text) == size
+
+    def test_extract_details_parses_once(self, mocker):
+        scraper = BindScraper(egress_manager=MagicMock())
+        mocker.patch.object(scraper, "_get_page", return_value=DETAIL_PAGE)
+        parse = mocker.patch("src.core.scraper.BeautifulSoup", wraps=BeautifulSoup)
+
+        result = scraper.extract_details("http://example.com/book")
+
+        assert result.info_hash == "abc123def456789012345678901234567890abcd"
+        assert result.metadata.author == "Jane Doe"
+        assert parse.call_count == 1
+
+
+class TestMetadataFilters:
+    @pytest.fixture
+    def store(self, fresh_store):
+        fresh_store.add_magnet(HASH_A, "Dune [MP3]", "2024-01-01")
+        fresh_store.add_magnet(HASH_B, "Dune (M4B)", "2024-01-02")
+        fresh_store.add_magnet(HASH_C, "Emma", "2024-01-03")
+        fresh_store.set_metadata(
+            HASH_A, BookMetadata(author="Frank Herbert", format="MP3", bitrate_kbps=64)
+        )
+        fresh_store.set_metadata(
+            HASH_B, BookMetadata(author="Frank Herbert", format="M4B", bitrate_kbps=128)
+        )
+        fresh_store.set_metadata(HASH_C, BookMetadata(author="Jane Austen", format="MP3"))
+        return fresh_store
+
+    def _hashes(self, result):
+        return [r["info_hash"] for r in result[0]]
+
+    def test_set_and_read_back(self, store):
+        assert store.metadata_of(HASH_A.upper()).bitrate_kbps == 64
+        assert store.set_metadata("d" * 40, BookMetadata(author="Nobody")) is False
+        assert store.metadata_of("d" * 40) is None
+
+    def test_filters_are_case_insensitive_and_combine(self, store):
+        assert self._hashes(store.search(None, filters={"author": "frank herbert"})) == [
+            HASH_B,
+            HASH_A,
+        ]
+        assert self._hashes(store.search(None, filters={"format": "mp3"})) == [HASH_C, HASH_A]
+        result = store.search("Dune", filters={"author": "Frank Herbert", "min_bitrate": 100})
+        assert (self._hashes(result), result[1]) == ([HASH_B], 1)
+        assert store.search("Du", filters={"format": "MP3"})[1] == 1
+
+    def test_filters_with_collapse(self, store):
+        rows, total = store.search(None, collapse=True, filters={"author": "Frank Herbert"})
+        assert (total, rows[0]["releases"]) == (1, 2)
+
+    def test_filter_uses_index(self, store):
+        plan = " ".join(
+            r[3]
+            for r in store._conn.execute(
+                "EXPLAIN QUERY PLAN SELECT magnet_id FROM magnet_meta WHERE author = ?",
+                ("Frank Herbert",),
+            )
+        )
+        assert "idx_magnet_meta_author" in plan
+
+    def test_unknown_filter_rejected(self, store):
+        with pytest.raises(ValueError):
+            store.search(None, filters={"isbn": "1"})
+
+    def test_deleted_magnet_drops_metadata(self, store):
+        store._conn.execute("DELETE FROM magnets WHERE info_hash = ?", (HASH_C,))
+        assert store._conn.execute("SELECT COUNT(*) FROM magnet_meta").fetchone()[0] == 2
+
+    def test_api_filters(self, client, store):
+        data = client.get("/api/magnets?author=FRANK+HERBERT&min_bitrate=100").get_json()
+        assert [m["hash"] for m in data["magnets"]] == [HASH_B]
+        assert data["filters"] == {"author": "FRANK HERBERT", "min_bitrate": 100}
+        assert client.get("/api/magnets?min_bitrate=fast").status_code == 400
+
+
+class TestFacetCounts:
+    @pytest.fixture
+    def store(self, fresh_store):
+        fresh_store.insert_many(
+            [
+                (HASH_A, "Dune [MP3]", "2024-01-01", "import"),
+                (HASH_B, "Dune (M4B)", "2024-02-02", None),
+                (HASH_C, "Emma", "2024-02-03", None),
+            ]
+        )
+        fresh_store.set_metadata(HASH_A, BookMetadata(format="MP3", category="Sci-Fi"))
+        fresh_store.set_metadata(HASH_B, BookMetadata(format="M4B", category="sci-fi"))
+        fresh_store.set_metadata(HASH_C, BookMetadata(format="MP3", category="Classics"))
+        return fresh_store
+
+    def _counts(self, facets, name):
+        return {f["value"].lower(): f["count"] for f in facets[name]}
+
+    def test_whole_archive_from_rollup(self, store):
+        facets = store.facet_counts()
+        assert self._counts(facets, "format") == {"mp3": 2, "m4b": 1}
+        assert self._counts(facets, "category") == {"sci-fi": 2, "classics": 1}
+        assert self._counts(facets, "source") == {"import": 1}
+        assert facets["month"] == [
+            {"value": "2024-02", "count": 2},
+            {"value": "2024-01", "count": 1},
+        ]
+
+    def test_query_and_filters_agree_with_rollup(self, store):
+        facets = store.facet_counts("Dune")
+        assert self._counts(facets, "format") == {"mp3": 1, "m4b": 1}
+        assert self._counts(facets, "category") == {"sci-fi": 2}
+        facets = store.facet_counts("Du", filters={"format": "mp3"})
+        assert self._counts(facets, "month") == {"2024-01": 1}
+
+    def test_rollup_follows_updates_and_deletes(self, store):
+        store.set_metadata(HASH_C, BookMetadata(format="FLAC"))
+        store._conn.execute("DELETE FROM magnets WHERE info_hash = ?", (HASH_A,))
+        store._conn.execute("UPDATE magnets SET collected_date = '2023-12-31'")
+
+        facets = store.facet_counts()
+        assert self._counts(facets, "format") == {"m4b": 1, "flac": 1}
+        assert self._counts(facets, "category") == {"sci-fi": 1}
+        assert self._counts(facets, "source") == {}
+        assert self._counts(facets, "month") == {"2023-12": 2}
+
+    def test_rollup_rebuilt_after_bulk_load(self, store):
+        with store.bulk_load():
+            store.insert_many([("d" * 40, "Persuasion", "2024-03-01", "import")])
+        assert self._counts(store.facet_counts(), "source") == {"import": 2}
+
+    def test_cached_until_database_changes(self, store):
+        hits = CACHE_LOOKUPS.value(cache="facets", result="hit")
+        first = store.facet_counts("Dune")
+        assert store.facet_counts("Dune") is first
+        assert CACHE_LOOKUPS.value(cache="facets", result="hit") == hits + 1
+
+        store.add_magnet("d" * 40, "Dune Messiah", "2024-03-01")
+        assert store.facet_counts("Dune") is not first
+
+        other = MagnetStore(store.db_path)
+        cached = store.facet_counts()
+        other.set_metadata("d" * 40, BookMetadata(format="MP3"))
+        other.close()
+        assert self._counts(store.facet_counts(), "format")["mp3"] == 3
+        assert cached is not store.facet_counts()
+
+    def test_unrelated_writes_keep_cache(self, store):
+        first = store.facet_counts()
+        misses = CACHE_LOOKUPS.value(cache="facets", result="miss")
+
+        store.beat("idle", 60)
+        store.record_scrape_run("success", 0, 1.5)
+        other = MagnetStore(store.db_path)
+        other.enqueue_books([{"link": "https://example.org/b/1", "title": "Emma"}])
+        other.close()
+
+        assert store.facet_counts() is first
+        assert CACHE_LOOKUPS.value(cache="facets", result="miss") == misses
+
+    def test_api(self, client, store):
+        data = client.get("/api/magnets?q=Dune&facets=1").get_json()
+        assert {f["value"] for f in data["facets"]["format"]} == {"MP3", "M4B"}
+        assert "facets" not in client.get("/api/magnets").get_json()
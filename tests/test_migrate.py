@@ -118,3 +118,75 @@ def test_migrate_happy_path(tmp_path):
     count = conn.execute("SELECT COUNT(*) FROM magnets").fetchone()[0]
     conn.close()
     assert count == 1
+
+
+def test_migrate_parallel_workers_match_serial(tmp_path):
+    from src.core.migrate import migrate
+
+    magnet_dir = tmp_path / "magnets"
+    magnet_dir.mkdir()
+    for day in range(1, 9):
+        lines = "".join(
+            f"magnet:?xt=urn:btih:{day * 1000 + i:040x}&dn=Book+{day}-{i}\n" for i in range(50)
+        )
+        # Every file repeats one hash from the first, as re-scraped items do.
+        lines += f"magnet:?xt=urn:btih:{1000:040x}&dn=Book+1-0\n"
+        (magnet_dir / f"magnets_2024-01-{day:02d}.txt").write_text(lines)
+
+    counts = []
+    for workers in (1, 3):
+        db_path = str(tmp_path / f"bind-{workers}.db")
+        migrate(str(magnet_dir), db_path, workers=workers)
+        conn = sqlite3.connect(db_path)
+        counts.append(
+            conn.execute(
+                "SELECT COUNT(*), MIN(collected_date), MAX(collected_date) FROM magnets"
+            ).fetchone()
+        )
+        conn.close()
+    assert counts[0] == counts[1] == (400, "2024-01-01", "2024-01-08")
+
+
+def test_migrate_rerun_counts_only_new_hashes(tmp_path):
+    from src.core.migrate import migrate
+
+    magnet_dir = tmp_path / "magnets"
+    magnet_dir.mkdir()
+    line = "magnet:?xt=urn:btih:abc123def456789012345678901234567890abcd&dn=Test\n"
+    (magnet_dir / "magnets_2024-01-01.txt").write_text(line)
+    db_path = str(tmp_path / "bind.db")
+    migrate(str(magnet_dir), db_path)
+    (magnet_dir / "magnets_2024-01-02.txt").write_text(line.replace("abc123", "fff123"))
+    migrate(str(magnet_dir), db_path)  # no row count mismatch on the second run
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM magnets").fetchone()[0]
+    conn.close()
+    assert count == 2
+
+
+def test_parsed_files_keeps_a_bounded_window(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.core import migrate as migrate_mod
+
+    files = []
+    for day in range(1, 21):
+        path = tmp_path / f"magnets_2024-01-{day:02d}.txt"
+        path.write_text("")
+        files.append(str(path))
+
+    submitted = []
+
+    class CountingPool(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(args[0])
+            return super().submit(fn, *args, **kwargs)
+
+    with patch.object(migrate_mod, "ProcessPoolExecutor", CountingPool):
+        results = migrate_mod._parsed_files(files, workers=2)
+        window = 2 * migrate_mod.PENDING_PER_WORKER
+        consumed = []
+        for path, _, _ in results:
+            consumed.append(path)
+            assert len(submitted) <= len(consumed) + window
+    assert consumed == files
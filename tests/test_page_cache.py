@@ -0,0 +1,110 @@
+"""Tests for the on-disk detail-page cache (src/core/page_cache.py)."""
+
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+from src.core.page_cache import PageCache
+from src.core.scraper import BindScraper
+
+URL_A = "http://example.com/audio-books/a/"
+URL_B = "http://example.com/audio-books/b/"
+HASH = "abc123def456789012345678901234567890abcd"
+DETAIL_HTML = (
+    f"<html><body><table><tr><td>Info Hash:</td><td>{HASH}</td></tr></table></body></html>"
+)
+
+
+class TestPageCache:
+    def test_miss_returns_none(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        assert cache.get(URL_A) is None
+
+    def test_put_then_get_roundtrip(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        cache.put(URL_A, "<html>a</html>")
+        assert cache.get(URL_A) == "<html>a</html>"
+
+    def test_entries_survive_a_new_instance(self, tmp_path):
+        PageCache(str(tmp_path)).put(URL_A, "<html>a</html>")
+        reopened = PageCache(str(tmp_path))
+        assert reopened.get(URL_A) == "<html>a</html>"
+        assert reopened.stats()["entries"] == 1
+
+    def test_expired_entry_is_dropped(self, tmp_path):
+        cache = PageCache(str(tmp_path), ttl_s=60)
+        cache.put(URL_A, "<html>a</html>")
+        with patch("src.core.page_cache.time.time", return_value=time.time() + 120):
+            assert cache.get(URL_A) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_corrupt_entry_is_discarded(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        cache.put(URL_A, "<html>a</html>")
+        with open(cache._path(URL_A), "wb") as f:
+            f.write(b"not zlib")
+        assert cache.get(URL_A) is None
+        assert not os.path.exists(cache._path(URL_A))
+
+    def test_evicts_least_recently_used_over_limit(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        cache.put(URL_A, "a" * 1000)
+        size = cache.stats()["bytes"]
+        old = time.time() - 100
+        os.utime(cache._path(URL_A), (old, old))
+        cache.max_bytes = size + size // 2
+        cache.put(URL_B, "b" * 1000)
+        assert cache.get(URL_A) is None
+        assert cache.get(URL_B) == "b" * 1000
+
+    def test_eviction_leaves_headroom(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        for i in range(10):
+            cache.put(f"{URL_A}{i}", "a" * 1000)
+        size = cache.stats()["bytes"] // 10
+        cache.max_bytes = cache.stats()["bytes"] + size // 2
+        with patch.object(cache, "_entries", wraps=cache._entries) as entries:
+            cache.put(f"{URL_B}0", "b" * 1000)
+            cache.put(f"{URL_B}1", "b" * 1000)
+        assert entries.call_count == 1  # the second put fits without a walk
+        assert cache.stats()["entries"] == 10
+
+    def test_hit_refreshes_recency(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        cache.put(URL_A, "a" * 1000)
+        old = time.time() - 100
+        os.utime(cache._path(URL_A), (old, old))
+        assert cache.get(URL_A) is not None
+        assert os.path.getmtime(cache._path(URL_A)) > old
+
+    def test_write_failure_is_not_fatal(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        with patch("src.core.page_cache.os.replace", side_effect=OSError("disk full")):
+            cache.put(URL_A, "<html>a</html>")
+        assert cache.get(URL_A) is None
+        assert cache.stats()["bytes"] == 0
+
+
+class TestScraperUsesPageCache:
+    def _scraper(self, tmp_path):
+        egress = MagicMock()
+        return BindScraper(egress_manager=egress, page_cache=PageCache(str(tmp_path)))
+
+    def test_successful_parse_is_cached(self, tmp_path):
+        scraper = self._scraper(tmp_path)
+        with patch.object(scraper, "_get_page", return_value=DETAIL_HTML):
+            assert scraper.extract_info_hash(URL_A) == HASH
+        assert scraper.page_cache.get(URL_A) == DETAIL_HTML
+
+    def test_cache_hit_skips_fetch(self, tmp_path):
+        scraper = self._scraper(tmp_path)
+        scraper.page_cache.put(URL_A, DETAIL_HTML)
+        with patch.object(scraper, "_get_page") as mock_get_page:
+            assert scraper.extract_info_hash(URL_A) == HASH
+        mock_get_page.assert_not_called()
+
+    def test_unparseable_page_is_not_cached(self, tmp_path):
+        scraper = self._scraper(tmp_path)
+        with patch.object(scraper, "_get_page", return_value="<html>nothing</html>"):
+            assert scraper.extract_info_hash(URL_A) is None
+        assert scraper.page_cache.get(URL_A) is None
@@ -0,0 +1,118 @@
+"""Tests for the on-demand sampling profiler (src/core/profiler.py)."""
+
+import threading
+import time
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+from src.bind import DaemonContext, check_profile_request
+from src.core import profiler
+from src.core.profiler import clamp_duration, sample_stacks, write_collapsed
+
+
+def _busy_wait_marker(stop):
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+class TestSampler:
+    def test_clamp_duration(self):
+        assert clamp_duration("10") == 10
+        assert clamp_duration(None) == profiler.DEFAULT_DURATION_S
+        assert clamp_duration("junk") == profiler.DEFAULT_DURATION_S
+        assert clamp_duration(10_000) == profiler.MAX_DURATION_S
+        assert clamp_duration(0) == 1
+
+    def test_samples_other_threads(self):
+        stop = threading.Event()
+        t = threading.Thread(target=_busy_wait_marker, args=(stop,), name="marker")
+        t.start()
+        try:
+            counts, sweeps = sample_stacks(0.1, interval_s=0.005)
+        finally:
+            stop.set()
+            t.join()
+        assert sweeps > 0
+        marker = [s for s in counts if "_busy_wait_marker" in s]
+        assert marker and marker[0].startswith("marker;")
+
+    def test_write_collapsed(self, tmp_path):
+        path = write_collapsed(Counter({"main;a.py:f": 3, "main;a.py:g": 1}), str(tmp_path), "t")
+        lines = open(path).read().splitlines()
+        assert lines == ["main;a.py:f 3", "main;a.py:g 1"]
+        assert path.endswith(".folded")
+
+    def test_only_one_profile_at_a_time(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(profiler, "_active_lock", threading.Lock())
+        release = threading.Event()
+        monkeypatch.setattr(
+            profiler, "sample_stacks", lambda d: (release.wait(5), (Counter(), 0))[1]
+        )
+
+        assert profiler.start_profile(1, str(tmp_path), "t") is True
+        assert profiler.start_profile(1, str(tmp_path), "t") is False
+        release.set()
+        deadline = time.monotonic() + 5
+        while profiler.is_profiling() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not profiler.is_profiling()
+
+
+class TestDaemonControlFile:
+    def _ctx(self, data_dir):
+        return DaemonContext(
+            data_dir=str(data_dir),
+            interval=60,
+            live_config=MagicMock(),
+            run_job=MagicMock(),
+            maybe_beat=MagicMock(),
+        )
+
+    def test_profile_file_starts_profile_and_is_consumed(self, tmp_path):
+        ctx = self._ctx(tmp_path)
+        (tmp_path / ".profile").write_text("12")
+        with patch("src.bind.start_profile", return_value=True) as start:
+            check_profile_request(ctx)
+        assert start.call_args[0][0] == 12
+        assert not (tmp_path / ".profile").exists()
+
+    def test_no_file_is_noop(self, tmp_path):
+        with patch("src.bind.start_profile") as start:
+            check_profile_request(self._ctx(tmp_path))
+        start.assert_not_called()
+
+
+class TestProfileRoute:
+    def _post(self, client, body):
+        with client.session_transaction() as sess:
+            sess["csrf_token"] = "t"
+        return client.post("/api/debug/profile", json=body, headers={"X-CSRF-Token": "t"})
+
+    def test_daemon_target_writes_control_file(self, client, monkeypatch, tmp_path):
+        monkeypatch.setattr("src.rss_server._data_dir", str(tmp_path))
+        resp = self._post(client, {"target": "daemon", "seconds": 5})
+        assert resp.status_code == 202
+        assert (tmp_path / ".profile").read_text() == "5"
+
+    def test_daemon_target_uses_control_socket(self, client, monkeypatch, tmp_path):
+        monkeypatch.setattr("src.rss_server._data_dir", str(tmp_path))
+        with patch(
+            "src.rss_server.control_request", return_value={"ok": True, "seconds": 5}
+        ) as request:
+            resp = self._post(client, {"target": "daemon", "seconds": 5})
+        assert resp.status_code == 202
+        assert request.call_args[0][1] == {"cmd": "profile", "seconds": 5}
+        assert not (tmp_path / ".profile").exists()
+
+    def test_daemon_target_busy(self, client):
+        with patch("src.rss_server.control_request", return_value={"ok": False, "error": "busy"}):
+            assert self._post(client, {"target": "daemon"}).status_code == 409
+
+    def test_server_target_starts_profile(self, client):
+        with patch("src.rss_server.start_profile", return_value=True) as start:
+            resp = self._post(client, {"seconds": 7})
+        assert resp.status_code == 202
+        assert start.call_args[0][0] == 7
+
+    def test_unknown_target_rejected(self, client):
+        assert self._post(client, {"target": "db"}).status_code == 400
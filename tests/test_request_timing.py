@@ -0,0 +1,64 @@
+"""Tests for per-request latency and SQL timing in rss_server."""
+
+import logging
+
+from src import rss_server
+from src.core.storage import start_query_tally
+from src.core.telemetry import RollingLatency
+
+
+class TestQueryTally:
+    def test_counts_store_calls(self, fresh_store):
+        tally = start_query_tally()
+        fresh_store.has_hash("a" * 40)
+        fresh_store.stats()
+        assert tally.count == 2
+        assert tally.seconds > 0
+
+    def test_new_tally_starts_at_zero(self, fresh_store):
+        start_query_tally()
+        fresh_store.has_hash("a" * 40)
+        assert start_query_tally().count == 0
+
+
+class TestRollingLatency:
+    def test_percentiles(self):
+        rl = RollingLatency()
+        for ms in range(1, 101):
+            rl.observe("GET /x", ms / 1000, sql_seconds=0.001, sql_count=2)
+        s = rl.summary()["GET /x"]
+        assert s["count"] == 100
+        assert s["p50_ms"] == 50.0
+        assert s["p95_ms"] == 95.0
+        assert s["max_ms"] == 100.0
+        assert s["store_calls_avg"] == 2.0
+
+    def test_window_keeps_recent_samples(self):
+        rl = RollingLatency(window=10)
+        for _ in range(20):
+            rl.observe("GET /x", 1.0)
+        for _ in range(10):
+            rl.observe("GET /x", 0.01)
+        assert rl.summary()["GET /x"]["max_ms"] == 10.0
+
+
+class TestMiddleware:
+    def test_server_timing_header(self, client):
+        resp = client.get("/health")
+        header = resp.headers["Server-Timing"]
+        assert header.startswith("db;dur=")
+        assert "app;dur=" in header
+        # /health reads stats() and the heartbeat: at least two store calls
+        assert '"0 store_calls"' not in header
+        assert "store_calls" in header
+
+    def test_metrics_reports_endpoint_percentiles(self, client):
+        client.get("/health")
+        data = client.get("/api/metrics").get_json()
+        assert data["endpoints"]["GET /health"]["count"] >= 1
+
+    def test_slow_request_is_logged(self, client, monkeypatch, caplog):
+        monkeypatch.setitem(rss_server.live_config.env_snapshot, "BIND_SLOW_REQUEST_MS", "0")
+        with caplog.at_level(logging.WARNING, logger="rss_server"):
+            client.get("/health")
+        assert any("Slow request" in r.message for r in caplog.records)
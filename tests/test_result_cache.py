@@ -0,0 +1,98 @@
+"""Tests for the result cache (src/core/result_cache.py) and its use in MagnetStore.search()."""
+
+from src.core.metadata import BookMetadata
+from src.core.result_cache import CACHE_LOOKUPS, ResultCache, approx_size
+from src.core.storage import MagnetStore
+
+HASH_A = "a" * 40
+HASH_B = "b" * 40
+
+
+class TestResultCache:
+    def test_lru_eviction_by_entries(self):
+        cache = ResultCache("test", max_entries=2, max_bytes=1 << 20)
+        assert cache.get(1, "a") is None
+        cache.put(1, "a", [1])
+        cache.put(1, "b", [2])
+        assert cache.get(1, "a") == [1]  # "b" is now least recently used
+        cache.put(1, "c", [3])
+        assert cache.get(1, "b") is None
+        assert (cache.get(1, "a"), cache.get(1, "c")) == ([1], [3])
+
+    def test_eviction_by_bytes(self):
+        big = ["x" * 1000]
+        cache = ResultCache("test", max_entries=100, max_bytes=approx_size(big) * 2 + 10)
+        cache.get(1, "a")
+        for key in "abc":
+            cache.put(1, key, big)
+        assert len(cache) == 2
+        assert cache.nbytes <= cache.max_bytes
+        cache.put(1, "huge", ["x" * 10_000])
+        assert cache.get(1, "huge") is None
+
+    def test_new_version_empties_cache(self):
+        cache = ResultCache("test", max_entries=10, max_bytes=1 << 20)
+        cache.put(1, "a", 1)  # no lookup at version 1 yet
+        assert cache.get(1, "a") is None
+        cache.put(1, "a", 1)
+        assert cache.get(1, "a") == 1
+        assert cache.get(2, "a") is None
+        cache.put(1, "stale", 1)  # computed before version 2 was seen
+        assert cache.get(2, "stale") is None
+        assert (len(cache), cache.nbytes) == (0, 0)
+
+
+class TestSearchCache:
+    def _lookups(self, result):
+        return CACHE_LOOKUPS.value(cache="search", result=result)
+
+    def test_repeated_search_is_a_hit(self, fresh_store):
+        fresh_store.add_magnet(HASH_A, "The Hobbit", "2024-01-01")
+        hits, misses = self._lookups("hit"), self._lookups("miss")
+
+        first = fresh_store.search("Hobbit")
+        assert fresh_store.search("hobbit") == first
+        assert fresh_store.search("Hobbit", page=2) == ([], 1)
+
+        assert self._lookups("hit") == hits + 1
+        assert self._lookups("miss") == misses + 2
+
+    def test_returned_rows_are_copies(self, fresh_store):
+        fresh_store.add_magnet(HASH_A, "The Hobbit", "2024-01-01")
+        fresh_store.search("Hobbit")[0][0]["title"] = "changed"
+        assert fresh_store.search("Hobbit")[0][0]["title"] == "The Hobbit"
+
+    def test_own_writes_invalidate(self, fresh_store):
+        fresh_store.add_magnet(HASH_A, "The Hobbit", "2024-01-01")
+        assert fresh_store.search("Hobbit")[1] == 1
+        fresh_store.add_magnet(HASH_B, "The Hobbit (Unabridged)", "2024-01-02")
+        assert fresh_store.search("Hobbit")[1] == 2
+
+    def test_other_process_writes_invalidate(self, fresh_store):
+        assert fresh_store.search("Hobbit")[1] == 0
+        daemon = MagnetStore(fresh_store.db_path)
+        daemon.add_magnet(HASH_A, "The Hobbit", "2024-01-01")
+        daemon.close()
+        assert fresh_store.search("Hobbit")[1] == 1
+
+    def test_metadata_change_invalidates(self, fresh_store):
+        fresh_store.add_magnet(HASH_A, "The Hobbit", "2024-01-01")
+        tolkien = {"author": "J.R.R. Tolkien"}
+        assert fresh_store.search("Hobbit", filters=tolkien)[1] == 0
+        fresh_store.set_metadata(HASH_A, BookMetadata(author="J.R.R. Tolkien"))
+        assert fresh_store.search("Hobbit", filters=tolkien)[1] == 1
+
+    def test_unrelated_writes_keep_hits(self, fresh_store):
+        fresh_store.add_magnet(HASH_A, "The Hobbit", "2024-01-01")
+        first = fresh_store.search("Hobbit")
+        hits = self._lookups("hit")
+
+        fresh_store.beat("idle", 60)
+        fresh_store.enqueue_books([{"link": "https://example.org/b/1", "title": "Emma"}])
+        daemon = MagnetStore(fresh_store.db_path)
+        daemon.beat("scraping", 60)
+        daemon.mark_queue_item("https://example.org/b/1", "failed")
+        daemon.close()
+
+        assert fresh_store.search("Hobbit") == first
+        assert self._lookups("hit") == hits + 1
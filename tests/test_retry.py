@@ -2,7 +2,8 @@
 
 from unittest.mock import MagicMock, patch
 
-from src.core.retry import RetryConfig, RetryEngine
+import pytest
+from src.core.retry import Deadline, DeadlineExceeded, RetryConfig, RetryEngine
 
 
 class TestRetryEngineSuccess:
@@ -214,6 +215,70 @@ class TestRetryEngineRealTransientExceptions:
         mock_sleep.assert_not_called()
 
 
+class TestRetryEngineDeadline:
+    def test_deadline_clamps_and_reports_remaining(self):
+        deadline = Deadline(10)
+        assert 9 < deadline.remaining() <= 10
+        assert deadline.clamp(30) <= 10
+        assert deadline.clamp(5) == 5
+        assert deadline.expired is False
+
+    def test_zero_budget_is_expired(self):
+        assert Deadline(0).expired is True
+
+    def test_clamp_never_returns_a_tiny_timeout(self):
+        deadline = Deadline(0.5)
+        assert deadline.expired is True
+        with pytest.raises(DeadlineExceeded):
+            deadline.clamp(30)
+
+    def test_budget_spent_inside_attempt_escalates(self):
+        deadline = Deadline(10)
+        fn = MagicMock(side_effect=lambda: deadline.clamp(30))
+        with patch.object(deadline, "remaining", side_effect=[10.0, 0.01]):
+            result = RetryEngine().execute(fn, RetryConfig(), "test", deadline=deadline)
+        assert result is None
+        fn.assert_called_once()
+
+    def test_no_attempt_when_budget_spent(self):
+        fn = MagicMock(return_value="ok")
+        result = RetryEngine().execute(fn, RetryConfig(), "test", deadline=Deadline(0))
+        assert result is None
+        fn.assert_not_called()
+
+    def test_backoff_longer_than_budget_fails_fast(self):
+        fn = MagicMock(side_effect=_make_exc(503))
+        config = RetryConfig(max_attempts=3, base_delay=100, max_delay=100)
+        with (
+            patch("src.core.retry.random.uniform", return_value=50.0),
+            patch("time.sleep") as mock_sleep,
+        ):
+            result = RetryEngine().execute(fn, config, "test", deadline=Deadline(10))
+        assert result is None
+        fn.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_backoff_within_budget_sleeps(self):
+        fn = MagicMock(side_effect=[_make_exc(503), "ok"])
+        config = RetryConfig(max_attempts=3, base_delay=1)
+        with (
+            patch("src.core.retry.random.uniform", return_value=0.5),
+            patch("time.sleep") as mock_sleep,
+        ):
+            result = RetryEngine().execute(fn, config, "test", deadline=Deadline(60))
+        assert result == "ok"
+        mock_sleep.assert_called_once_with(0.5)
+
+    def test_retry_after_is_capped_at_max_delay(self):
+        exc = _make_exc(429)
+        exc.response.headers.get = MagicMock(return_value="3600")
+        fn = MagicMock(side_effect=[exc, "ok"])
+        config = RetryConfig(max_attempts=2, max_delay=60)
+        with patch("time.sleep") as mock_sleep:
+            RetryEngine().execute(fn, config, "test")
+        mock_sleep.assert_called_once_with(60)
+
+
 def _make_exc(status: int) -> Exception:
     """Build a minimal exception with a .response.status_code attribute."""
     exc = Exception(f"HTTP {status}")
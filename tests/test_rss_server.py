@@ -2,6 +2,7 @@
 
 import os
 import pathlib
+import threading
 
 from src.rss_server import _date_to_rfc2822, _resolve_secret_key
 
@@ -98,6 +99,23 @@ class TestMagnetsEndpoint:
         assert "Book One" in titles
         assert "Book Two" in titles
 
+    def test_magnets_collapse_groups_releases(self, client, fresh_store):
+        fresh_store.add_magnet(HASH_A, "Dune [64kbps MP3]", "2024-01-01")
+        fresh_store.add_magnet(HASH_B, "Dune (M4B)", "2024-01-02")
+        data = client.get("/api/magnets?q=Dune&collapse=1").get_json()
+        assert data["collapsed"] is True
+        assert data["total_count"] == 1
+        assert data["magnets"][0]["hash"] == HASH_B
+        assert data["magnets"][0]["releases"] == 2
+
+    def test_magnet_releases(self, client, fresh_store):
+        fresh_store.add_magnet(HASH_A, "Dune [64kbps MP3]", "2024-01-01")
+        fresh_store.add_magnet(HASH_B, "Dune (M4B)", "2024-01-02")
+        data = client.get(f"/api/magnets/{HASH_A}/releases").get_json()
+        assert [r["hash"] for r in data["releases"]] == [HASH_B, HASH_A]
+        assert data["releases"][0]["magnet"].startswith("magnet:?xt=urn:btih:")
+        assert client.get(f"/api/magnets/{'c' * 40}/releases").status_code == 404
+
 
 class TestNotFoundHandling:
     def test_unknown_route_serves_spa(self, client):
@@ -1051,3 +1069,104 @@ class TestHealthIsDbOnly:
             resp = client.get("/api/stats")
         assert resp.status_code == 200
         assert resp.get_json()["target_probe"] == "reachable"
+
+
+class TestScrapeControlRoutes:
+    """Trigger/progress/cancel over the daemon control socket (mocked)."""
+
+    def _csrf(self, client):
+        with client.session_transaction() as sess:
+            sess["csrf_token"] = "test-token"
+        return {"X-CSRF-Token": "test-token"}
+
+    def test_trigger_uses_socket_and_returns_job_id(self, client, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.rss_server._data_dir", str(tmp_path))
+        monkeypatch.setattr(
+            "src.rss_server.control_request", lambda path, req: {"ok": True, "job_id": "abc"}
+        )
+        resp = client.post("/api/trigger-scrape", headers=self._csrf(client))
+        assert resp.status_code == 200
+        assert resp.get_json()["job_id"] == "abc"
+        assert not (tmp_path / ".trigger").exists()
+
+    def test_trigger_409_when_daemon_busy(self, client, monkeypatch):
+        monkeypatch.setattr(
+            "src.rss_server.control_request",
+            lambda path, req: {"ok": False, "job_id": "abc", "error": "busy"},
+        )
+        resp = client.post("/api/trigger-scrape", headers=self._csrf(client))
+        assert resp.status_code == 409
+        assert resp.get_json()["job_id"] == "abc"
+
+    def test_progress_unavailable_without_daemon(self, client, monkeypatch):
+        monkeypatch.setattr("src.rss_server.control_request", lambda path, req: None)
+        resp = client.get("/api/scrape/progress?since=4")
+        assert resp.get_json() == {"available": False, "job": None, "events": [], "last": 4}
+
+    def test_progress_relays_job_and_events(self, client, monkeypatch):
+        replies = {
+            "progress": {"ok": True, "job": {"job_id": "abc", "items_done": 2}},
+            "events": {"ok": True, "events": [{"seq": 5, "type": "progress"}], "last": 5},
+        }
+        monkeypatch.setattr("src.rss_server.control_request", lambda path, req: replies[req["cmd"]])
+        data = client.get("/api/scrape/progress").get_json()
+        assert data["available"] is True
+        assert data["job"]["items_done"] == 2 and data["last"] == 5
+
+    def test_cancel(self, client, monkeypatch):
+        monkeypatch.setattr("src.rss_server.control_request", lambda path, req: None)
+        assert client.post("/api/scrape/cancel", headers=self._csrf(client)).status_code == 503
+        monkeypatch.setattr(
+            "src.rss_server.control_request", lambda path, req: {"ok": False, "error": "no job"}
+        )
+        assert client.post("/api/scrape/cancel", headers=self._csrf(client)).status_code == 409
+        monkeypatch.setattr(
+            "src.rss_server.control_request", lambda path, req: {"ok": True, "job_id": "abc"}
+        )
+        resp = client.post("/api/scrape/cancel", headers=self._csrf(client))
+        assert resp.get_json()["job_id"] == "abc"
+
+
+class TestMagnetsSinceRoute:
+    def test_returns_delta_after_seq(self, client, fresh_store):
+        fresh_store.add_magnet(HASH_A, "Book A", "2026-01-01")
+        fresh_store.add_magnet(HASH_B, "Book B", "2026-01-01")
+        data = client.get("/api/magnets/since?seq=1").get_json()
+        assert [c["info_hash"] for c in data["changes"]] == [HASH_B]
+        assert data["next_seq"] == data["latest_seq"] == 2
+        assert data["has_more"] is False
+
+    def test_gzip_when_accepted(self, client, fresh_store):
+        import gzip
+        import json
+
+        fresh_store.add_magnet(HASH_A, "Book A", "2026-01-01")
+        resp = client.get("/api/magnets/since", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["Vary"]
+        data = json.loads(gzip.decompress(resp.get_data()))
+        assert data["changes"][0]["title"] == "Book A"
+
+    def test_bad_params_400(self, client):
+        assert client.get("/api/magnets/since?seq=abc").status_code == 400
+
+
+class TestConcurrentRequests:
+    def test_request_threads_share_the_store(self, client, fresh_store):
+        for i in range(20):
+            fresh_store.add_magnet(f"{i:040x}", f"Book {i}", "2024-01-01")
+        statuses = []
+
+        def work():
+            for _ in range(10):
+                for url in ("/api/magnets?q=Book", "/api/suggest?q=bo", "/api/stats"):
+                    statuses.append(client.get(url).status_code)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        fresh_store.add_magnet("f" * 40, "Book 20", "2024-01-02")
+        for t in threads:
+            t.join()
+        assert statuses == [200] * 120
+        assert len(client.get("/api/magnets?q=Book").get_json()["magnets"]) == 21
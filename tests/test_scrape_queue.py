@@ -0,0 +1,170 @@
+"""Tests for the persisted scrape work queue (scrape_queue table)."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from src.bind import run_job
+from src.core.metadata import BookMetadata
+from src.core.scraper import DetailResult
+from src.core.storage import MagnetStore, _open
+
+BOOK_A = {"title": "Book A", "link": "/audio-books/a/"}
+BOOK_B = {"title": "Book B", "link": "/audio-books/b/"}
+HASH_A = "aa" * 20
+HASH_B = "bb" * 20
+
+
+def _states(store):
+    rows = store._conn.execute("SELECT link, state FROM scrape_queue").fetchall()
+    return {r[0]: r[1] for r in rows}
+
+
+def _scraper(books, results):
+    scraper = MagicMock()
+    scraper.get_recent_books.return_value = books
+    scraper.extract_details.side_effect = results
+    return scraper
+
+
+def _tracker_manager():
+    tm = MagicMock()
+    tm.get_trackers.return_value = []
+    return tm
+
+
+class TestQueueStore:
+    def test_enqueue_adds_pending_items(self, fresh_store):
+        assert fresh_store.enqueue_books([BOOK_A, BOOK_B]) == 2
+        assert [i["link"] for i in fresh_store.queued_items()] == [BOOK_A["link"], BOOK_B["link"]]
+
+    def test_enqueue_is_idempotent(self, fresh_store):
+        fresh_store.enqueue_books([BOOK_A])
+        assert fresh_store.enqueue_books([BOOK_A]) == 0
+        assert len(fresh_store.queued_items()) == 1
+
+    def test_saved_item_is_not_requeued(self, fresh_store):
+        fresh_store.enqueue_books([BOOK_A])
+        fresh_store.mark_queue_item(BOOK_A["link"], "saved", HASH_A)
+        fresh_store.enqueue_books([BOOK_A])
+        assert fresh_store.queued_items() == []
+
+    def test_failed_item_is_requeued(self, fresh_store):
+        fresh_store.enqueue_books([BOOK_A])
+        fresh_store.mark_queue_item(BOOK_A["link"], "failed")
+        fresh_store.enqueue_books([BOOK_A])
+        assert _states(fresh_store)[BOOK_A["link"]] == "pending"
+
+    def test_mark_keeps_known_hash(self, fresh_store):
+        fresh_store.enqueue_books([BOOK_A])
+        fresh_store.mark_queue_item(BOOK_A["link"], "fetched", HASH_A)
+        fresh_store.mark_queue_item(BOOK_A["link"], "saved")
+        row = fresh_store._conn.execute("SELECT info_hash FROM scrape_queue").fetchone()
+        assert row[0] == HASH_A
+
+    def test_old_finished_rows_are_pruned(self, fresh_store):
+        fresh_store.enqueue_books([BOOK_A])
+        fresh_store.mark_queue_item(BOOK_A["link"], "saved")
+        old = (datetime.now(timezone.utc) - timedelta(days=31)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        fresh_store._conn.execute("UPDATE scrape_queue SET updated_at = ?", (old,))
+        fresh_store.enqueue_books([BOOK_B])
+        assert BOOK_A["link"] not in _states(fresh_store)
+
+    def test_upgrade_adds_metadata_column(self, tmp_path):
+        db = str(tmp_path / "old.db")
+        conn = _open(db)
+        conn.execute(
+            "CREATE TABLE scrape_queue (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " link TEXT NOT NULL UNIQUE, title TEXT NOT NULL, state TEXT NOT NULL"
+            " DEFAULT 'pending', info_hash TEXT DEFAULT NULL, enqueued_at TEXT NOT NULL,"
+            " updated_at TEXT NOT NULL)"
+        )
+        conn.close()
+        store = MagnetStore(db)
+        store.enqueue_books([BOOK_A])
+        store.mark_queue_item(BOOK_A["link"], "fetched", HASH_A, BookMetadata(author="X"))
+        assert store.queued_items()[0]["metadata"] == BookMetadata(author="X")
+        store.close()
+
+    def test_queue_counts(self, fresh_store):
+        fresh_store.enqueue_books([BOOK_A, BOOK_B])
+        fresh_store.mark_queue_item(BOOK_A["link"], "saved")
+        counts = fresh_store.queue_counts()
+        assert counts == {"pending": 1, "fetched": 0, "saved": 1, "failed": 0}
+
+
+class TestRunJobResume:
+    def test_items_end_in_saved_state(self, fresh_store):
+        scraper = _scraper([BOOK_A, BOOK_B], [DetailResult(HASH_A), DetailResult(HASH_B)])
+        run_job("/tmp", scraper, fresh_store, _tracker_manager())
+        assert set(_states(fresh_store).values()) == {"saved"}
+
+    def test_rss_item_is_not_reprocessed(self, fresh_store):
+        run_job("/tmp", _scraper([BOOK_A], [DetailResult(HASH_A)]), fresh_store, _tracker_manager())
+        scraper = _scraper([BOOK_A], [])
+        run_job("/tmp", scraper, fresh_store, _tracker_manager())
+        scraper.extract_details.assert_not_called()
+
+    def test_pending_items_from_interrupted_run_are_resumed(self, fresh_store):
+        # A previous run queued B but died before processing it; B has since
+        # dropped off the RSS feed.
+        fresh_store.enqueue_books([BOOK_B])
+        scraper = _scraper([BOOK_A], [DetailResult(HASH_B), DetailResult(HASH_A)])
+        assert run_job("/tmp", scraper, fresh_store, _tracker_manager()) == 2
+        assert fresh_store.has_hash(HASH_A) and fresh_store.has_hash(HASH_B)
+
+    def test_fetched_item_is_saved_without_refetch(self, fresh_store):
+        fresh_store.enqueue_books([BOOK_A])
+        fresh_store.mark_queue_item(BOOK_A["link"], "fetched", HASH_A)
+        scraper = _scraper([], [])
+        run_job("/tmp", scraper, fresh_store, _tracker_manager())
+        scraper.extract_details.assert_not_called()
+        assert fresh_store.has_hash(HASH_A)
+
+    def test_failed_save_stays_fetched(self, fresh_store):
+        scraper = _scraper([BOOK_A], [DetailResult(HASH_A)])
+        with patch.object(fresh_store, "add_magnet", side_effect=Exception("db error")):
+            run_job("/tmp", scraper, fresh_store, _tracker_manager())
+        assert _states(fresh_store)[BOOK_A["link"]] == "fetched"
+
+    def test_extraction_failure_marks_failed(self, fresh_store):
+        scraper = _scraper([BOOK_A], [DetailResult(None, "parse_failed")])
+        run_job("/tmp", scraper, fresh_store, _tracker_manager())
+        assert _states(fresh_store)[BOOK_A["link"]] == "failed"
+
+    def test_circuit_open_stays_pending(self, fresh_store):
+        scraper = _scraper([BOOK_A], [DetailResult(None, "circuit_open")])
+        run_job("/tmp", scraper, fresh_store, _tracker_manager())
+        assert _states(fresh_store)[BOOK_A["link"]] == "pending"
+
+    def test_backoff_deferred_item_stays_pending(self, fresh_store):
+        fresh_store.record_fetch_failure(BOOK_A["link"], "fetch_failed")
+        scraper = _scraper([BOOK_A], [])
+        run_job("/tmp", scraper, fresh_store, _tracker_manager())
+        scraper.extract_details.assert_not_called()
+        assert _states(fresh_store)[BOOK_A["link"]] == "pending"
+
+    def test_metadata_saved_with_magnet(self, fresh_store):
+        meta = BookMetadata(author="Jane Doe", format="MP3")
+        scraper = _scraper([BOOK_A], [DetailResult(HASH_A, metadata=meta)])
+        run_job("/tmp", scraper, fresh_store, _tracker_manager())
+        assert fresh_store.metadata_of(HASH_A) == meta
+
+    def test_resumed_fetched_item_keeps_metadata(self, fresh_store):
+        meta = BookMetadata(author="Jane Doe", bitrate_kbps=64)
+        scraper = _scraper([BOOK_A], [DetailResult(HASH_A, metadata=meta)])
+        with patch.object(fresh_store, "add_magnet", side_effect=Exception("db error")):
+            run_job("/tmp", scraper, fresh_store, _tracker_manager())
+        assert fresh_store.queued_items()[0]["metadata"] == meta
+
+        scraper = _scraper([], [])
+        run_job("/tmp", scraper, fresh_store, _tracker_manager())
+        scraper.extract_details.assert_not_called()
+        assert fresh_store.metadata_of(HASH_A) == meta
+        row = fresh_store._conn.execute("SELECT state, metadata FROM scrape_queue").fetchone()
+        assert tuple(row) == ("saved", None)
+
+
+def test_metrics_reports_queue_counts(client, fresh_store):
+    fresh_store.enqueue_books([BOOK_A])
+    data = client.get("/api/metrics").get_json()
+    assert data["queue"]["pending"] == 1
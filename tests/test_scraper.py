@@ -136,7 +136,9 @@ class TestExtractInfoHashNetwork:
             return_value="<html><body><table><tr><td>Info Hash:</td><td>abc123def456789012345678901234567890abcd</td></tr></table></body></html>",
         ) as mock_get_page:
             result = scraper.extract_info_hash("/audio-books/test/")
-            mock_get_page.assert_called_once_with("http://audiobookbay.lu/audio-books/test/")
+            mock_get_page.assert_called_once_with(
+                "http://audiobookbay.lu/audio-books/test/", cancel=None
+            )
             assert result == "abc123def456789012345678901234567890abcd"
 
     def test_returns_none_when_page_fetch_fails(self):
@@ -0,0 +1,105 @@
+"""Tests for per-stage scrape pipeline timing (src/core/stage_timer.py)."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from src.bind import run_job
+from src.core.retry import RetryConfig, RetryEngine
+from src.core.scraper import BindScraper, DetailResult
+from src.core.stage_timer import StageRecorder, percentile, recording, timed
+
+HASH_A = "aa" * 20
+
+
+def _tracker_manager():
+    tm = MagicMock()
+    tm.get_trackers.return_value = []
+    return tm
+
+
+class TestStageRecorder:
+    def test_percentile_nearest_rank(self):
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile([], 50) == 0.0
+
+    def test_summary(self):
+        rec = StageRecorder()
+        for v in (0.1, 0.2, 0.3, 0.4):
+            rec.add("parse", v)
+        s = rec.summary()["parse"]
+        assert s["count"] == 4
+        assert s["total_s"] == 1.0
+        assert s["p50_s"] == 0.2
+        assert s["max_s"] == 0.4
+
+    def test_timed_is_noop_without_recorder(self):
+        with timed("parse"):
+            pass  # must not raise
+
+    def test_timed_records_into_active_recorder(self):
+        rec = StageRecorder()
+        with recording(rec), timed("parse"):
+            pass
+        assert rec.summary()["parse"]["count"] == 1
+
+    def test_recorder_is_not_visible_to_other_threads(self):
+        rec = StageRecorder()
+
+        def _other():
+            with timed("other"):
+                pass
+
+        with recording(rec):
+            t = threading.Thread(target=_other)
+            t.start()
+            t.join()
+        assert "other" not in rec.summary()
+
+
+class TestPipelineStages:
+    def test_run_job_records_stages(self, fresh_store):
+        scraper = MagicMock()
+        scraper.get_recent_books.return_value = [{"title": "Book", "link": "/b/"}]
+        scraper.extract_details.return_value = DetailResult(HASH_A)
+        rec = StageRecorder()
+
+        run_job("/tmp", scraper, fresh_store, _tracker_manager(), stages=rec)
+
+        assert {"rss_fetch", "detail_page", "dedupe_check", "db_write"} <= set(rec.summary())
+
+    def test_scraper_records_jitter_and_parse(self):
+        egress = MagicMock()
+        egress.fetch.return_value = f"<table><tr><td>Info Hash:</td><td>{HASH_A}</td></tr></table>"
+        rec = StageRecorder()
+        with patch("src.core.scraper.random.uniform", return_value=0), recording(rec):
+            BindScraper(egress_manager=egress).extract_details("http://example.com/b/")
+        assert {"jitter_sleep", "parse"} <= set(rec.summary())
+
+    def test_retry_backoff_is_recorded(self):
+        exc = Exception("HTTP 503")
+        exc.response = MagicMock(status_code=503)
+        fn = MagicMock(side_effect=[exc, "ok"])
+        rec = StageRecorder()
+        with patch("time.sleep"), recording(rec):
+            RetryEngine().execute(fn, RetryConfig(base_delay=0), "test")
+        assert rec.summary()["retry_backoff"]["count"] == 1
+
+
+class TestRunStagesStorage:
+    def test_round_trip(self, fresh_store):
+        run_id = fresh_store.record_scrape_run("success", 1, 2.0)
+        rec = StageRecorder()
+        rec.add("parse", 0.5)
+        fresh_store.record_run_stages(run_id, rec.summary())
+        assert fresh_store.run_stages([run_id])[run_id]["parse"]["count"] == 1
+
+    def test_metrics_include_stages(self, client, fresh_store):
+        run_id = fresh_store.record_scrape_run("success", 1, 2.0)
+        fresh_store.record_run_stages(
+            run_id,
+            {"parse": {"count": 2, "total_s": 1.0, "p50_s": 0.4, "p95_s": 0.6, "max_s": 0.6}},
+        )
+        data = client.get("/api/metrics").get_json()
+        assert data["runs"][0]["stages"]["parse"]["p95_s"] == 0.6
@@ -1,9 +1,13 @@
 """Tests for MagnetStore (src/core/storage.py)."""
 
+import hashlib
+import sqlite3
+import threading
 from datetime import datetime, timezone
 
 import pytest
-from src.core.storage import MagnetStore, _open, _upgrade_schema
+from src.core.storage import _SCHEMA_DDL, MagnetStore, _open, _upgrade_schema
+from src.core.titles import normalize_title
 
 HASH_A = "a" * 40
 HASH_B = "b" * 40
@@ -177,14 +181,14 @@ class TestProbe:
 
 
 class TestUpgradeSchema:
-    def _make_old_db(self, path: str) -> None:
-        """Create a DB with the pre-timeout scrape_runs schema."""
+    def _make_old_db(self, path: str, results: str = "'success', 'failure', 'empty'") -> None:
+        """Create a DB with the pre-timeout (or another older) scrape_runs schema."""
         conn = _open(path)
         conn.execute(
-            """CREATE TABLE IF NOT EXISTS scrape_runs (
+            f"""CREATE TABLE IF NOT EXISTS scrape_runs (
                 id         INTEGER PRIMARY KEY AUTOINCREMENT,
                 run_at     TEXT NOT NULL,
-                result     TEXT NOT NULL CHECK(result IN ('success', 'failure', 'empty')),
+                result     TEXT NOT NULL CHECK(result IN ({results})),
                 items_new  INTEGER NOT NULL DEFAULT 0,
                 duration_s REAL    NOT NULL DEFAULT 0.0
             )"""
@@ -209,6 +213,19 @@ class TestUpgradeSchema:
         assert [r[0] for r in rows] == ["success", "timeout"]
         conn.close()
 
+    def test_upgrade_adds_cancelled_to_timeout_schema(self, tmp_path):
+        db = str(tmp_path / "old.db")
+        self._make_old_db(db, "'success', 'failure', 'empty', 'timeout'")
+        conn = _open(db)
+        _upgrade_schema(conn)
+        conn.execute(
+            "INSERT INTO scrape_runs (run_at, result, items_new, duration_s)"
+            " VALUES ('2024-01-02T00:00:00', 'cancelled', 1, 4.0)"
+        )
+        rows = conn.execute("SELECT result FROM scrape_runs ORDER BY id").fetchall()
+        assert [r[0] for r in rows] == ["success", "cancelled"]
+        conn.close()
+
     def test_upgrade_preserves_existing_rows(self, tmp_path):
         db = str(tmp_path / "old.db")
         self._make_old_db(db)
@@ -270,3 +287,287 @@ class TestDailyCounts:
     def test_days_param_controls_window_size(self, fresh_store):
         assert len(fresh_store.daily_counts(days=14)) == 14
         assert len(fresh_store.daily_counts(days=1)) == 1
+
+
+class TestChangeLog:
+    def test_inserts_are_upserts_in_order(self, fresh_store):
+        fresh_store.add_magnet("a" * 40, "Book A", "2026-01-01")
+        fresh_store.insert_many([("b" * 40, "Book B", "2026-01-02", None)])
+        changes, next_seq, has_more = fresh_store.changes_since(0)
+        assert [(c["op"], c["title"]) for c in changes] == [
+            ("upsert", "Book A"),
+            ("upsert", "Book B"),
+        ]
+        assert next_seq == fresh_store.latest_change_seq() == 2
+        assert has_more is False
+        assert fresh_store.changes_since(next_seq) == ([], next_seq, False)
+
+    def test_update_and_delete(self, fresh_store):
+        fresh_store.add_magnet("a" * 40, "Book A", "2026-01-01")
+        fresh_store.add_magnet("b" * 40, "Book B", "2026-01-01")
+        _, seq, _ = fresh_store.changes_since(0)
+        fresh_store._conn.execute("UPDATE magnets SET title = 'Book A (fixed)' WHERE id = 1")
+        fresh_store._conn.execute("DELETE FROM magnets WHERE id = 2")
+
+        changes, _, _ = fresh_store.changes_since(seq)
+        assert [(c["op"], c["info_hash"]) for c in changes] == [
+            ("upsert", "a" * 40),
+            ("delete", "b" * 40),
+        ]
+        assert changes[0]["title"] == "Book A (fixed)"
+
+    def test_changes_within_a_page_collapse(self, fresh_store):
+        fresh_store.add_magnet("a" * 40, "Book A", "2026-01-01")
+        fresh_store._conn.execute("DELETE FROM magnets WHERE id = 1")
+        changes, next_seq, _ = fresh_store.changes_since(0)
+        assert [c["op"] for c in changes] == ["delete"]
+        assert next_seq == 2
+
+    def test_paging(self, fresh_store):
+        for i in range(5):
+            fresh_store.add_magnet(f"{i:040d}", f"Book {i}", "2026-01-01")
+        page, seq, has_more = fresh_store.changes_since(0, limit=2)
+        assert len(page) == 2 and seq == 2 and has_more
+        page, seq, has_more = fresh_store.changes_since(seq, limit=3)
+        assert len(page) == 3 and seq == 5 and not has_more
+
+    def test_existing_archive_is_seeded(self, tmp_path):
+        db = str(tmp_path / "old.db")
+        conn = _open(db)
+        for stmt in _SCHEMA_DDL:
+            conn.execute(stmt)
+        conn.execute(
+            "INSERT INTO magnets (info_hash, title, collected_date, collected_at)"
+            " VALUES (?, 'Old', '2020-01-01', '2020-01-01T00:00:00.000Z')",
+            ("c" * 40,),
+        )
+        conn.close()
+
+        store = MagnetStore(db)
+        changes, _, _ = store.changes_since(0)
+        assert [c["info_hash"] for c in changes] == ["c" * 40]
+        store.close()
+        assert MagnetStore(db).latest_change_seq() == 1  # seeded once only
+
+
+class TestBlobHashStorage:
+    @pytest.fixture
+    def blob_store(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BIND_HASH_STORAGE", "blob")
+        s = MagnetStore(str(tmp_path / "blob.db"))
+        yield s
+        s.close()
+
+    def test_stores_20_byte_blobs_and_reads_back_hex(self, blob_store):
+        blob_store.add_magnet(HASH_A.upper(), "Title A", "2024-01-01")
+        blob_store.insert_many([(HASH_B, "Title B", "2024-01-02", None)])
+
+        rows = blob_store._conn.execute(
+            "SELECT DISTINCT typeof(info_hash), length(info_hash) FROM magnets"
+        ).fetchall()
+        assert [tuple(r) for r in rows] == [("blob", 20)]
+        assert blob_store.has_hash(HASH_A) and blob_store.has_hash(HASH_B.upper())
+        assert not blob_store.has_hash("not-a-hash")
+        assert blob_store.add_magnet(HASH_A, "Again", "2024-01-03") is False
+        assert [r["info_hash"] for r in blob_store.recent()] == [HASH_B, HASH_A]
+        assert blob_store.search("Title B")[0][0]["info_hash"] == HASH_B
+        assert [r["info_hash"] for r in blob_store.magnets_after(0)] == [HASH_A, HASH_B]
+        changes, _, _ = blob_store.changes_since(0)
+        assert [c["info_hash"] for c in changes] == [HASH_A, HASH_B]
+
+    def test_rejects_text_hash_from_stale_writer(self, blob_store):
+        with pytest.raises(sqlite3.IntegrityError):
+            blob_store._conn.execute(
+                "INSERT INTO magnets (info_hash, title, collected_date, collected_at)"
+                " VALUES (?, 'T', '2024-01-01', '2024-01-01T00:00:00Z')",
+                (HASH_C,),
+            )
+
+    def test_running_store_follows_conversion_by_another_process(self, tmp_path, monkeypatch):
+        db = str(tmp_path / "bind.db")
+        server = MagnetStore(db)
+        server.add_magnet(HASH_A, "Title A", "2024-01-01")
+        assert server.has_hash(HASH_A)  # hash filter built in text mode
+
+        monkeypatch.setenv("BIND_HASH_STORAGE", "blob")
+        MagnetStore(db).close()  # e.g. the daemon restarted with the new setting
+
+        assert [r["info_hash"] for r in server.recent()] == [HASH_A]
+        assert server.add_magnet(HASH_B, "Title B", "2024-01-02") is True
+        server.insert_many([(HASH_C, "Title C", "2024-01-03", None)])
+        assert server.has_hash(HASH_B) and server.has_hash(HASH_C.upper())
+        assert server.search("Title")[1] == 3
+        rows = server._conn.execute("SELECT DISTINCT typeof(info_hash) FROM magnets").fetchall()
+        assert [r[0] for r in rows] == ["blob"]
+        server.close()
+
+    def test_converts_existing_database_both_ways(self, tmp_path, monkeypatch):
+        db = str(tmp_path / "bind.db")
+        s = MagnetStore(db)
+        s.add_magnet(HASH_A, "Title A", "2024-01-01")
+        s.add_magnet(HASH_B, "Title B", "2024-01-02")
+        s._conn.execute("DELETE FROM magnets WHERE info_hash = ?", (HASH_B,))
+        before = s.changes_since(0)
+        s.close()
+
+        for mode in ("blob", "text"):
+            monkeypatch.setenv("BIND_HASH_STORAGE", mode)
+            s = MagnetStore(db)
+            # The rewrite is not published as a change to every magnet.
+            assert s.changes_since(0) == before
+            assert s.has_hash(HASH_A) and s.search("Title A")[1] == 1
+            s.close()
+        monkeypatch.delenv("BIND_HASH_STORAGE")
+        s = MagnetStore(db)
+        assert s._conn.execute("SELECT typeof(info_hash) FROM magnets").fetchone()[0] == "text"
+        s.close()
+
+    def test_database_keeps_its_format_without_env(self, blob_store, monkeypatch):
+        monkeypatch.delenv("BIND_HASH_STORAGE")
+        s = MagnetStore(blob_store.db_path)
+        s.add_magnet(HASH_C, "Title C", "2024-01-01")
+        assert s.has_hash(HASH_C)
+        s.close()
+
+    def test_invalid_stored_hashes_keep_text(self, tmp_path, monkeypatch):
+        db = str(tmp_path / "bind.db")
+        s = MagnetStore(db)
+        s.add_magnet("abc", "Short hash", "2024-01-01")
+        s.close()
+        monkeypatch.setenv("BIND_HASH_STORAGE", "blob")
+        s = MagnetStore(db)
+        assert s.has_hash("abc")
+        s.close()
+
+
+class TestNormalizeTitle:
+    @pytest.mark.parametrize(
+        "title",
+        [
+            "Dune - Frank Herbert [64kbps MP3] (Unabridged)",
+            "Dune - Frank Herbert (M4B, 128 kbps)",
+            "DUNE: Frank Herbert - Audiobook 1.2 GB",
+            "Düne – Frank Herbert",
+        ],
+    )
+    def test_release_tags_dropped(self, title):
+        assert normalize_title(title) == "dune frank herbert"
+
+    def test_keeps_series_numbers(self):
+        assert normalize_title("Expanse Book 1 [MP3]") != normalize_title("Expanse Book 2 [MP3]")
+
+    def test_tags_only_title_falls_back(self):
+        assert normalize_title("MP3") == "mp3"
+
+
+class TestReleaseGroups:
+    def _groups(self, store):
+        rows = store._conn.execute(
+            "SELECT title_norm, releases, latest_id FROM release_groups ORDER BY title_norm"
+        ).fetchall()
+        return [tuple(r) for r in rows]
+
+    def test_groups_maintained_on_insert_and_delete(self, fresh_store):
+        fresh_store.add_magnet(HASH_A, "Dune [MP3]", "2024-01-01")
+        fresh_store.insert_many([(HASH_B, "Dune (M4B)", "2024-01-02", None)])
+        fresh_store.add_magnet(HASH_C, "Emma", "2024-01-03")
+        assert self._groups(fresh_store) == [("dune", 2, 2), ("emma", 1, 3)]
+
+        fresh_store._conn.execute("DELETE FROM magnets WHERE id = 2")
+        fresh_store._conn.execute("DELETE FROM magnets WHERE id = 3")
+        assert self._groups(fresh_store) == [("dune", 1, 1)]
+
+    def test_collapsed_search(self, fresh_store):
+        fresh_store.add_magnet(HASH_A, "Dune [MP3]", "2024-01-01")
+        fresh_store.add_magnet(HASH_B, "Dune (M4B)", "2024-01-02")
+        fresh_store.add_magnet(HASH_C, "Dune Messiah", "2024-01-03")
+
+        rows, total = fresh_store.search(None, collapse=True)
+        assert total == 2
+        assert [(r["info_hash"], r["releases"]) for r in rows] == [(HASH_C, 1), (HASH_B, 2)]
+        rows, total = fresh_store.search("Dune", collapse=True)
+        assert total == 2
+        rows, total = fresh_store.search("Du", collapse=True)
+        assert total == 2
+        assert fresh_store.search("Dune")[1] == 3
+
+    def test_releases_of(self, fresh_store):
+        fresh_store.add_magnet(HASH_A, "Dune [MP3]", "2024-01-01")
+        fresh_store.add_magnet(HASH_B, "Dune (M4B)", "2024-01-02")
+        releases = fresh_store.releases_of(HASH_A.upper())
+        assert [r["info_hash"] for r in releases] == [HASH_B, HASH_A]
+        assert fresh_store.releases_of(HASH_C) is None
+
+    def test_backfills_rows_without_title_norm(self, tmp_path):
+        db = str(tmp_path / "bind.db")
+        s = MagnetStore(db)
+        s._conn.execute(
+            "INSERT INTO magnets (info_hash, title, collected_date, collected_at)"
+            " VALUES (?, 'Dune [MP3]', '2024-01-01', '2024-01-01T00:00:00Z')",
+            (HASH_A,),
+        )
+        seq = s.latest_change_seq()
+        s.close()
+
+        s = MagnetStore(db)
+        assert self._groups(s) == [("dune", 1, 1)]
+        assert s.latest_change_seq() == seq  # not published as a change
+        assert s.search("Dune")[1] == 1
+        s.close()
+
+    def test_upgrade_adds_column_to_old_database(self, tmp_path):
+        db = str(tmp_path / "old.db")
+        conn = _open(db)
+        conn.execute(
+            "CREATE TABLE magnets (id INTEGER PRIMARY KEY, info_hash TEXT NOT NULL,"
+            " title TEXT NOT NULL, collected_date TEXT NOT NULL, collected_at TEXT NOT NULL,"
+            " source TEXT DEFAULT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO magnets (info_hash, title, collected_date, collected_at)"
+            " VALUES (?, 'Emma (Unabridged)', '2024-01-01', '2024-01-01T00:00:00Z')",
+            (HASH_A,),
+        )
+        conn.close()
+
+        s = MagnetStore(db)
+        assert self._groups(s) == [("emma", 1, 1)]
+        s.close()
+
+
+class TestSharedAcrossThreads:
+    """A gunicorn gthread worker's request threads share the module-level store."""
+
+    def test_concurrent_writes_and_reads(self, fresh_store):
+        errors = []
+
+        def work(n):
+            try:
+                for i in range(25):
+                    h = hashlib.sha1(f"{n}-{i}".encode()).hexdigest()
+                    fresh_store.add_magnet(h, f"Book {n}-{i}", "2024-01-01")
+                    assert fresh_store.has_hash(h)
+                    fresh_store.search("Book")
+                    fresh_store.suggest("book")
+                    fresh_store.beat("idle", 60)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert fresh_store.search("Book")[1] == 100
+        assert fresh_store.suggest("book", limit=25)[0]["count"] == 1
+
+
+class TestReadOnly:
+    def test_reads_without_schema_work_and_refuses_writes(self, fresh_store):
+        fresh_store.add_magnet(HASH_A, "Emma", "2024-01-01")
+        reader = MagnetStore(fresh_store.db_path, read_only=True)
+        assert reader.magnets_after(0)[0]["info_hash"] == HASH_A
+        with pytest.raises(sqlite3.OperationalError):
+            reader.add_magnet(HASH_B, "Persuasion", "2024-01-02")
+        reader.close()
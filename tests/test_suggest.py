@@ -0,0 +1,127 @@
+"""Tests for typeahead suggestions (src/core/suggest.py, MagnetStore.suggest, /api/suggest)."""
+
+import hashlib
+
+from src.core import suggest
+from src.core.metadata import BookMetadata
+from src.core.storage import MagnetStore
+from src.core.suggest import PrefixIndex
+
+
+def _hash(i):
+    return hashlib.sha1(str(i).encode()).hexdigest()
+
+
+class TestPrefixIndex:
+    def test_heaviest_completions_first(self):
+        index = PrefixIndex([("dune", "Dune", 3), ("dune messiah", "Dune Messiah", 1)])
+        index.add("dunwich horror", "The Dunwich Horror", 2)
+        index.add("emma", "Emma")
+        assert index.complete("dun", 10) == [
+            ("Dune", 3),
+            ("The Dunwich Horror", 2),
+            ("Dune Messiah", 1),
+        ]
+        assert index.complete("dune ", 10) == [("Dune Messiah", 1)]
+        assert index.complete("x", 10) == []
+        assert index.complete("", 10) == []
+
+    def test_duplicate_keys_merge(self):
+        index = PrefixIndex([("dune", "Dune [MP3]", 1), ("dune", "Dune (M4B)", 1)])
+        index.add("dune", "Dune (Unabridged)")
+        assert len(index) == 1
+        assert index.complete("d", 1) == [("Dune (Unabridged)", 3)]
+
+    def test_short_prefix_ranking_is_exact(self, monkeypatch):
+        monkeypatch.setattr(suggest, "SCAN_LIMIT", 5)
+        monkeypatch.setattr(suggest, "TOP_K", 3)
+        index = PrefixIndex([(f"a{i:02d}", f"A{i}", 1) for i in range(20)] + [("a19", "A19", 9)])
+        assert index.complete("a", 2) == [("A19", 10), ("A0", 1)]
+        index.add("a07", "A7", 20)
+        index.add("b", "B")
+        assert index.complete("a", 3) == [("A7", 21), ("A19", 10), ("A0", 1)]
+        assert index.complete("a1", 1) == [("A19", 10)]
+
+    def test_scan_is_bounded_for_slices_grown_after_build(self, monkeypatch):
+        monkeypatch.setattr(suggest, "SCAN_LIMIT", 5)
+        index = PrefixIndex([("a00", "A0", 1)])
+        for i in range(1, 20):
+            index.add(f"a{i:02d}", f"A{i}", i)
+        assert index.complete("a", 1) == [("A4", 4)]
+        assert index.complete("a19", 1) == [("A19", 19)]
+
+
+class TestStoreSuggest:
+    def test_titles_and_authors(self, fresh_store):
+        fresh_store.add_magnet(_hash(1), "Dune [MP3]", "2024-01-01")
+        fresh_store.add_magnet(
+            _hash(2), "Dune (M4B)", "2024-01-02", metadata=BookMetadata(author="Frank Herbert")
+        )
+        fresh_store.add_magnet(_hash(3), "Frankenstein", "2024-01-03")
+
+        assert fresh_store.suggest("DUNE") == [{"text": "Dune (M4B)", "kind": "title", "count": 2}]
+        assert [s["text"] for s in fresh_store.suggest("fran")] == [
+            "Frank Herbert",
+            "Frankenstein",
+        ]
+        assert fresh_store.suggest("fran", kinds=("author",))[0]["kind"] == "author"
+        assert fresh_store.suggest("  ") == []
+
+    def test_refreshed_on_insert_by_another_process(self, fresh_store):
+        fresh_store.add_magnet(_hash(1), "Emma", "2024-01-01")
+        assert fresh_store.suggest("per") == []
+
+        daemon = MagnetStore(fresh_store.db_path)
+        daemon.add_magnet(
+            _hash(2), "Persuasion", "2024-01-02", metadata=BookMetadata(author="Jane Austen")
+        )
+        daemon.add_magnet(_hash(3), "Emma (Unabridged)", "2024-01-03")
+        daemon.close()
+
+        assert fresh_store.suggest("per")[0]["text"] == "Persuasion"
+        assert fresh_store.suggest("jane")[0]["text"] == "Jane Austen"
+        assert fresh_store.suggest("emma")[0]["count"] == 2
+
+    def test_refreshed_on_metadata_change(self, fresh_store):
+        fresh_store.add_magnet(_hash(1), "Emma", "2024-01-01")
+        assert fresh_store.suggest("jane") == []
+
+        daemon = MagnetStore(fresh_store.db_path)
+        assert daemon.set_metadata(_hash(1), BookMetadata(author="Jane Austen"))
+        daemon.close()
+        assert fresh_store.suggest("jane")[0]["text"] == "Jane Austen"
+
+        fresh_store.set_metadata(_hash(1), BookMetadata(author="J. Austen"))
+        assert fresh_store.suggest("jane") == []
+        assert fresh_store.suggest("j.")[0]["text"] == "J. Austen"
+
+    def test_delete_rebuilds(self, fresh_store):
+        fresh_store.add_magnet(_hash(1), "Emma", "2024-01-01")
+        assert fresh_store.suggest("emma")
+        fresh_store._conn.execute("DELETE FROM magnets")
+        assert fresh_store.suggest("emma") == []
+
+    def test_large_backlog_rebuilds(self, fresh_store, monkeypatch):
+        monkeypatch.setattr("src.core.storage.SUGGEST_CATCH_UP_MAX", 10)
+        fresh_store.add_magnet(_hash(0), "Book 0", "2024-01-01")
+        fresh_store.suggest("book")  # builds the index
+        first = fresh_store._suggest
+        fresh_store.add_magnet(_hash(1), "Book 1", "2024-01-01")
+        fresh_store.suggest("book")
+        assert fresh_store._suggest is first  # caught up in place
+
+        fresh_store.insert_many([(_hash(i), f"Book {i}", "2024-01-01", None) for i in range(2, 20)])
+        assert len(fresh_store.suggest("book", limit=25)) == 20
+        assert fresh_store._suggest is not first
+
+
+class TestSuggestEndpoint:
+    def test_suggest(self, client, fresh_store):
+        fresh_store.add_magnet(_hash(1), "Dune", "2024-01-01")
+        data = client.get("/api/suggest?q=du").get_json()
+        assert data["suggestions"] == [{"text": "Dune", "kind": "title", "count": 1}]
+        assert client.get("/api/suggest?q=du&kind=author").get_json()["suggestions"] == []
+
+    def test_bad_params(self, client):
+        assert client.get("/api/suggest?q=du&kind=isbn").status_code == 400
+        assert client.get("/api/suggest?q=du&limit=many").status_code == 400
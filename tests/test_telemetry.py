@@ -0,0 +1,157 @@
+"""Tests for the Prometheus metrics registry and /metrics/prometheus."""
+
+import os
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from src.core.telemetry import (
+    CONTENT_TYPE,
+    TEXTFILE_STALE_S,
+    Registry,
+    WorkerTextfile,
+    _Metric,
+    merge_expositions,
+    write_textfile,
+)
+
+
+class TestRegistry:
+    def test_counter_render(self):
+        reg = Registry()
+        c = reg.counter("bind_test_total", "Test counter")
+        c.inc(layer="direct")
+        c.inc(2, layer="direct")
+        text = reg.render()
+        assert "# TYPE bind_test_total counter" in text
+        assert 'bind_test_total{layer="direct"} 3' in text
+
+    def test_same_name_returns_same_metric(self):
+        reg = Registry()
+        assert reg.counter("x_total", "x") is reg.counter("x_total", "x")
+
+    def test_histogram_buckets_are_cumulative(self):
+        reg = Registry()
+        h = reg.histogram("bind_h_seconds", "h", buckets=(0.1, 1.0))
+        for v in (0.05, 0.5, 5.0):
+            h.observe(v)
+        text = reg.render()
+        assert 'bind_h_seconds_bucket{le="0.1"} 1' in text
+        assert 'bind_h_seconds_bucket{le="1"} 2' in text
+        assert 'bind_h_seconds_bucket{le="+Inf"} 3' in text
+        assert "bind_h_seconds_count 3" in text
+
+    def test_const_labels_and_collectors(self):
+        reg = Registry()
+        gauge = reg.gauge("bind_g", "g")
+        reg.add_collector(lambda: gauge.set(7))
+        reg.const_labels["process"] = "daemon"
+        assert 'bind_g{process="daemon"} 7' in reg.render()
+
+    def test_failing_collector_does_not_break_render(self):
+        reg = Registry()
+        reg.counter("c_total", "c").inc()
+        reg.add_collector(MagicMock(side_effect=RuntimeError("boom")))
+        assert "c_total 1" in reg.render()
+
+    def test_metric_base_is_abstract(self):
+        with pytest.raises(TypeError):
+            _Metric("m", "m", MagicMock())  # type: ignore[abstract]
+
+    def test_label_values_are_escaped(self):
+        reg = Registry()
+        reg.counter("c_total", "c").inc(route='a"b')
+        assert 'route="a\\"b"' in reg.render()
+
+
+class TestMergeAndTextfile:
+    def test_merge_emits_each_family_once(self):
+        a = '# HELP m_total m\n# TYPE m_total counter\nm_total{process="server"} 1\n'
+        b = '# HELP m_total m\n# TYPE m_total counter\nm_total{process="daemon"} 2\n'
+        merged = merge_expositions(a, b)
+        assert merged.count("# TYPE m_total counter") == 1
+        assert 'process="server"' in merged and 'process="daemon"' in merged
+
+    def test_write_textfile(self, tmp_path):
+        reg = Registry()
+        reg.counter("c_total", "c").inc()
+        path = tmp_path / "daemon.prom"
+        write_textfile(reg, str(path))
+        assert "c_total 1" in path.read_text()
+
+
+class TestWorkerTextfile:
+    def test_labels_set_once_and_file_written(self, tmp_path):
+        reg = Registry()
+        reg.counter("c_total", "c").inc()
+        publisher = WorkerTextfile(reg, str(tmp_path), interval_s=3600)
+        publisher.ensure_started()
+        publisher.ensure_started()
+        assert reg.const_labels == {"process": "server", "worker": str(os.getpid())}
+        own = tmp_path / "metrics" / f"server-{os.getpid()}.prom"
+        for _ in range(100):
+            if own.exists():
+                break
+            time.sleep(0.01)
+        assert f'c_total{{process="server",worker="{os.getpid()}"}} 1' in own.read_text()
+
+    def test_render_all_merges_live_peers_and_drops_stale(self, tmp_path):
+        reg = Registry()
+        reg.counter("c_total", "c").inc()
+        publisher = WorkerTextfile(reg, str(tmp_path), interval_s=3600)
+        metrics_dir = tmp_path / "metrics"
+        metrics_dir.mkdir()
+        header = "# HELP c_total c\n# TYPE c_total counter\n"
+        (metrics_dir / "server-1.prom").write_text(header + 'c_total{worker="1"} 4\n')
+        stale = metrics_dir / "server-2.prom"
+        stale.write_text(header + 'c_total{worker="2"} 9\n')
+        old = time.time() - TEXTFILE_STALE_S - 1
+        os.utime(stale, (old, old))
+
+        text = publisher.render_all()
+        assert text.count("# TYPE c_total counter") == 1
+        assert f'worker="{os.getpid()}"}} 1' in text
+        assert 'c_total{worker="1"} 4' in text
+        assert 'worker="2"' not in text
+        assert not stale.exists()
+
+
+class TestPrometheusEndpoint:
+    def test_serves_text_format(self, client):
+        client.get("/health")
+        resp = client.get("/metrics/prometheus")
+        assert resp.status_code == 200
+        assert resp.content_type == CONTENT_TYPE
+        assert 'route="/health"' in resp.get_data(as_text=True)
+
+    def test_includes_daemon_textfile(self, client, monkeypatch, tmp_path):
+        (tmp_path / "daemon.prom").write_text(
+            "# HELP bind_magnets_inserted_total m\n# TYPE bind_magnets_inserted_total counter\n"
+            'bind_magnets_inserted_total{process="daemon"} 5\n'
+        )
+        monkeypatch.setattr("src.rss_server._data_dir", str(tmp_path))
+        body = client.get("/metrics/prometheus").get_data(as_text=True)
+        assert 'bind_magnets_inserted_total{process="daemon"} 5' in body
+
+    def test_includes_other_workers_textfiles(self, client, monkeypatch, tmp_path):
+        monkeypatch.setattr("src.rss_server.worker_metrics.directory", str(tmp_path))
+        (tmp_path / "server-1.prom").write_text(
+            "# HELP bind_http_request_duration_seconds h\n"
+            "# TYPE bind_http_request_duration_seconds histogram\n"
+            'bind_http_request_duration_seconds_count{process="server",worker="1"} 3\n'
+        )
+        body = client.get("/metrics/prometheus").get_data(as_text=True)
+        assert body.count("# TYPE bind_http_request_duration_seconds histogram") == 1
+        assert 'worker="1"} 3' in body
+        assert f'worker="{os.getpid()}"' in body
+
+    def test_does_not_query_stats(self, client, fresh_store, monkeypatch):
+        stats = MagicMock()
+        monkeypatch.setattr(fresh_store, "stats", stats)
+        client.get("/metrics/prometheus")
+        stats.assert_not_called()
+
+    def test_sqlite_time_is_recorded(self, client, fresh_store):
+        fresh_store.has_hash("a" * 40)
+        body = client.get("/metrics/prometheus").get_data(as_text=True)
+        assert 'bind_sqlite_query_seconds_count{method="has_hash"' in body
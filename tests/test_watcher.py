@@ -0,0 +1,108 @@
+"""Tests for the daemon's event-driven wait (src/core/watcher.py)."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+import schedule
+from src.bind import next_wait_s
+from src.core import watcher as watcher_mod
+from src.core.watcher import ControlWatcher
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    w = ControlWatcher([str(tmp_path)])
+    yield w
+    w.close()
+
+
+class TestControlWatcher:
+    def test_times_out_without_events(self, watcher):
+        t0 = time.monotonic()
+        assert watcher.wait(0.05) is False
+        assert time.monotonic() - t0 >= 0.04
+
+    def test_wake_interrupts_wait(self, watcher):
+        threading.Timer(0.05, watcher.wake).start()
+        t0 = time.monotonic()
+        assert watcher.wait(10) is True
+        assert time.monotonic() - t0 < 5
+
+    def test_trigger_file_wakes_wait(self, watcher, tmp_path):
+        if not watcher.event_driven:
+            pytest.skip("inotify not available on this host")
+        threading.Timer(0.05, (tmp_path / ".trigger").touch).start()
+        t0 = time.monotonic()
+        assert watcher.wait(10) is True
+        assert time.monotonic() - t0 < 5
+
+    def test_touching_existing_file_wakes_wait(self, watcher, tmp_path):
+        if not watcher.event_driven:
+            pytest.skip("inotify not available on this host")
+        (tmp_path / "config.env").write_text("A=1\n")
+        watcher.wait(0)  # drain the creation event
+        threading.Timer(0.05, (tmp_path / "config.env").touch).start()
+        assert watcher.wait(10) is True
+
+    def test_other_files_do_not_end_the_wait(self, tmp_path):
+        w = ControlWatcher([str(tmp_path)], names=(".trigger", "config.env"))
+        try:
+            if not w.event_driven:
+                pytest.skip("inotify not available on this host")
+            (tmp_path / "bind.db-wal").write_bytes(b"x")
+            (tmp_path / "daemon.prom").write_text("m 1\n")
+            assert w.wait(0.2) is False
+            threading.Timer(0.05, (tmp_path / ".trigger").touch).start()
+            t0 = time.monotonic()
+            assert w.wait(10) is True
+            assert time.monotonic() - t0 < 5
+        finally:
+            w.close()
+
+    def test_renamed_config_wakes_filtered_wait(self, tmp_path):
+        w = ControlWatcher([str(tmp_path)], names=("config.env",))
+        try:
+            if not w.event_driven:
+                pytest.skip("inotify not available on this host")
+            tmp = tmp_path / ".config_tmp_1"
+            tmp.write_text("A=1\n")
+            assert w.wait(0) is False
+            tmp.replace(tmp_path / "config.env")
+            assert w.wait(1) is True
+        finally:
+            w.close()
+
+    def test_falls_back_to_polling_without_inotify(self, tmp_path):
+        with patch.object(watcher_mod, "_load_libc", return_value=None):
+            w = ControlWatcher([str(tmp_path)])
+        try:
+            assert w.event_driven is False
+            t0 = time.monotonic()
+            w.wait(30)
+            assert time.monotonic() - t0 < watcher_mod.POLL_FALLBACK_S + 1
+        finally:
+            w.close()
+
+
+class TestNextWait:
+    def setup_method(self):
+        schedule.clear()
+
+    def teardown_method(self):
+        schedule.clear()
+
+    def test_no_jobs_uses_cap(self):
+        assert next_wait_s(30) == 30
+
+    def test_waits_until_next_job(self):
+        schedule.every(10).seconds.do(lambda: None)
+        assert 0 < next_wait_s(30) <= 10
+
+    def test_overdue_job_means_no_wait(self):
+        schedule.every(10).seconds.do(lambda: None)
+        schedule.jobs[0].next_run = schedule.datetime.datetime.now() - schedule.datetime.timedelta(
+            seconds=5
+        )
+        assert next_wait_s(30) == 0